@@ -10,6 +10,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import hashlib
+
 import flask
 from flask import request
 from oslo_serialization import jsonutils
@@ -26,9 +29,34 @@ MEDIA_TYPE_JSON = 'application/vnd.openstack.identity-%s+json'
 _VERSIONS = []
 _DISCOVERY_BLUEPRINT = flask.Blueprint('Discovery', __name__)
 
+# NOTE: The version documents embed the base URL of the request, which comes
+# from the Host header unless public_endpoint is set. Bound the number of
+# cached documents so arbitrary Host headers cannot grow the cache.
+_DOCUMENT_CACHE_SIZE = 32
+_DOCUMENTS = {}
+
+_Document = collections.namedtuple('_Document', 'body, etag')
+
 
 def register_version(version):
     _VERSIONS.append(version)
+    _DOCUMENTS.clear()
+
+
+def _get_document(key, build_content):
+    """Return the serialized discovery document stored under key.
+
+    The document is built by calling build_content and serialized the first
+    time it is requested, later requests are served the same bytes.
+    """
+    document = _DOCUMENTS.get(key)
+    if document is None:
+        body = jsonutils.dump_as_bytes(build_content())
+        document = _Document(body=body, etag=hashlib.sha1(body).hexdigest())
+        if len(_DOCUMENTS) >= _DOCUMENT_CACHE_SIZE:
+            _DOCUMENTS.clear()
+        _DOCUMENTS[key] = document
+    return document
 
 
 def _get_versions_list(identity_url):
@@ -69,6 +97,69 @@ def _v3_json_home_content():
     return json_home.JsonHomeResources.resources()
 
 
+def _json_home_document(prefix=None):
+    def build_content():
+        content = _v3_json_home_content()
+        if prefix:
+            json_home.translate_urls(content, prefix)
+        return content
+
+    key = ('json-home', prefix, json_home.JsonHomeResources.revision())
+    return _get_document(key, build_content)
+
+
+def _identity_url(environ):
+    # NOTE(morgan): wsgi.Application.base_url will eventually need to
+    # be moved to a better "common" location. For now, we'll just lean
+    # on it for the sake of leaning on common code where possible.
+    return '%s/v3/' % wsgi.Application.base_url(
+        context={'environment': environ})
+
+
+def _versions_document(identity_url):
+    def build_content():
+        versions = _get_versions_list(identity_url)
+        return {'versions': {'values': list(versions.values())}}
+
+    return _get_document(('versions', identity_url), build_content)
+
+
+def _v3_version_document(identity_url):
+    def build_content():
+        return {'version': _get_versions_list(identity_url)['v3']}
+
+    return _get_document(('version', identity_url), build_content)
+
+
+def prime_document_cache():
+    """Build the discovery documents ahead of the first request.
+
+    The JSON Home documents do not depend on the request. The version
+    documents do, unless the base URL is fixed by ``public_endpoint``.
+    """
+    _json_home_document(prefix='/v3')
+    _json_home_document()
+    if CONF.public_endpoint:
+        identity_url = _identity_url({})
+        _versions_document(identity_url)
+        if 'v3' in _VERSIONS:
+            _v3_version_document(identity_url)
+
+
+def _render_document(document, mimetype, status=http_client.OK):
+    if request.if_none_match.contains(document.etag):
+        response = flask.Response(status=http_client.NOT_MODIFIED)
+    else:
+        response = flask.Response(response=document.body, mimetype=mimetype,
+                                  status=status)
+    response.set_etag(document.etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = CONF.discovery_cache_max_age
+    # The document depends on the Accept header of the request.
+    response.vary.add('Accept')
+    return response
+
+
 def v3_mime_type_best_match():
     if not request.accept_mimetypes:
         return MimeTypes.JSON
@@ -82,23 +173,12 @@ def get_versions():
     if v3_mime_type_best_match() == MimeTypes.JSON_HOME:
         # RENDER JSON-Home form, we have a clever client who will
         # understand the JSON-Home document.
-        v3_json_home = _v3_json_home_content()
-        json_home.translate_urls(v3_json_home, '/v3')
-        return flask.Response(response=jsonutils.dumps(v3_json_home),
-                              mimetype=MimeTypes.JSON_HOME)
+        return _render_document(_json_home_document(prefix='/v3'),
+                                MimeTypes.JSON_HOME)
     else:
-        # NOTE(morgan): wsgi.Application.base_url will eventually need to
-        # be moved to a better "common" location. For now, we'll just lean
-        # on it for the sake of leaning on common code where possible.
-        identity_url = '%s/v3/' % wsgi.Application.base_url(
-            context={'environment': request.environ})
-        versions = _get_versions_list(identity_url)
-        return flask.Response(
-            response=jsonutils.dumps(
-                {'versions': {
-                    'values': list(versions.values())}}),
-            mimetype=MimeTypes.JSON,
-            status=http_client.MULTIPLE_CHOICES)
+        document = _versions_document(_identity_url(request.environ))
+        return _render_document(document, MimeTypes.JSON,
+                                status=http_client.MULTIPLE_CHOICES)
 
 
 @_DISCOVERY_BLUEPRINT.route('/v3')
@@ -109,19 +189,10 @@ def get_version_v3():
     if v3_mime_type_best_match() == MimeTypes.JSON_HOME:
         # RENDER JSON-Home form, we have a clever client who will
         # understand the JSON-Home document.
-        content = _v3_json_home_content()
-        return flask.Response(response=jsonutils.dumps(content),
-                              mimetype=MimeTypes.JSON_HOME)
+        return _render_document(_json_home_document(), MimeTypes.JSON_HOME)
     else:
-        # NOTE(morgan): wsgi.Application.base_url will eventually need to
-        # be moved to a better "common" location. For now, we'll just lean
-        # on it for the sake of leaning on common code where possible.
-        identity_url = '%s/v3/' % wsgi.Application.base_url(
-            context={'environment': request.environ})
-        versions = _get_versions_list(identity_url)
-        return flask.Response(
-            response=jsonutils.dumps({'version': versions['v3']}),
-            mimetype=MimeTypes.JSON)
+        document = _v3_version_document(_identity_url(request.environ))
+        return _render_document(document, MimeTypes.JSON)
 
 
 class DiscoveryAPI(object):
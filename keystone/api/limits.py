@@ -103,6 +103,45 @@ class LimitModelResource(flask_restful.Resource):
         return {'model': model}
 
 
+class EffectiveLimitsResource(ks_flask.ResourceBase):
+    collection_key = 'limits'
+    member_key = 'limit'
+    json_home_resource_status = json_home.Status.EXPERIMENTAL
+
+    @classmethod
+    def _add_self_referential_link(cls, ref, collection_name=None):
+        # Effective limits are not resources of their own, link to the
+        # project limit when there is one and to the registered limit that
+        # supplied the default otherwise.
+        if ref['limit_id'] is not None:
+            path = '/'.join(['limits', ref['limit_id']])
+        else:
+            path = '/'.join(['registered_limits', ref['registered_limit_id']])
+        ref.setdefault('links', {})['self'] = ks_flask.base_url(path=path)
+
+    def get(self):
+        filters = ['service_id', 'region_id', 'resource_name']
+        ENFORCER.enforce_call(action='identity:list_effective_limits',
+                              filters=filters)
+        project_id = flask.request.args.get('project_id')
+        if project_id is None:
+            project_id = self.oslo_context.project_id
+            if not project_id:
+                action = _('project_id is required when not authenticated '
+                           'with a project scoped token')
+                raise exception.ValidationError(action)
+        elif (not self.oslo_context.system_scope and
+                project_id != self.oslo_context.project_id):
+            action = _('The authenticated project should match the '
+                       'project_id')
+            raise exception.Forbidden(action=action)
+        PROVIDERS.resource_api.get_project(project_id)
+        hints = self.build_driver_hints(filters)
+        refs = PROVIDERS.unified_limit_api.list_effective_limits(
+            project_id, hints)
+        return self.wrap_collection(refs, hints=hints)
+
+
 class LimitsAPI(ks_flask.APIBase):
     _name = 'limits'
     _import_name = __name__
@@ -114,6 +153,13 @@ class LimitsAPI(ks_flask.APIBase):
             url='/limits/model',
             rel='limit_model',
             status=json_home.Status.EXPERIMENTAL
+        ),
+        ks_flask.construct_resource_map(
+            resource=EffectiveLimitsResource,
+            resource_kwargs={},
+            url='/limits/effective',
+            rel='effective_limits',
+            status=json_home.Status.EXPERIMENTAL
         )
     ]
 
@@ -12,9 +12,13 @@
 
 # This file handles all flask-restful resources for /v3/OS-REVOKE/events
 
+import hashlib
+
 import flask
 import flask_restful
+from oslo_serialization import jsonutils
 from oslo_utils import timeutils
+from six.moves import http_client
 
 from keystone.api._shared import json_home_relations
 from keystone.common import provider_api
@@ -57,7 +61,16 @@ class OSRevokeResource(flask_restful.Resource):
                         'self': ks_flask.base_url(path='/OS-REVOKE/events'),
                         'previous': None}
                     }
-        return response
+        # The list only changes when events are recorded or pruned, let
+        # consumers polling it revalidate their copy instead of downloading
+        # it again.
+        etag = hashlib.sha1(
+            jsonutils.dump_as_bytes(response, sort_keys=True)).hexdigest()
+        if flask.request.if_none_match.contains(etag):
+            not_modified = flask.Response(status=http_client.NOT_MODIFIED)
+            not_modified.set_etag(etag)
+            return not_modified
+        return response, http_client.OK, {'ETag': '"%s"' % etag}
 
 
 class OSRevokeAPI(ks_flask.APIBase):
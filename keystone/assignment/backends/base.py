@@ -108,6 +108,28 @@ class AssignmentDriverBase(object):
         """
         raise exception.NotImplemented()  # pragma: no cover
 
+    def list_role_assignment_targets(self, user_id, group_ids):
+        """Return the distinct targets and roles of actor assignments.
+
+        :param user_id: the user to list the project and domain assignments
+                        of.
+        :param group_ids: the groups to list the project and domain
+                          assignments of.
+        :returns: a list of role assignments stripped of their actor, with
+                  duplicates removed.
+
+        """
+        refs = self.list_role_assignments(user_id=user_id)
+        if group_ids:
+            refs += self.list_role_assignments(group_ids=group_ids)
+        targets = []
+        for ref in refs:
+            ref.pop('user_id', None)
+            ref.pop('group_id', None)
+            if ref not in targets:
+                targets.append(ref)
+        return targets
+
     @abc.abstractmethod
     def delete_project_assignments(self, project_id):
         """Delete all assignments for a project.
@@ -12,6 +12,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import sqlalchemy
+
 from keystone.assignment.backends import base
 from keystone.common import sql
 from keystone import exception
@@ -247,6 +249,33 @@ class Assignment(base.AssignmentDriverBase):
 
             return [denormalize_role(ref) for ref in query.all()]
 
+    def list_role_assignment_targets(self, user_id, group_ids):
+        actors = sqlalchemy.and_(
+            RoleAssignment.actor_id == user_id,
+            RoleAssignment.type.in_(self._get_user_assignment_types()))
+        if group_ids:
+            actors = sqlalchemy.or_(actors, sqlalchemy.and_(
+                RoleAssignment.actor_id.in_(group_ids),
+                RoleAssignment.type.in_(self._get_group_assignment_types())))
+
+        with sql.session_for_read() as session:
+            query = session.query(
+                RoleAssignment.type, RoleAssignment.target_id,
+                RoleAssignment.role_id, RoleAssignment.inherited)
+            query = query.filter(actors).distinct()
+
+            targets = []
+            project_types = self._get_project_assignment_types()
+            for assignment_type, target_id, role_id, inherited in query:
+                if assignment_type in project_types:
+                    ref = {'project_id': target_id, 'role_id': role_id}
+                else:
+                    ref = {'domain_id': target_id, 'role_id': role_id}
+                if inherited:
+                    ref['inherited_to_projects'] = 'projects'
+                targets.append(ref)
+            return targets
+
     def delete_project_assignments(self, project_id):
         with sql.session_for_write() as session:
             q = session.query(RoleAssignment)
@@ -36,6 +36,7 @@ PROVIDERS = provider_api.ProviderAPIs
 # This is a general cache region for assignment administration (CRUD
 # operations).
 MEMOIZE = cache.get_memoization_decorator(group='role')
+MEMOIZE_MULTI = cache.get_multi_memoization_decorator(group='role')
 
 # This builds a discrete cache region dedicated to role assignments computed
 # for a given user + project/domain pair. Any write operation to add or remove
@@ -143,6 +144,38 @@ class Manager(manager.Manager):
         # Use set() to process the list to remove any duplicates
         return list(set([x['role_id'] for x in assignment_list]))
 
+    @MEMOIZE_COMPUTED_ASSIGNMENTS
+    def list_delegated_role_ids(self, trustor_id, project_id, role_ids):
+        """Get the roles a trustor still delegates on a project.
+
+        The roles of a trust, and the roles they imply, must all still be
+        effectively assigned to the trustor for the trust to be usable.
+
+        :param trustor_id: the user that delegated the roles.
+        :param project_id: the project of the trust, or None.
+        :param role_ids: a sorted list of the ids of the roles of the trust.
+        :returns: a list of the ids of the global roles delegated.
+        :raises keystone.exception.Forbidden: If the trustor no longer has
+            one of the roles.
+
+        """
+        effective_trust_roles = self.add_implied_roles(
+            [{'role_id': role_id} for role_id in role_ids])
+        trustor_assignments = self.list_role_assignments(
+            user_id=trustor_id, project_id=project_id, effective=True,
+            strip_domain_roles=False)
+        current_effective_trustor_roles = set(
+            [x['role_id'] for x in trustor_assignments])
+
+        delegated_role_ids = []
+        for role_id in set([r['role_id'] for r in effective_trust_roles]):
+            if role_id not in current_effective_trustor_roles:
+                raise exception.Forbidden(_('Trustee has no delegated roles.'))
+            role = PROVIDERS.role_api.get_role(role_id)
+            if role['domain_id'] is None:
+                delegated_role_ids.append(role_id)
+        return delegated_role_ids
+
     def get_roles_for_groups(self, group_ids, project_id=None, domain_id=None):
         """Get a list of roles for this group on domain and/or project."""
         # if no group ids were passed, there are no roles. Without this check,
@@ -185,34 +218,88 @@ class Manager(manager.Manager):
             role_id, user_id=user_id, project_id=tenant_id)
         COMPUTED_ASSIGNMENTS_REGION.invalidate()
 
+    def _role_ids_granting_access(self, role_ids):
+        """Return the roles that show up in effective role assignments.
+
+        Domain specific roles are stripped from the effective role
+        assignments, unless they imply a global role.
+
+        """
+        def _is_global(role_id):
+            return PROVIDERS.role_api.get_role(role_id)['domain_id'] is None
+
+        granting_ids = set()
+        for role_id in role_ids:
+            checked_ids = set()
+            role_ids_to_check = [role_id]
+            while role_ids_to_check:
+                next_id = role_ids_to_check.pop()
+                if next_id in checked_ids:
+                    continue
+                checked_ids.add(next_id)
+                if _is_global(next_id):
+                    granting_ids.add(role_id)
+                    break
+                try:
+                    role_ids_to_check += [
+                        ref['implied_role_id'] for ref in
+                        PROVIDERS.role_api.list_implied_roles(next_id)]
+                except exception.NotImplemented:
+                    LOG.error('Role driver does not support implied roles.')
+        return granting_ids
+
+    def _list_target_ids_for_user(self, user_id):
+        """Return the IDs of the projects and domains a user has roles on.
+
+        These are the targets of the effective role assignments of the user,
+        resolved from the distinct targets of the direct and group
+        assignments without expanding them into role assignments. Implied
+        roles never add a target, so they are not expanded either.
+
+        :returns: a tuple of the set of project IDs and the set of domain IDs.
+
+        """
+        group_ids = self._get_group_ids_for_user_id(user_id)
+        refs = self.driver.list_role_assignment_targets(user_id, group_ids)
+        granting_ids = self._role_ids_granting_access(
+            set(ref['role_id'] for ref in refs))
+
+        project_ids = set()
+        domain_ids = set()
+        for ref in refs:
+            if ref['role_id'] not in granting_ids:
+                continue
+            if not ref.get('inherited_to_projects'):
+                if ref.get('project_id'):
+                    project_ids.add(ref['project_id'])
+                else:
+                    domain_ids.add(ref['domain_id'])
+            elif ref.get('domain_id'):
+                project_ids.update(
+                    x['id'] for x in
+                    PROVIDERS.resource_api.list_projects_in_domain(
+                        ref['domain_id']))
+            else:
+                project_ids.update(
+                    x['id'] for x in
+                    PROVIDERS.resource_api.list_projects_in_subtree(
+                        ref['project_id']))
+        return project_ids, domain_ids
+
     # TODO(henry-nash): We might want to consider list limiting this at some
     # point in the future.
     @MEMOIZE_COMPUTED_ASSIGNMENTS
     def list_projects_for_user(self, user_id):
-        # FIXME(lbragstad): Without the use of caching, listing effective role
-        # assignments is slow, especially with large data set (lots of users
-        # with multiple role assignments). This should serve as a marker in
-        # case we have the opportunity to come back and optimize this code so
-        # that it can be performant without having a hard dependency on
-        # caching. Please see https://bugs.launchpad.net/keystone/+bug/1700852
-        # for more details.
-        assignment_list = self.list_role_assignments(
-            user_id=user_id, effective=True)
-        # Use set() to process the list to remove any duplicates
-        project_ids = list(set([x['project_id'] for x in assignment_list
-                                if x.get('project_id')]))
-        return PROVIDERS.resource_api.list_projects_from_ids(project_ids)
+        project_ids, domain_ids = self._list_target_ids_for_user(user_id)
+        return PROVIDERS.resource_api.list_projects_from_ids(
+            list(project_ids))
 
     # TODO(henry-nash): We might want to consider list limiting this at some
     # point in the future.
     @MEMOIZE_COMPUTED_ASSIGNMENTS
     def list_domains_for_user(self, user_id):
-        assignment_list = self.list_role_assignments(
-            user_id=user_id, effective=True)
-        # Use set() to process the list to remove any duplicates
-        domain_ids = list(set([x['domain_id'] for x in assignment_list
-                               if x.get('domain_id')]))
-        return PROVIDERS.resource_api.list_domains_from_ids(domain_ids)
+        project_ids, domain_ids = self._list_target_ids_for_user(user_id)
+        return PROVIDERS.resource_api.list_domains_from_ids(list(domain_ids))
 
     def list_domains_for_groups(self, group_ids):
         assignment_list = self.list_role_assignments(
@@ -1255,6 +1342,17 @@ class RoleManager(manager.Manager):
     def get_role(self, role_id):
         return self.driver.get_role(role_id)
 
+    @MEMOIZE_MULTI(get_role)
+    def get_roles_by_ids(self, role_ids):
+        """Get the roles with the given ids.
+
+        :param role_ids: list of role ids
+        :returns: a dict of the role refs found, keyed by role id.
+
+        """
+        return dict((role['id'], role)
+                    for role in self.driver.list_roles_from_ids(role_ids))
+
     def get_unique_role_by_name(self, role_name, hints=None):
         if not hints:
             hints = driver_hints.Hints()
@@ -99,14 +99,17 @@ class Auth(controller.V3Controller):
                 auth_context['user_id'], method_names, expires_at=expires_at,
                 system=system, project_id=project_id, domain_id=domain_id,
                 auth_context=auth_context, trust_id=trust_id,
-                app_cred_id=app_cred_id, parent_audit_id=token_audit_id)
+                app_cred_id=app_cred_id, parent_audit_id=token_audit_id,
+                resolved_scope=auth_info.get_resolved_scope())
             token_reference = controller.render_token_response_from_model(
                 token, include_catalog=include_catalog
             )
 
             # NOTE(wanghong): We consume a trust use only when we are using
-            # trusts and have successfully issued a token.
-            if trust:
+            # trusts and have successfully issued a token. Trusts with
+            # unlimited uses have nothing to consume, so skip the round trip
+            # to the backend for them.
+            if trust and trust.get('remaining_uses') is not None:
                 PROVIDERS.trust_api.consume_use(token.trust_id)
 
             return render_token_data_response(token.id, token_reference,
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 from functools import partial
 import sys
 
@@ -23,7 +24,6 @@ from keystone.common import utils
 import keystone.conf
 from keystone import exception
 from keystone.i18n import _
-from keystone.identity.backends import resource_options as ro
 
 
 LOG = log.getLogger(__name__)
@@ -119,6 +119,14 @@ class AuthContext(dict):
                 self[key] = val
 
 
+# The project and domain references resolved while validating the requested
+# scope. For a project scope ``domain`` is the project's domain, for a domain
+# scope ``project`` is None.
+ResolvedScope = collections.namedtuple('ResolvedScope', ['project', 'domain'])
+
+_UNRESOLVED_SCOPE = ResolvedScope(None, None)
+
+
 class AuthInfo(provider_api.ProviderAPIMixin, object):
     """Encapsulation of "auth" request."""
 
@@ -138,17 +146,15 @@ class AuthInfo(provider_api.ProviderAPIMixin, object):
         # trust scope: (None, None, trust_ref, None, None)
         # unscoped: (None, None, None, 'unscoped', None)
         # system: (None, None, None, None, 'all')
+        self._resolved_scope = _UNRESOLVED_SCOPE
 
     def _assert_project_is_enabled(self, project_ref):
-        # ensure the project is enabled
-        try:
-            PROVIDERS.resource_api.assert_project_enabled(
-                project_id=project_ref['id'],
-                project=project_ref)
-        except AssertionError as e:
-            LOG.warning(six.text_type(e))
-            six.reraise(exception.Unauthorized, exception.Unauthorized(e),
-                        sys.exc_info()[2])
+        # ensure the project is enabled, the domain of the project has
+        # already been checked when it was looked up.
+        if not project_ref.get('enabled', True):
+            msg = _('Project is disabled: %s') % project_ref['id']
+            LOG.warning(msg)
+            raise exception.Unauthorized(msg)
 
     def _assert_domain_is_enabled(self, domain_ref):
         try:
@@ -183,6 +189,11 @@ class AuthInfo(provider_api.ProviderAPIMixin, object):
         return domain_ref
 
     def _lookup_project(self, project_info):
+        """Resolve and validate a project scope.
+
+        :returns: a :class:`ResolvedScope` holding the enabled project and its
+                  enabled domain.
+        """
         project_id = project_info.get('id')
         project_name = project_info.get('name')
         try:
@@ -208,12 +219,12 @@ class AuthInfo(provider_api.ProviderAPIMixin, object):
                 # NOTE(morganfainberg): The _lookup_domain method will raise
                 # exception.Unauthorized if the domain isn't found or is
                 # disabled.
-                self._lookup_domain({'id': domain_id})
+                domain_ref = self._lookup_domain({'id': domain_id})
         except exception.ProjectNotFound as e:
             LOG.warning(six.text_type(e))
             raise exception.Unauthorized(e)
         self._assert_project_is_enabled(project_ref)
-        return project_ref
+        return ResolvedScope(project=project_ref, domain=domain_ref)
 
     def _lookup_trust(self, trust_info):
         trust_id = trust_info.get('id')
@@ -291,21 +302,25 @@ class AuthInfo(provider_api.ProviderAPIMixin, object):
             self._scope_data = (None, None, None, 'unscoped', None)
             return
         if 'project' in self.auth['scope']:
-            project_ref = self._lookup_project(self.auth['scope']['project'])
-            self._scope_data = (None, project_ref['id'], None, None, None)
+            resolved = self._lookup_project(self.auth['scope']['project'])
+            self._scope_data = (None, resolved.project['id'], None, None, None)
+            self._resolved_scope = resolved
         elif 'domain' in self.auth['scope']:
             domain_ref = self._lookup_domain(self.auth['scope']['domain'])
             self._scope_data = (domain_ref['id'], None, None, None, None)
+            self._resolved_scope = ResolvedScope(project=None,
+                                                 domain=domain_ref)
         elif 'OS-TRUST:trust' in self.auth['scope']:
             trust_ref = self._lookup_trust(
                 self.auth['scope']['OS-TRUST:trust'])
             # TODO(ayoung): when trusts support domains, fill in domain data
             if trust_ref.get('project_id') is not None:
-                project_ref = self._lookup_project(
+                resolved = self._lookup_project(
                     {'id': trust_ref['project_id']})
                 self._scope_data = (
-                    None, project_ref['id'], trust_ref, None, None
+                    None, resolved.project['id'], trust_ref, None, None
                 )
+                self._resolved_scope = resolved
 
             else:
                 self._scope_data = (None, None, trust_ref, None, None)
@@ -390,6 +405,18 @@ class AuthInfo(provider_api.ProviderAPIMixin, object):
         """
         return self._scope_data
 
+    def get_resolved_scope(self):
+        """Get the project and domain references resolved for the scope.
+
+        The references were validated to be enabled while the scope was
+        normalized, they can be handed to the token provider so the scope is
+        not looked up again while issuing the token.
+
+        :returns: :class:`ResolvedScope`, with both members set to None if
+                  the scope was not resolved from the request.
+        """
+        return self._resolved_scope
+
     def set_scope(self, domain_id=None, project_id=None, trust=None,
                   unscoped=None, system=None):
         """Set scope information."""
@@ -409,6 +436,7 @@ class AuthInfo(provider_api.ProviderAPIMixin, object):
             msg = _('Scoping to both domain and system is not allowed')
             raise ValueError(msg)
         self._scope_data = (domain_id, project_id, trust, unscoped, system)
+        self._resolved_scope = _UNRESOLVED_SCOPE
 
 
 class UserMFARulesValidator(provider_api.ProviderAPIMixin, object):
@@ -430,19 +458,16 @@ class UserMFARulesValidator(provider_api.ProviderAPIMixin, object):
         :returns: Boolean, ``True`` means rules match and auth may proceed,
                   ``False`` means rules do not match.
         """
-        user_ref = PROVIDERS.identity_api.get_user(user_id)
-        mfa_rules = user_ref['options'].get(ro.MFA_RULES_OPT.option_name, [])
-        mfa_rules_enabled = user_ref['options'].get(
-            ro.MFA_ENABLED_OPT.option_name, True)
-        rules = self._parse_rule_structure(mfa_rules, user_ref['id'])
+        auth_options = PROVIDERS.identity_api.get_user_auth_options(user_id)
+        rules = auth_options.mfa_rules
 
-        if not rules or not mfa_rules_enabled:
+        if not rules or not auth_options.mfa_enabled:
             # return quickly if the rules are disabled for the user or not set
             LOG.debug('MFA Rules not processed for user `%(user_id)s`. '
                       'Rule list: `%(rules)s` (Enabled: `%(enabled)s`).',
                       {'user_id': user_id,
-                       'rules': mfa_rules,
-                       'enabled': mfa_rules_enabled})
+                       'rules': [list(r) for r in rules],
+                       'enabled': auth_options.mfa_enabled})
             return True
 
         for r in rules:
@@ -451,7 +476,7 @@ class UserMFARulesValidator(provider_api.ProviderAPIMixin, object):
             # disable an auth method, and a rule will still pass making it
             # impossible to accidently lock-out a subset of users with a
             # bad keystone.conf
-            r_set = set(r).intersection(self._auth_methods)
+            r_set = r.intersection(self._auth_methods)
             if set(auth_methods).issuperset(r_set):
                 # Rule Matches no need to continue, return here.
                 LOG.debug('Auth methods for user `%(user_id)s`, `%(methods)s` '
@@ -467,75 +492,5 @@ class UserMFARulesValidator(provider_api.ProviderAPIMixin, object):
                   'match a MFA rule in `%(rules)s`.',
                   {'user_id': user_id,
                    'methods': auth_methods,
-                   'rules': rules})
+                   'rules': [list(r) for r in rules]})
         return False
-
-    @staticmethod
-    def _parse_rule_structure(rules, user_id):
-        """Validate and parse the rule data structure.
-
-        Rule sets must be in the form of list of lists. The lists may not
-        have duplicates and must not be empty. The top-level list may be empty
-        indicating that no rules exist.
-
-        :param rules: The list of rules from the user_ref
-        :type rules: list
-        :param user_id: the user_id, used for logging purposes
-        :type user_id: str
-        :returns: list of list, duplicates are stripped
-        """
-        # NOTE(notmorgan): Most of this is done at the API request validation
-        # and in the storage layer, it makes sense to also validate here and
-        # ensure the data returned from the DB is sane, This will not raise
-        # any exceptions, but just produce a usable set of data for rules
-        # processing.
-        rule_set = []
-        if not isinstance(rules, list):
-            LOG.error('Corrupt rule data structure for user %(user_id)s, '
-                      'no rules loaded.',
-                      {'user_id': user_id})
-            # Corrupt Data means no rules. Auth success > MFA rules in this
-            # case.
-            return rule_set
-        elif not rules:
-            # Exit early, nothing to do here.
-            return rule_set
-
-        for r_list in rules:
-            if not isinstance(r_list, list):
-                # Rule was not a list, it is invalid, drop the rule from
-                # being considered.
-                LOG.info('Ignoring Rule %(type)r; rule must be a list of '
-                         'strings.',
-                         {'type': type(r_list)})
-                continue
-
-            if r_list:
-                # No empty rules are allowed.
-                _ok_rule = True
-                for item in r_list:
-                    if not isinstance(item, six.string_types):
-                        # Rules may only contain strings for method names
-                        # Reject a rule with non-string values
-                        LOG.info('Ignoring Rule %(rule)r; rule contains '
-                                 'non-string values.',
-                                 {'rule': r_list})
-                        # Rule is known to be bad, drop it from consideration.
-                        _ok_rule = False
-                        break
-                # NOTE(notmorgan): No FOR/ELSE used here! Though it could be
-                # done and avoid the use of _ok_rule. This is a note for
-                # future developers to avoid using for/else and as an example
-                # of how to implement it that is readable and maintainable.
-                if _ok_rule:
-                    # Unique the r_list and cast back to a list and then append
-                    # as we know the rule is ok (matches our requirements).
-                    # This is outside the for loop, as the for loop is
-                    # only used to validate the elements in the list. The
-                    # This de-dupe should never be needed, but we are being
-                    # extra careful at all levels of validation for the MFA
-                    # rules.
-                    r_list = list(set(r_list))
-                    rule_set.append(r_list)
-
-        return rule_set
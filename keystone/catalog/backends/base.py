@@ -176,6 +176,26 @@ class CatalogDriverBase(provider_api.ProviderAPIMixin, object):
         """
         raise exception.NotImplemented()  # pragma: no cover
 
+    def list_endpoints_from_ids(self, endpoint_ids):
+        """List endpoints for the provided list of ids.
+
+        :param endpoint_ids: list of ids
+
+        :returns: a list of endpoint_refs, ids that do not exist are skipped.
+
+        This method is used internally by the catalog manager to bulk read
+        a set of endpoints given their ids.
+
+        """
+        endpoints = []
+        for endpoint_id in endpoint_ids:
+            try:
+                endpoints.append(self.get_endpoint(endpoint_id))
+            except exception.EndpointNotFound:  # nosec
+                # Skip the endpoints that do not exist.
+                pass
+        return endpoints
+
     @abc.abstractmethod
     def list_endpoints(self, hints):
         """List all endpoints.
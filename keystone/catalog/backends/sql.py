@@ -247,6 +247,14 @@ class Catalog(base.CatalogDriverBase):
             endpoints = sql.filter_limit_query(Endpoint, endpoints, hints)
             return [e.to_dict() for e in list(endpoints)]
 
+    def list_endpoints_from_ids(self, endpoint_ids):
+        if not endpoint_ids:
+            return []
+        with sql.session_for_read() as session:
+            query = session.query(Endpoint)
+            query = query.filter(Endpoint.id.in_(endpoint_ids))
+            return [e.to_dict() for e in query.all()]
+
     def update_endpoint(self, endpoint_id, endpoint_ref):
         with sql.session_for_write() as session:
             ref = self._get_endpoint(session, endpoint_id)
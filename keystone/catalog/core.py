@@ -31,6 +31,7 @@ PROVIDERS = provider_api.ProviderAPIs
 
 # This is a general cache region for catalog administration (CRUD operations).
 MEMOIZE = cache.get_memoization_decorator(group='catalog')
+MEMOIZE_MULTI = cache.get_multi_memoization_decorator(group='catalog')
 
 # This builds a discrete cache region dedicated to complete service catalogs
 # computed for a given user + project pair. Any write operation to create,
@@ -229,6 +230,17 @@ class Manager(manager.Manager):
         except exception.NotFound:
             raise exception.EndpointNotFound(endpoint_id=endpoint_id)
 
+    @MEMOIZE_MULTI(get_endpoint)
+    def get_endpoints_by_ids(self, endpoint_ids):
+        """Get the endpoints with the given ids.
+
+        :param endpoint_ids: list of endpoint ids
+        :returns: a dict of the endpoint refs found, keyed by endpoint id.
+
+        """
+        return dict((endpoint['id'], endpoint) for endpoint in
+                    self.driver.list_endpoints_from_ids(endpoint_ids))
+
     @manager.response_truncated
     def list_endpoints(self, hints=None):
         return self.driver.list_endpoints(hints or driver_hints.Hints())
@@ -300,15 +312,12 @@ class Manager(manager.Manager):
 
         """
         refs = self.driver.list_endpoints_for_project(project_id)
-        filtered_endpoints = {}
-        for ref in refs:
-            try:
-                endpoint = self.get_endpoint(ref['endpoint_id'])
-                filtered_endpoints.update({ref['endpoint_id']: endpoint})
-            except exception.EndpointNotFound:
+        endpoint_ids = [ref['endpoint_id'] for ref in refs]
+        filtered_endpoints = self.get_endpoints_by_ids(endpoint_ids)
+        for endpoint_id in endpoint_ids:
+            if endpoint_id not in filtered_endpoints:
                 # remove bad reference from association
-                self.remove_endpoint_from_project(ref['endpoint_id'],
-                                                  project_id)
+                self.remove_endpoint_from_project(endpoint_id, project_id)
 
         # need to recover endpoint_groups associated with project
         # then for each endpoint group return the endpoints.
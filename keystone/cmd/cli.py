@@ -658,6 +658,42 @@ class CredentialMigrate(BasePermissionsSetup):
         klass.migrate_credentials()
 
 
+class RevocationPrune(BaseApp):
+    """Prune expired revocation events from the backend."""
+
+    name = 'revocation_prune'
+
+    @classmethod
+    def add_argument_parser(cls, subparsers):
+        parser = super(RevocationPrune, cls).add_argument_parser(subparsers)
+        parser.add_argument('--batch-size', default=None, type=int,
+                            help=('The maximum number of revocation events '
+                                  'to prune in a single transaction. '
+                                  'Defaults to [revoke] prune_batch_size.'))
+        parser.add_argument('--dry-run', default=False, action='store_true',
+                            help=('Only report how many expired revocation '
+                                  'events would be pruned.'))
+        return parser
+
+    @classmethod
+    def main(cls):
+        drivers = backends.load_backends()
+        revoke_manager = drivers['revoke_api']
+        batch_size = CONF.command.batch_size
+        dry_run = CONF.command.dry_run
+        if batch_size is not None and batch_size < 1:
+            raise SystemExit(_('--batch-size must be a positive integer.'))
+
+        events = revoke_manager.prune_expired_events(
+            batch_size=batch_size, dry_run=dry_run)
+
+        if dry_run:
+            print(_('%d expired revocation events would be pruned.') %
+                  events)
+        else:
+            print(_('Pruned %d expired revocation events.') % events)
+
+
 class TokenFlush(BaseApp):
     """Flush expired tokens from the backend."""
 
@@ -693,16 +729,41 @@ class TrustFlush(BaseApp):
         parser.add_argument('--trustee-user-id', default=None,
                             help=('The id of the trustee of which the expired '
                                   'trusts is to be purged'))
+        parser.add_argument('--batch-size', default=None, type=int,
+                            help=('The maximum number of trusts to purge in '
+                                  'a single transaction. Defaults to '
+                                  '[trust] flush_batch_size.'))
+        parser.add_argument('--dry-run', default=False, action='store_true',
+                            help=('Only report how many expired trusts and '
+                                  'orphaned trust roles would be purged.'))
         return parser
 
     @classmethod
     def main(cls):
         drivers = backends.load_backends()
         trust_manager = drivers['trust_api']
-        trust_manager.flush_expired_trusts(
+        batch_size = CONF.command.batch_size
+        dry_run = CONF.command.dry_run
+        if batch_size is not None and batch_size < 1:
+            raise SystemExit(_('--batch-size must be a positive integer.'))
+
+        trusts = trust_manager.flush_expired_trusts(
             project_id=CONF.command.project_id,
             trustor_user_id=CONF.command.trustor_user_id,
-            trustee_user_id=CONF.command.trustee_user_id)
+            trustee_user_id=CONF.command.trustee_user_id,
+            batch_size=batch_size,
+            dry_run=dry_run)
+        trust_roles = trust_manager.flush_orphaned_trust_roles(
+            batch_size=batch_size, dry_run=dry_run)
+
+        if dry_run:
+            print(_('%(trusts)d expired trusts and %(trust_roles)d orphaned '
+                    'trust roles would be purged.') %
+                  {'trusts': trusts, 'trust_roles': trust_roles})
+        else:
+            print(_('Purged %(trusts)d expired trusts and %(trust_roles)d '
+                    'orphaned trust roles.') %
+                  {'trusts': trusts, 'trust_roles': trust_roles})
 
 
 class MappingPurge(BaseApp):
@@ -1184,6 +1245,7 @@ CMDS = [
     MappingPopulate,
     MappingPurge,
     MappingEngineTester,
+    RevocationPrune,
     SamlIdentityProviderMetadata,
     TokenFlush,
     TokenRotate,
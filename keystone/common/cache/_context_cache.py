@@ -11,6 +11,8 @@
 # under the License.
 
 """A dogpile.cache proxy that caches objects in the request local cache."""
+import threading
+
 from dogpile.cache import api
 from dogpile.cache import proxy
 from oslo_context import context as oslo_context
@@ -20,6 +22,19 @@ from oslo_serialization import msgpackutils
 # Register our new handler.
 _registry = msgpackutils.default_registry
 
+# Number of lookups that missed the cache, per thread. A memoized call that
+# increases it had to compute its value, see keystone.common.manager.
+_misses = threading.local()
+
+
+def miss_count():
+    """Return the number of cache misses seen by the current thread."""
+    return getattr(_misses, 'count', 0)
+
+
+def _record_miss():
+    _misses.count = getattr(_misses, 'count', 0) + 1
+
 
 def _register_model_handler(handler_class):
     """Register a new model handler."""
@@ -74,9 +89,14 @@ class _ResponseCacheProxy(proxy.ProxyBackend):
             value = self.proxied.get(key)
             if value is not api.NO_VALUE:
                 self._set_local_cache(key, value)
+            else:
+                _record_miss()
         return value
 
     def set(self, key, value):
+        # A value is set after it was created for a stale or
+        # invalidated entry as well, count those as misses too.
+        _record_miss()
         self._set_local_cache(key, value)
         self.proxied.set(key, value)
 
@@ -0,0 +1,119 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""A dogpile.cache proxy that keeps an in-process LRU cache of entries."""
+
+import collections
+import threading
+import time
+
+from dogpile.cache import api
+from dogpile.cache import proxy
+from oslo_serialization import msgpackutils
+
+
+class _LocalCacheProxy(proxy.ProxyBackend):
+    """Serve recently used entries of a region from process memory.
+
+    The keys reaching the proxy already carry the id of the region, so
+    invalidating the whole region is seen immediately. Entries deleted by
+    another process may be served until they expire from this cache.
+
+    The entries are stored serialized, like in the request local cache, so
+    that callers modifying a returned value don't modify the cached one.
+    """
+
+    def __init__(self, size, expiration_time):
+        super(_LocalCacheProxy, self).__init__()
+        self.size = size
+        self.expiration_time = expiration_time
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] < time.time():
+                self.misses += 1
+                return api.NO_VALUE
+            # Keep the entry at the most recently used end.
+            self._entries[key] = entry
+            self.hits += 1
+        value = msgpackutils.loads(entry[1])
+        return api.CachedValue(payload=value['payload'],
+                               metadata=value['metadata'])
+
+    def _set_local(self, key, value):
+        serialized = msgpackutils.dumps(
+            {'payload': value.payload, 'metadata': value.metadata})
+        expires_at = time.time() + self.expiration_time
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (expires_at, serialized)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def _delete_local(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key):
+        value = self._get_local(key)
+        if value is api.NO_VALUE:
+            value = self.proxied.get(key)
+            if value is not api.NO_VALUE:
+                self._set_local(key, value)
+        return value
+
+    def set(self, key, value):
+        self._set_local(key, value)
+        self.proxied.set(key, value)
+
+    def delete(self, key):
+        self._delete_local(key)
+        self.proxied.delete(key)
+
+    def get_multi(self, keys):
+        values = {}
+        for key in keys:
+            value = self._get_local(key)
+            if value is not api.NO_VALUE:
+                values[key] = value
+        query_keys = [key for key in keys if key not in values]
+        if query_keys:
+            for key, value in zip(query_keys,
+                                  self.proxied.get_multi(query_keys)):
+                if value is not api.NO_VALUE:
+                    self._set_local(key, value)
+                values[key] = value
+        return [values[key] for key in keys]
+
+    def set_multi(self, mapping):
+        for key, value in mapping.items():
+            self._set_local(key, value)
+        self.proxied.set_multi(mapping)
+
+    def delete_multi(self, keys):
+        for key in keys:
+            self._delete_local(key)
+        self.proxied.delete_multi(keys)
@@ -14,39 +14,133 @@
 
 """Keystone Caching Layer Implementation."""
 
+import collections
+import functools
 import os
+import threading
+import time
 
 import dogpile.cache
+from dogpile.cache import api
 from dogpile.cache import region
 from dogpile.cache import util
 from oslo_cache import core as cache
 
 from keystone.common.cache import _context_cache
+from keystone.common.cache import _local_cache
 import keystone.conf
 
 
 CONF = keystone.conf.CONF
 
 
+class _RegionIdCache(object):
+    """The region ids of every configured region, kept in process memory.
+
+    Every cache key carries the id of its region, so looking the id up in the
+    invalidation region would double the round trips to the cache backend.
+    The ids are kept for ``[local_cache] region_id_expiration_time`` seconds
+    and then fetched again, all at once, so that regions invalidated by other
+    keystone processes are seen after that long at most.
+    """
+
+    def __init__(self, invalidation_region):
+        self._invalidation_region = invalidation_region
+        self._region_ids = {}
+        self._fetched_at = None
+        self._lock = threading.Lock()
+
+    def register(self, region_key):
+        with self._lock:
+            self._region_ids.setdefault(region_key, None)
+
+    def _fetch(self, region_keys):
+        values = self._invalidation_region.get_multi(region_keys)
+        return dict((region_key, None if value is api.NO_VALUE else value)
+                    for region_key, value in zip(region_keys, values))
+
+    def _refresh(self, known_ids):
+        # The backend is queried without holding the lock, the other threads
+        # keep using the known ids meanwhile.
+        try:
+            region_ids = self._fetch(list(known_ids))
+        except Exception:
+            with self._lock:
+                self._fetched_at = None
+            raise
+        with self._lock:
+            for region_key, region_id in region_ids.items():
+                # An id set while the ids were fetched is newer.
+                if self._region_ids.get(region_key) == known_ids[region_key]:
+                    self._region_ids[region_key] = region_id
+
+    def get(self, region_key, creator):
+        expiration_time = CONF.local_cache.region_id_expiration_time
+        if not expiration_time:
+            return self._invalidation_region.get_or_create(
+                region_key, creator, expiration_time=-1)
+
+        known_ids = None
+        with self._lock:
+            now = time.time()
+            if (self._fetched_at is None or
+                    now - self._fetched_at >= expiration_time):
+                # Only this thread fetches the ids.
+                self._fetched_at = now
+                known_ids = self._region_ids.copy()
+            region_id = self._region_ids.get(region_key)
+
+        if known_ids is not None:
+            self._refresh(known_ids)
+            with self._lock:
+                region_id = self._region_ids.get(region_key)
+
+        if region_id is None:
+            # Nobody used the region yet, or its id was evicted from the
+            # backend.
+            region_id = self._invalidation_region.get_or_create(
+                region_key, creator, expiration_time=-1)
+            self.set(region_key, region_id)
+        return region_id
+
+    def set(self, region_key, region_id):
+        with self._lock:
+            self._region_ids[region_key] = region_id
+
+    def clear(self):
+        """Forget the region ids, they are fetched again on next use."""
+        with self._lock:
+            self._region_ids = dict.fromkeys(self._region_ids)
+            self._fetched_at = None
+
+
 class RegionInvalidationManager(object):
 
     REGION_KEY_PREFIX = '<<<region>>>:'
 
-    def __init__(self, invalidation_region, region_name):
+    def __init__(self, invalidation_region, region_name, region_ids=None):
         self._invalidation_region = invalidation_region
         self._region_key = self.REGION_KEY_PREFIX + region_name
+        self._region_ids = region_ids
+        if region_ids is not None:
+            region_ids.register(self._region_key)
 
     def _generate_new_id(self):
         return os.urandom(10)
 
     @property
     def region_id(self):
+        if self._region_ids is not None:
+            return self._region_ids.get(self._region_key,
+                                        self._generate_new_id)
         return self._invalidation_region.get_or_create(
             self._region_key, self._generate_new_id, expiration_time=-1)
 
     def invalidate_region(self):
         new_region_id = self._generate_new_id()
         self._invalidation_region.set(self._region_key, new_region_id)
+        if self._region_ids is not None:
+            self._region_ids.set(self._region_key, new_region_id)
         return new_region_id
 
     def is_region_key(self, key):
@@ -110,8 +204,36 @@ def create_region(name):
 
 CACHE_REGION = create_region(name='shared default')
 CACHE_INVALIDATION_REGION = create_region(name='invalidation region')
+_REGION_IDS = _RegionIdCache(CACHE_INVALIDATION_REGION)
 
 register_model_handler = _context_cache._register_model_handler
+miss_count = _context_cache.miss_count
+
+# The in-process caches of the regions configured with one, by region name.
+_LOCAL_CACHES = {}
+
+
+def _create_local_cache(region):
+    if region.name not in CONF.local_cache.regions:
+        return None
+    size = CONF.local_cache.region_sizes.get(region.name,
+                                             CONF.local_cache.size)
+    expiration_time = CONF.local_cache.region_expiration_times.get(
+        region.name, CONF.local_cache.expiration_time)
+    local_cache = _local_cache._LocalCacheProxy(int(size),
+                                                int(expiration_time))
+    _LOCAL_CACHES[region.name] = local_cache
+    return local_cache
+
+
+def get_local_cache_stats():
+    """Return the hits, misses and size of the in-process region caches.
+
+    :returns: a dict keyed by region name, empty unless ``[local_cache]
+              regions`` is set.
+    """
+    return dict((name, local_cache.stats())
+                for name, local_cache in _LOCAL_CACHES.items())
 
 
 def configure_cache(region=None):
@@ -125,10 +247,17 @@ def configure_cache(region=None):
     # Only wrap the region if it was not configured. This should be pushed
     # to oslo_cache lib somehow.
     if not configured:
+        # The request local cache is the outermost proxy, so that a value
+        # already used by the request is served before the in-process cache
+        # is looked up.
+        if CONF.cache.enabled:
+            local_cache = _create_local_cache(region)
+            if local_cache is not None:
+                region.wrap(local_cache)
         region.wrap(_context_cache._ResponseCacheProxy)
 
         region_manager = RegionInvalidationManager(
-            CACHE_INVALIDATION_REGION, region.name)
+            CACHE_INVALIDATION_REGION, region.name, region_ids=_REGION_IDS)
         region.key_mangler = key_mangler_factory(
             region_manager, region.key_mangler)
         region.region_invalidator = DistributedInvalidationStrategy(
@@ -184,6 +313,98 @@ def get_memoization_decorator(group, expiration_group=None, region=None):
                                            expiration_group=expiration_group)
 
 
+def get_multi_memoization_decorator(group, expiration_group=None,
+                                    region=None):
+    """Build a decorator looking many entities up in the cache at once.
+
+    The decorator is applied with a getter memoized with the decorator built
+    by :func:`get_memoization_decorator` for the same ``group`` and
+    ``region``, which takes the id of a single entity. The decorated method
+    takes a list of ids and returns a dict of the entities found, keyed by
+    id. The entities are read from the cache with a single ``get_multi``, the
+    method is only called with the ids that were not cached, and what it
+    returns is cached under the keys of the getter, so both share their cache
+    entries and their invalidation.
+
+    Example usage::
+
+        MEMOIZE = cache.get_memoization_decorator(group='role')
+        MEMOIZE_MULTI = cache.get_multi_memoization_decorator(group='role')
+
+        @MEMOIZE
+        def get_role(self, role_id):
+            ...
+
+        @MEMOIZE_MULTI(get_role)
+        def get_roles_by_ids(self, role_ids):
+            ...
+
+    """
+    if region is None:
+        region = CACHE_REGION
+    memoize = get_memoization_decorator(
+        group, expiration_group=expiration_group, region=region)
+
+    def memoize_multi(getter):
+        # The keys of the getter, which is wrapped by the memoization
+        # decorator and maybe others, are generated from the original.
+        key_generator = region.function_key_generator(None, getter.original)
+
+        def decorator(fn):
+            @functools.wraps(fn)
+            def decorate(self, ids):
+                ids = list(collections.OrderedDict.fromkeys(ids))
+                if not ids:
+                    return {}
+                if not memoize.should_cache(None):
+                    return fn(self, ids)
+
+                keys = [key_generator(self, id_) for id_ in ids]
+                values = region.get_multi(
+                    keys, expiration_time=memoize.get_expiration_time())
+                refs = {}
+                missing = []
+                for id_, value in zip(ids, values):
+                    if value is api.NO_VALUE:
+                        missing.append(id_)
+                    else:
+                        refs[id_] = value
+                if missing:
+                    found = fn(self, missing)
+                    region.set_multi(dict(
+                        (key_generator(self, id_), ref)
+                        for id_, ref in found.items()))
+                    refs.update(found)
+                return refs
+            return decorate
+        return decorator
+    return memoize_multi
+
+
+def prime_memoization(manager, getter, refs, group, expiration_group=None,
+                      region=None):
+    """Cache what a memoized getter returns for many arguments at once.
+
+    ``getter`` is a method of ``manager`` memoized with the decorator built
+    by :func:`get_memoization_decorator` for the same ``group`` and
+    ``region``, which takes a single argument. ``refs`` maps the arguments of
+    the getter to what it returns for them, for example the entities of a
+    list call keyed by id. They are written with a single ``set_multi``
+    under the keys the getter reads, so the getter is served from the cache
+    without ever being called. Nothing is cached if caching is disabled for
+    ``group``.
+    """
+    if region is None:
+        region = CACHE_REGION
+    memoize = get_memoization_decorator(
+        group, expiration_group=expiration_group, region=region)
+    if not refs or not memoize.should_cache(None):
+        return
+    key_generator = region.function_key_generator(None, getter.original)
+    region.set_multi(dict((key_generator(manager, arg), ref)
+                          for arg, ref in refs.items()))
+
+
 # NOTE(stevemar): When memcache_pool, mongo and noop backends are removed
 # we no longer need to register the backends here.
 dogpile.cache.register_backend(
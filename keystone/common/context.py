@@ -14,6 +14,7 @@ from oslo_context import context as oslo_context
 
 
 REQUEST_CONTEXT_ENV = 'keystone.oslo_request_context'
+SQL_STATS_ENV = 'keystone.sql_stats'
 
 
 def _prop(name):
@@ -47,9 +48,13 @@ class RequestContext(oslo_context.RequestContext):
         self.oauth_access_token_id = kwargs.pop('oauth_access_token_id', None)
 
         self.authenticated = kwargs.pop('authenticated', False)
+
+        # The SQL statements issued for the request, if they are counted.
+        self.sql_stats = kwargs.pop('sql_stats', None)
         super(RequestContext, self).__init__(**kwargs)
 
     @classmethod
     def from_environ(cls, environ, **kwargs):
         kwargs.setdefault('request_id', environ.get('openstack.request_id'))
+        kwargs.setdefault('sql_stats', environ.get(SQL_STATS_ENV))
         return super(RequestContext, cls).from_environ(environ, **kwargs)
@@ -15,6 +15,7 @@
 
 import functools
 
+from keystone.common import utils
 from keystone import exception
 from keystone.i18n import _
 
@@ -110,3 +111,94 @@ class Hints(object):
     def set_limit(self, limit, truncated=False):
         """Set a limit to indicate the list should be truncated."""
         self.limit = {'limit': limit, 'truncated': truncated}
+
+
+def _get_attribute(ref, name):
+    """Return the value of an attribute, dotted names look into sub-dicts.
+
+    Nested dicts themselves are not values, this matches looking the name up
+    in the flattened reference without flattening it.
+
+    """
+    if name in ref:
+        value = ref[name]
+    else:
+        value = ref
+        for key in name.split('.'):
+            if not isinstance(value, dict) or key not in value:
+                return None
+            value = value[key]
+    if isinstance(value, dict):
+        return None
+    return value
+
+
+def _exact_predicate(filter_):
+    name = filter_['name']
+    value = filter_['value']
+    # Booleans accept their string forms, convert the value once.
+    bool_value = utils.attr_as_boolean(value)
+
+    def match(ref):
+        ref_value = _get_attribute(ref, name)
+        if type(ref_value) is bool:
+            return ref_value == bool_value
+        return ref_value == value
+    return match
+
+
+def _inexact_predicate(filter_):
+    name = filter_['name']
+    value = filter_['value']
+    case_sensitive = filter_['case_sensitive']
+    if not case_sensitive:
+        # We only support inexact filters on strings so it's OK to use lower()
+        value = value.lower()
+
+    comparator = filter_['comparator']
+    if comparator == 'contains':
+        def compare(target):
+            return value in target
+    elif comparator == 'startswith':
+        def compare(target):
+            return target.startswith(value)
+    elif comparator == 'endswith':
+        def compare(target):
+            return target.endswith(value)
+    else:
+        # We silently ignore unsupported filters, but the attribute has to
+        # be there.
+        def compare(target):
+            return True
+
+    def match(ref):
+        if name not in ref:
+            return False
+        target = ref[name]
+        if not case_sensitive:
+            target = target.lower()
+        return compare(target)
+    return match
+
+
+def filter_predicate(filters):
+    """Return a function telling whether a reference matches all filters.
+
+    This is for the filters a driver could not satisfy. The filters are
+    compiled once, so that a list can be filtered in a single pass::
+
+        match = driver_hints.filter_predicate(hints.filters)
+        refs = [ref for ref in refs if match(ref)]
+
+    """
+    predicates = [
+        _exact_predicate(f) if f['comparator'] == 'equals'
+        else _inexact_predicate(f)
+        for f in filters]
+
+    def match(ref):
+        for predicate in predicates:
+            if not predicate(ref):
+                return False
+        return True
+    return match
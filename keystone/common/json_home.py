@@ -86,6 +86,7 @@ class JsonHomeResources(object):
 
     __resources = {}
     __serialized_resource_data = None
+    __revision = 0
 
     @classmethod
     def _reset(cls):
@@ -93,11 +94,22 @@ class JsonHomeResources(object):
         # This is only used for testing.
         cls.__resources.clear()
         cls.__serialized_resource_data = None
+        cls.__revision += 1
 
     @classmethod
     def append_resource(cls, rel, data):
         cls.__resources[rel] = data
         cls.__serialized_resource_data = None
+        cls.__revision += 1
+
+    @classmethod
+    def revision(cls):
+        """Return a counter that changes whenever the resources change.
+
+        Consumers caching documents built from :meth:`resources` can use it
+        to detect that their copy is stale.
+        """
+        return cls.__revision
 
     @classmethod
     def resources(cls):
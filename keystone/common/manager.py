@@ -12,21 +12,33 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import bisect
 import functools
 import inspect
+import os
+import threading
 import time
 import types
 
 from oslo_log import log
+from oslo_serialization import jsonutils
 import six
 import stevedore
 
+from keystone.common import cache
 from keystone.common import provider_api
+import keystone.conf
 from keystone.i18n import _
 
 
+CONF = keystone.conf.CONF
 LOG = log.getLogger(__name__)
 
+# Upper bounds, in seconds, of the latency histogram buckets recorded for
+# every manager method when [DEFAULT] manager_instrumentation is enabled. The
+# last bucket counts the calls slower than the last bound.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
 if hasattr(inspect, 'getfullargspec'):
     getargspec = inspect.getfullargspec
 else:
@@ -81,22 +93,121 @@ def load_driver(namespace, driver_name, *args):
         raise ImportError(msg % {'name': driver_name, 'namespace': namespace})
 
 
-class _TraceMeta(type):
-    """A metaclass that, in trace mode, will log entry and exit of methods.
+class _MethodStats(object):
+    """Call statistics of a single manager method."""
+
+    __slots__ = ('calls', 'errors', 'total_time', 'max_time', 'histogram',
+                 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def to_dict(self):
+        buckets = ['%g' % b for b in LATENCY_BUCKETS] + ['+Inf']
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_time': self.total_time,
+            'max_time': self.max_time,
+            'latency_histogram': dict(zip(buckets, self.histogram)),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+
+class _Instrumentation(object):
+    """Per-method statistics of the instrumented manager methods."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._next_dump = 0
+
+    def record(self, fn_info, run_time, failed, cache_miss):
+        with self._lock:
+            stats = self._stats.get(fn_info)
+            if stats is None:
+                stats = self._stats[fn_info] = _MethodStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.total_time += run_time
+            stats.max_time = max(stats.max_time, run_time)
+            stats.histogram[bisect.bisect_left(LATENCY_BUCKETS,
+                                               run_time)] += 1
+            if cache_miss is not None:
+                if cache_miss:
+                    stats.cache_misses += 1
+                else:
+                    stats.cache_hits += 1
+            dump = False
+            now = time.time()
+            if now >= self._next_dump:
+                self._next_dump = now + CONF.manager_stats_interval
+                dump = bool(CONF.manager_stats_dir)
+        if dump:
+            self.dump()
+
+    def snapshot(self):
+        with self._lock:
+            return {fn_info: stats.to_dict()
+                    for fn_info, stats in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._next_dump = 0
+
+    def dump(self):
+        """Write the statistics of this process to the stats directory."""
+        path = os.path.join(CONF.manager_stats_dir,
+                            'keystone-manager-stats-%d.json' % os.getpid())
+        tmp_path = '%s.tmp' % path
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(jsonutils.dumps(
+                    {'pid': os.getpid(), 'timestamp': time.time(),
+                     'methods': self.snapshot()},
+                    indent=2, sort_keys=True))
+            os.rename(tmp_path, path)
+        except (IOError, OSError) as e:
+            LOG.warning('Unable to write manager statistics to %(path)s: '
+                        '%(error)s', {'path': path, 'error': e})
+
+
+INSTRUMENTATION = _Instrumentation()
 
-    This metaclass automatically wraps all methods on the class when
-    instantiated with a decorator that will log entry/exit from a method
-    when keystone is run in Trace log level.
+
+def get_method_stats():
+    """Return the statistics recorded for the instrumented manager methods.
+
+    :returns: a dict keyed by ``module.Class.method``, empty unless
+              ``[DEFAULT] manager_instrumentation`` is enabled.
+    """
+    return INSTRUMENTATION.snapshot()
+
+
+class _TraceMeta(type):
+    """A metaclass that can wrap the public methods of a class.
+
+    The public methods defined by the class are recorded when the class is
+    created, but they are only wrapped by ``_configure_tracing()`` once the
+    configuration and logging are set up. The wrapper logs entry and exit from
+    the method when keystone is run in Trace log level and records the calls
+    when ``[DEFAULT] manager_instrumentation`` is enabled. If neither is the
+    case the methods are left untouched, so tracing costs nothing at runtime
+    unless it is enabled.
     """
 
     @staticmethod
     def wrapper(__f, __classname):
         __argspec = getargspec(__f)
-        __fn_info = '%(module)s.%(classname)s.%(funcname)s' % {
-            'module': inspect.getmodule(__f).__name__,
-            'classname': __classname,
-            'funcname': __f.__name__
-        }
+        __fn_info = _TraceMeta._fn_info(__f, __classname)
         # NOTE(morganfainberg): Omit "cls" and "self" when printing trace logs
         # the index can be calculated at wrap time rather than at runtime.
         if __argspec.args and __argspec.args[0] in ('self', 'cls'):
@@ -108,51 +219,100 @@ class _TraceMeta(type):
         def wrapped(*args, **kwargs):
             __exc = None
             __t = time.time()
-            __do_trace = LOG.logger.getEffectiveLevel() <= log.TRACE
             __ret_val = None
             try:
-                if __do_trace:
-                    LOG.trace('CALL => %s', __fn_info)
+                LOG.trace('CALL => %s', __fn_info)
                 __ret_val = __f(*args, **kwargs)
             except Exception as e:  # nosec
                 __exc = e
                 raise
             finally:
-                if __do_trace:
-                    __subst = {
-                        'run_time': (time.time() - __t),
-                        'passed_args': ', '.join([
-                            ', '.join([repr(a)
-                                       for a in args[__arg_idx:]]),
-                            ', '.join(['%(k)s=%(v)r' % {'k': k, 'v': v}
-                                       for k, v in kwargs.items()]),
-                        ]),
-                        'function': __fn_info,
-                        'exception': __exc,
-                        'ret_val': __ret_val,
-                    }
-                    if __exc is not None:
-                        __msg = ('[%(run_time)ss] %(function)s '
-                                 '(%(passed_args)s) => raised '
-                                 '%(exception)r')
-                    else:
-                        # TODO(morganfainberg): find a way to indicate if this
-                        # was a cache hit or cache miss.
-                        __msg = ('[%(run_time)ss] %(function)s'
-                                 '(%(passed_args)s) => %(ret_val)r')
-                    LOG.trace(__msg, __subst)
+                __subst = {
+                    'run_time': (time.time() - __t),
+                    'passed_args': ', '.join([
+                        ', '.join([repr(a)
+                                   for a in args[__arg_idx:]]),
+                        ', '.join(['%(k)s=%(v)r' % {'k': k, 'v': v}
+                                   for k, v in kwargs.items()]),
+                    ]),
+                    'function': __fn_info,
+                    'exception': __exc,
+                    'ret_val': __ret_val,
+                }
+                if __exc is not None:
+                    __msg = ('[%(run_time)ss] %(function)s '
+                             '(%(passed_args)s) => raised '
+                             '%(exception)r')
+                else:
+                    __msg = ('[%(run_time)ss] %(function)s'
+                             '(%(passed_args)s) => %(ret_val)r')
+                LOG.trace(__msg, __subst)
             return __ret_val
         return wrapped
 
+    @staticmethod
+    def instrumented(f, classname):
+        fn_info = _TraceMeta._fn_info(f, classname)
+        # Memoized methods expose ``invalidate``, for those a call that
+        # misses the cache (itself or in anything it calls) is a cache miss.
+        memoized = hasattr(f, 'invalidate')
+
+        @functools.wraps(f)
+        def wrapped(*args, **kwargs):
+            failed = False
+            misses = cache.miss_count() if memoized else None
+            t = time.time()
+            try:
+                return f(*args, **kwargs)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                cache_miss = (cache.miss_count() > misses
+                              if memoized else None)
+                INSTRUMENTATION.record(fn_info, time.time() - t, failed,
+                                       cache_miss)
+        return wrapped
+
+    @staticmethod
+    def _fn_info(f, classname):
+        return '%(module)s.%(classname)s.%(funcname)s' % {
+            'module': inspect.getmodule(f).__name__,
+            'classname': classname,
+            'funcname': f.__name__
+        }
+
     def __new__(meta, classname, bases, class_dict):
-        final_cls_dict = {}
-        for attr_name, attr in class_dict.items():
-            # NOTE(morganfainberg): only wrap public instances and methods.
+        cls = type.__new__(meta, classname, bases, class_dict)
+        # NOTE(morganfainberg): only wrap public instances and methods.
+        cls._traceable_methods = tuple(
+            attr_name for attr_name, attr in class_dict.items()
             if (isinstance(attr, types.FunctionType) and
-                    not attr_name.startswith('_')):
-                attr = _TraceMeta.wrapper(attr, classname)
-            final_cls_dict[attr_name] = attr
-        return type.__new__(meta, classname, bases, final_cls_dict)
+                not attr_name.startswith('_')))
+        cls._trace_configured = False
+        return cls
+
+    def _configure_tracing(cls):
+        """Wrap the public methods of the class and its bases if needed.
+
+        This is done once per class, when the first instance is created.
+        """
+        trace = LOG.isEnabledFor(log.TRACE)
+        instrument = CONF.manager_instrumentation
+        for klass in cls.__mro__:
+            if (not isinstance(klass, _TraceMeta) or
+                    klass.__dict__.get('_trace_configured', True)):
+                continue
+            klass._trace_configured = True
+            if not (trace or instrument):
+                continue
+            for attr_name in klass._traceable_methods:
+                attr = klass.__dict__[attr_name]
+                if trace:
+                    attr = _TraceMeta.wrapper(attr, klass.__name__)
+                if instrument:
+                    attr = _TraceMeta.instrumented(attr, klass.__name__)
+                setattr(klass, attr_name, attr)
 
 
 @six.add_metaclass(_TraceMeta)
@@ -177,6 +337,8 @@ class Manager(object):
             raise ValueError('Programming Error: All managers must provide an '
                              'API that can be referenced by other components '
                              'of Keystone.')
+        if not type(self)._trace_configured:
+            type(self)._configure_tracing()
         if driver_name is not None:
             self.driver = load_driver(self.driver_namespace, driver_name)
         self.__register_provider_api()
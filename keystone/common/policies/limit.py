@@ -48,6 +48,16 @@ limit_policies = [
                      'method': 'GET'},
                     {'path': '/v3/limits',
                      'method': 'HEAD'}]),
+    policy.DocumentedRuleDefault(
+        name=base.IDENTITY % 'list_effective_limits',
+        check_str='',
+        scope_types=['system', 'project'],
+        description='List the limits that apply to a project, including '
+                    'registered default limits.',
+        operations=[{'path': '/v3/limits/effective',
+                     'method': 'GET'},
+                    {'path': '/v3/limits/effective',
+                     'method': 'HEAD'}]),
     policy.DocumentedRuleDefault(
         name=base.IDENTITY % 'create_limits',
         check_str=base.RULE_ADMIN_REQUIRED,
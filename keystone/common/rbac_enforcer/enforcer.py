@@ -10,12 +10,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 import copy
 import functools
+import hashlib
+import threading
 
 import flask
 from oslo_log import log
 from oslo_policy import policy as common_policy
+from oslo_serialization import jsonutils
 from oslo_utils import strutils
 
 from keystone.common import authorization
@@ -39,6 +43,87 @@ _POSSIBLE_TARGET_ACTIONS = frozenset([
     rule in policies.list_rules() if not rule.deprecated_for_removal
 ])
 _ENFORCEMENT_CHECK_ATTR = 'keystone:RBAC:enforcement_called'
+# Per-request (flask.g) memoization of the data gathered for enforcement.
+_RENDERED_CREDENTIALS_ATTR = 'keystone:RBAC:rendered_credentials'
+_MEMBER_TARGET_ATTR = 'keystone:RBAC:member_target'
+_SUBJECT_TOKEN_TARGET_ATTR = 'keystone:RBAC:subject_token_target'
+# Only the decisions of these methods are cached, they do not modify anything
+# so a cached decision can never let a change through that policy would
+# reject now.
+_READ_ONLY_METHODS = frozenset(['GET', 'HEAD'])
+
+
+class _PolicyEnforcer(common_policy.Enforcer):
+    """The oslo.policy Enforcer, counting the changes to its rules."""
+
+    generation = 0
+
+    def set_rules(self, rules, overwrite=True, use_conf=False):
+        super(_PolicyEnforcer, self).set_rules(
+            rules, overwrite=overwrite, use_conf=use_conf)
+        self.generation += 1
+
+
+class _DecisionCache(object):
+    """A bounded LRU cache of policy decisions.
+
+    Decisions are keyed by the rule, the credentials and the target, the
+    cache is cleared whenever the policy rules change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._decisions = collections.OrderedDict()
+        self._generation = None
+
+    @staticmethod
+    def key(action, credentials, target):
+        creds = {k: v for k, v in credentials.items() if k != 'token'}
+        token = credentials.get('token')
+        if token is not None:
+            creds['token'] = token.id
+        fingerprint = jsonutils.dumps([action, creds, target], sort_keys=True)
+        return hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+    def get(self, key, generation):
+        with self._lock:
+            if generation != self._generation:
+                self._decisions.clear()
+                self._generation = generation
+                return None
+            allowed = self._decisions.pop(key, None)
+            if allowed is not None:
+                # Re-insert to mark the decision as most recently used.
+                self._decisions[key] = allowed
+            return allowed
+
+    def set(self, key, generation, allowed, size):
+        with self._lock:
+            if generation != self._generation:
+                self._decisions.clear()
+                self._generation = generation
+            self._decisions[key] = allowed
+            while len(self._decisions) > size:
+                self._decisions.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._decisions.clear()
+            self._generation = None
+
+
+_DECISIONS = _DecisionCache()
+
+
+def _request_memo(attr):
+    """Return the per-request memoization dict stored on flask.g."""
+    if not flask.has_app_context():
+        return {}
+    memo = getattr(flask.g, attr, None)
+    if memo is None:
+        memo = {}
+        setattr(flask.g, attr, memo)
+    return memo
 
 
 class RBACEnforcer(object):
@@ -79,18 +164,7 @@ class RBACEnforcer(object):
             extra.update(exc=exception.ForbiddenAction, action=action,
                          do_raise=do_raise)
 
-        # NOTE(lbragstad): If there is a token in the credentials dictionary,
-        # it's going to be an instance of a TokenModel. We'll need to convert
-        # it to the a token response or dictionary before passing it to
-        # oslo.policy for enforcement. This is because oslo.policy shouldn't
-        # know how to deal with an internal object only used within keystone.
-        if 'token' in credentials:
-            token_ref = controller.render_token_response_from_model(
-                credentials['token']
-            )
-            credentials_copy = copy.deepcopy(credentials)
-            credentials_copy['token'] = token_ref
-            credentials = credentials_copy
+        credentials = self._render_credentials(credentials)
 
         try:
             return self._enforcer.enforce(
@@ -98,18 +172,73 @@ class RBACEnforcer(object):
         except common_policy.InvalidScope:
             raise exception.ForbiddenAction(action=action)
 
+    def _enforce_cached(self, credentials, action, target, cache_size):
+        """Enforce like `_enforce`, reusing cached decisions.
+
+        :param cache_size: the maximum number of decisions to keep cached.
+        :raises keystone.exception.ForbiddenAction: If verification fails.
+        """
+        # load_rules() only reloads the policy files if they changed, which
+        # bumps the generation and drops the cached decisions.
+        self._enforcer.load_rules()
+        generation = self._enforcer.generation
+        key = _DecisionCache.key(action, credentials, target)
+        allowed = _DECISIONS.get(key, generation)
+        if allowed is None:
+            try:
+                self._enforce(credentials, action, target)
+                allowed = True
+            except exception.ForbiddenAction:
+                allowed = False
+            _DECISIONS.set(key, generation, allowed, cache_size)
+        if not allowed:
+            raise exception.ForbiddenAction(action=action)
+
+    @staticmethod
+    def _render_credentials(credentials):
+        # NOTE(lbragstad): If there is a token in the credentials dictionary,
+        # it's going to be an instance of a TokenModel. We'll need to convert
+        # it to the a token response or dictionary before passing it to
+        # oslo.policy for enforcement. This is because oslo.policy shouldn't
+        # know how to deal with an internal object only used within keystone.
+        if 'token' not in credentials:
+            return credentials
+        # The credentials of a request do not change, render them once per
+        # request rather than on every enforcement.
+        memo = _request_memo(_RENDERED_CREDENTIALS_ATTR)
+        rendered = memo.get(id(credentials))
+        if rendered is not None and rendered[0] is credentials:
+            return rendered[1]
+        token_ref = controller.render_token_response_from_model(
+            credentials['token']
+        )
+        credentials_copy = copy.deepcopy(credentials)
+        credentials_copy['token'] = token_ref
+        memo[id(credentials)] = (credentials, credentials_copy)
+        return credentials_copy
+
     def _reset(self):
         # NOTE(morgan): Used for TEST purposes only.
         self.__ENFORCER = None
+        _DECISIONS.clear()
 
     @property
     def _enforcer(self):
         # The raw oslo-policy enforcer object
         if self.__ENFORCER is None:
-            self.__ENFORCER = common_policy.Enforcer(CONF)
+            self.__ENFORCER = _PolicyEnforcer(CONF)
             self.register_rules(self.__ENFORCER)
         return self.__ENFORCER
 
+    @classmethod
+    def prepare_enforcer(cls):
+        """Build the oslo.policy enforcer and load the policy rules.
+
+        This is called when the application is created, so the first
+        requests do not pay for registering and parsing the rules.
+        """
+        cls()._enforcer.load_rules()
+
     @staticmethod
     def _extract_filter_values(filters):
         """Extract filter data from query params for RBAC enforcement."""
@@ -176,9 +305,12 @@ class RBACEnforcer(object):
                         #
                         # TODO(morgan): add (future) support for passing class
                         # instantiation args.
-                        ret_dict['target'] = {
-                            member_name: func(flask.request.view_args[key])
-                        }
+                        memo = _request_memo(_MEMBER_TARGET_ATTR)
+                        memo_key = (member_name, flask.request.view_args[key])
+                        if memo_key not in memo:
+                            memo[memo_key] = func(
+                                flask.request.view_args[key])
+                        ret_dict['target'] = {member_name: memo[memo_key]}
         return ret_dict
 
     @staticmethod
@@ -196,6 +328,9 @@ class RBACEnforcer(object):
         # of the auth paths.
         target = 'token'
         subject_token = flask.request.headers.get('X-Subject-Token')
+        memo = _request_memo(_SUBJECT_TOKEN_TARGET_ATTR)
+        if subject_token is not None and subject_token in memo:
+            return copy.deepcopy(memo[subject_token])
         if subject_token is not None:
             allow_expired = (strutils.bool_from_string(
                 flask.request.args.get('allow_expired', False),
@@ -217,6 +352,7 @@ class RBACEnforcer(object):
                 ret_dict[target].setdefault('user', {})
                 ret_dict[target]['user'].setdefault('domain', {})
                 ret_dict[target]['user']['domain']['id'] = user_domain_id
+            memo[subject_token] = copy.deepcopy(ret_dict)
         return ret_dict
 
     @staticmethod
@@ -403,8 +539,14 @@ class RBACEnforcer(object):
 
         # Instantiate the enforcer object if needed.
         enforcer_obj = enforcer or cls()
-        enforcer_obj._enforce(
-            credentials=creds, action=action, target=flattened)
+        cache_size = CONF.policy.enforcement_cache_size
+        if cache_size and flask.request.method in _READ_ONLY_METHODS:
+            enforcer_obj._enforce_cached(
+                credentials=creds, action=action, target=flattened,
+                cache_size=cache_size)
+        else:
+            enforcer_obj._enforce(
+                credentials=creds, action=action, target=flattened)
         LOG.debug('RBAC: Authorization granted')
 
     @classmethod
@@ -18,8 +18,11 @@ Before using this module, call initialize(). This has to be done before
 CONF() because it sets up configuration options.
 
 """
+import contextlib
 import datetime
 import functools
+import time
+
 import pytz
 
 from oslo_db import exception as db_exception
@@ -33,6 +36,7 @@ from osprofiler import opts as profiler
 import osprofiler.sqlalchemy
 import six
 import sqlalchemy as sql
+from sqlalchemy import event
 from sqlalchemy.ext import declarative
 from sqlalchemy.orm.attributes import flag_modified, InstrumentedAttribute
 from sqlalchemy import types as sql_types
@@ -311,6 +315,118 @@ def _wrap_session(sess):
     return sess
 
 
+class StatementStats(object):
+    """The SQL statements issued while collecting statistics.
+
+    ``rows`` is the number of rows the database driver reported for the
+    statements, drivers not reporting a row count for a statement (such as
+    SQLite for SELECT statements) count no rows for it.
+
+    """
+
+    def __init__(self, record_statements=False):
+        self.statements = 0
+        self.rows = 0
+        self.time = 0.0
+        self.recorded = [] if record_statements else None
+
+    def record(self, statement, rows, elapsed):
+        self.statements += 1
+        self.rows += rows
+        self.time += elapsed
+        if self.recorded is not None:
+            self.recorded.append(statement)
+
+    def to_header(self):
+        return 'statements=%d; rows=%d; time=%.3f' % (
+            self.statements, self.rows, self.time)
+
+
+_STATS_CONTEXT = None
+_STATEMENT_START_KEY = 'keystone.statement_start'
+_listening_for_statements = False
+
+
+def _active_statement_stats():
+    global _STATS_CONTEXT
+    if _STATS_CONTEXT is None:
+        # NOTE: Delay the `threading.local` import for the same reason as
+        # _get_context() does.
+        import threading
+        _STATS_CONTEXT = threading.local()
+    try:
+        return _STATS_CONTEXT.stats
+    except AttributeError:
+        _STATS_CONTEXT.stats = []
+        return _STATS_CONTEXT.stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany):
+    if _active_statement_stats():
+        conn.info.setdefault(_STATEMENT_START_KEY, []).append(time.time())
+
+
+def _record_statement(conn, statement, rows):
+    starts = conn.info.get(_STATEMENT_START_KEY)
+    if not starts:
+        return
+    elapsed = time.time() - starts.pop()
+    for stats in _active_statement_stats():
+        stats.record(statement, rows, elapsed)
+
+    slow_statement_time = CONF.sql_slow_statement_time
+    if slow_statement_time and elapsed >= slow_statement_time:
+        LOG.warning('SQL statement took %(elapsed).3f seconds: %(statement)s',
+                    {'elapsed': elapsed, 'statement': statement})
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    _record_statement(conn, statement, max(cursor.rowcount, 0))
+
+
+def _handle_error(exception_context):
+    if exception_context.connection is not None:
+        _record_statement(exception_context.connection,
+                          exception_context.statement, 0)
+
+
+def _listen_for_statements():
+    global _listening_for_statements
+    if _listening_for_statements:
+        return
+    # NOTE: Listening on the Engine class covers the engines oslo.db creates
+    # on demand, the listeners return straight away unless statistics are
+    # being collected in the current thread.
+    event.listen(sql.engine.Engine, 'before_cursor_execute',
+                 _before_cursor_execute)
+    event.listen(sql.engine.Engine, 'after_cursor_execute',
+                 _after_cursor_execute)
+    event.listen(sql.engine.Engine, 'handle_error', _handle_error)
+    _listening_for_statements = True
+
+
+@contextlib.contextmanager
+def statement_stats(record_statements=False):
+    """Count the SQL statements issued by the current thread.
+
+    Yields a :class:`StatementStats` updated with every statement issued until
+    the block exits. Blocks may be nested, a statement is counted by all of
+    the enclosing blocks. The text of the statements is kept as well if
+    ``record_statements`` is True.
+
+    """
+    _listen_for_statements()
+    stats = StatementStats(record_statements=record_statements)
+    active = _active_statement_stats()
+    active.append(stats)
+    try:
+        yield stats
+    finally:
+        active.remove(stats)
+
+
 def truncated(f):
     return driver_hints.truncated(f)
 
@@ -350,6 +466,16 @@ class _WontMatch(Exception):
         # Otherwise the value could match a value in the column.
 
 
+_LIKE_ESCAPE = '/'
+
+
+def _escape_like(value):
+    """Escape the wildcards of a LIKE pattern so that they match literally."""
+    for char in (_LIKE_ESCAPE, '%', '_'):
+        value = value.replace(char, _LIKE_ESCAPE + char)
+    return value
+
+
 def _filter(model, query, hints):
     """Apply filtering to a query.
 
@@ -376,31 +502,29 @@ def _filter(model, query, hints):
         """
         column_attr = getattr(model, filter_['name'])
 
-        # TODO(henry-nash): Sqlalchemy 0.7 defaults to case insensitivity
-        # so once we find a way of changing that (maybe on a call-by-call
-        # basis), we can add support for the case sensitive versions of
-        # the filters below.  For now, these case sensitive versions will
-        # be handled at the controller level.
-
-        if filter_['case_sensitive']:
-            return query
-
         if filter_['comparator'] == 'contains':
-            _WontMatch.check(filter_['value'], column_attr)
-            query_term = column_attr.ilike('%%%s%%' % filter_['value'])
+            pattern = '%%%s%%'
         elif filter_['comparator'] == 'startswith':
-            _WontMatch.check(filter_['value'], column_attr)
-            query_term = column_attr.ilike('%s%%' % filter_['value'])
+            pattern = '%s%%'
         elif filter_['comparator'] == 'endswith':
-            _WontMatch.check(filter_['value'], column_attr)
-            query_term = column_attr.ilike('%%%s' % filter_['value'])
+            pattern = '%%%s'
         else:
             # It's a filter we don't understand, so let the caller
             # work out if they need to do something with it.
             return query
 
+        _WontMatch.check(filter_['value'], column_attr)
+        pattern = pattern % _escape_like(filter_['value'])
+
+        if filter_['case_sensitive']:
+            # NOTE: Whether LIKE is case sensitive depends on the database
+            # and the collation of the column. Narrow the query down anyway,
+            # it returns a superset of the matches, and leave the filter to
+            # the caller.
+            return query.filter(column_attr.like(pattern, escape=_LIKE_ESCAPE))
+
         satisfied_filters.append(filter_)
-        return query.filter(query_term)
+        return query.filter(column_attr.ilike(pattern, escape=_LIKE_ESCAPE))
 
     def exact_filter(model, query, filter_, satisfied_filters):
         """Apply an exact filter to a query.
@@ -14,6 +14,27 @@
 from keystone.common.validation import validators
 
 
+# NOTE: Validators are stored by the id of their schema. Request schemas are
+# module level constants, and the schema is kept with its validator so that
+# its id cannot be reused by another object while the entry exists.
+_VALIDATORS = {}
+
+
+def get_validator(request_body_schema):
+    """Return the cached validator for a schema, creating it if needed.
+
+    :param request_body_schema: a schema to validate resource references
+    :returns: a :class:`validators.SchemaValidator` for the schema
+
+    """
+    entry = _VALIDATORS.get(id(request_body_schema))
+    if entry is None or entry[0] is not request_body_schema:
+        entry = (request_body_schema,
+                 validators.SchemaValidator(request_body_schema))
+        _VALIDATORS[id(request_body_schema)] = entry
+    return entry[1]
+
+
 def lazy_validate(request_body_schema, resource_to_validate):
     """A non-decorator way to validate a request, to be used inline.
 
@@ -26,8 +47,7 @@ def lazy_validate(request_body_schema, resource_to_validate):
                        signature
 
     """
-    schema_validator = validators.SchemaValidator(request_body_schema)
-    schema_validator.validate(resource_to_validate)
+    get_validator(request_body_schema).validate(resource_to_validate)
 
 
 def nullable(property_schema):
@@ -34,6 +34,7 @@ from keystone.conf import fernet_tokens
 from keystone.conf import identity
 from keystone.conf import identity_mapping
 from keystone.conf import ldap
+from keystone.conf import local_cache
 from keystone.conf import memcache
 from keystone.conf import oauth1
 from keystone.conf import policy
@@ -69,6 +70,7 @@ conf_modules = [
     identity,
     identity_mapping,
     ldap,
+    local_cache,
     memcache,
     oauth1,
     policy,
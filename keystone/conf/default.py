@@ -63,6 +63,18 @@ the value of the base URL contains a path that keystone does not automatically
 infer (`/prefix/v3`), or if the endpoint should be found on a different host.
 """))
 
+discovery_cache_max_age = cfg.IntOpt(
+    'discovery_cache_max_age',
+    default=300,
+    min=0,
+    help=utils.fmt("""
+Number of seconds clients and intermediate caches may reuse the version
+discovery and JSON Home documents served at `/` and `/v3` before revalidating
+them. The documents are always served with an ETag, so revalidation is a
+conditional request that does not transfer the document again unless it
+changed. Set to 0 to require revalidation on every request.
+"""))
+
 max_project_tree_depth = cfg.IntOpt(
     'max_project_tree_depth',
     default=5,
@@ -198,12 +210,84 @@ notification_opt_out=identity.user.create
 notification_opt_out=identity.authenticate.success
 """))
 
+manager_instrumentation = cfg.BoolOpt(
+    'manager_instrumentation',
+    default=False,
+    help=utils.fmt("""
+If set to true, keystone records the number of calls, a latency histogram and
+the cache hits and misses of every public manager method. The statistics are
+written to `[DEFAULT] manager_stats_dir`. This is intended for profiling a
+deployment and adds a small overhead to every manager call, leave it disabled
+otherwise. Unlike TRACE logging it does not log the arguments or results of
+the calls.
+"""))
+
+manager_stats_dir = cfg.StrOpt(
+    'manager_stats_dir',
+    help=utils.fmt("""
+Directory the manager statistics are written to when
+`[DEFAULT] manager_instrumentation` is enabled. Each keystone process writes
+its own `keystone-manager-stats-<pid>.json` file. If left undefined, the
+statistics are only available in memory.
+"""))
+
+manager_stats_interval = cfg.IntOpt(
+    'manager_stats_interval',
+    default=60,
+    min=1,
+    help=utils.fmt("""
+Minimum number of seconds between two writes of the manager statistics file.
+"""))
+
+sql_instrumentation = cfg.BoolOpt(
+    'sql_instrumentation',
+    default=False,
+    help=utils.fmt("""
+If set to true, keystone counts the SQL statements issued to serve every API
+request, along with the number of rows and the time spent in the database.
+Requests slower than `[DEFAULT] sql_slow_request_time` and statements slower
+than `[DEFAULT] sql_slow_statement_time` are logged as warnings. This helps
+finding API calls issuing a query per returned item and adds a small overhead
+to every SQL statement, leave it disabled otherwise.
+"""))
+
+sql_slow_statement_time = cfg.FloatOpt(
+    'sql_slow_statement_time',
+    default=0.5,
+    min=0,
+    help=utils.fmt("""
+Number of seconds after which a single SQL statement is logged, with its text,
+when `[DEFAULT] sql_instrumentation` is enabled. Set to 0 to not log slow
+statements.
+"""))
+
+sql_slow_request_time = cfg.FloatOpt(
+    'sql_slow_request_time',
+    default=1.0,
+    min=0,
+    help=utils.fmt("""
+Number of seconds after which an API request is logged, with the number of SQL
+statements it issued, when `[DEFAULT] sql_instrumentation` is enabled. Set to
+0 to not log slow requests.
+"""))
+
+sql_stats_header = cfg.BoolOpt(
+    'sql_stats_header',
+    default=False,
+    help=utils.fmt("""
+If set to true and `[DEFAULT] sql_instrumentation` is enabled, every response
+carries an `X-Keystone-SQL-Stats` header with the number of SQL statements,
+rows and seconds spent in the database to serve the request. This is intended
+for debugging, it tells clients about the internals of the deployment.
+"""))
+
 
 GROUP_NAME = 'DEFAULT'
 ALL_OPTS = [
     admin_token,
     public_endpoint,
     admin_endpoint,
+    discovery_cache_max_age,
     max_project_tree_depth,
     max_param_size,
     max_token_size,
@@ -215,6 +299,13 @@ ALL_OPTS = [
     default_publisher_id,
     notification_format,
     notification_opt_out,
+    manager_instrumentation,
+    manager_stats_dir,
+    manager_stats_interval,
+    sql_instrumentation,
+    sql_slow_statement_time,
+    sql_slow_request_time,
+    sql_stats_header,
 ]
 
 
@@ -24,10 +24,28 @@ namespace. Only a `sql` driver is provided by keystone, so there is no reason
 to set this unless you are providing a custom entry point.
 """))
 
+caching = cfg.BoolOpt(
+    'caching',
+    default=True,
+    help=utils.fmt("""
+Toggle for caching the policy resolved for each endpoint. This has no effect
+unless global caching is enabled. The cached data is recomputed whenever a
+policy association, endpoint, service or region changes.
+"""))
+
+cache_time = cfg.IntOpt(
+    'cache_time',
+    help=utils.fmt("""
+Time to cache the policy resolved for each endpoint (in seconds). This has no
+effect unless global and endpoint policy caching are both enabled.
+"""))
+
 
 GROUP_NAME = __name__.split('.')[-1]
 ALL_OPTS = [
     driver,
+    caching,
+    cache_time,
 ]
 
 
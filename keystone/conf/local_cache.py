@@ -0,0 +1,100 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from oslo_config import cfg
+
+from keystone.conf import utils
+
+
+regions = cfg.ListOpt(
+    'regions',
+    default=[],
+    help=utils.fmt("""
+Names of the cache regions that keep an in-process LRU cache of their entries
+in front of the configured cache backend, saving a round trip to the backend
+for entries used by every request. Keystone uses the `shared default`,
+`computed assignments`, `computed catalog region`, `endpoint policy region`,
+`id mapping`, `revoke`, `tokens` and `trust chains` regions. Entries
+invalidated by another keystone process may be served from the in-process
+cache until they expire from it, see `[local_cache] expiration_time`.
+Invalidating a whole region is seen by every process after `[local_cache]
+region_id_expiration_time` at most. This has no effect unless global caching
+is enabled.
+"""))
+
+size = cfg.IntOpt(
+    'size',
+    default=1024,
+    min=1,
+    help=utils.fmt("""
+Maximum number of entries kept in the in-process cache of each region, the
+least recently used entries are dropped first.
+"""))
+
+expiration_time = cfg.IntOpt(
+    'expiration_time',
+    default=10,
+    min=1,
+    help=utils.fmt("""
+Number of seconds an entry is kept in the in-process cache of a region. This
+bounds how long an entry deleted by another keystone process may still be
+served.
+"""))
+
+region_sizes = cfg.DictOpt(
+    'region_sizes',
+    default={},
+    help=utils.fmt("""
+Per region overrides of `[local_cache] size`, as a mapping of region names to
+numbers of entries.
+"""))
+
+region_expiration_times = cfg.DictOpt(
+    'region_expiration_times',
+    default={},
+    help=utils.fmt("""
+Per region overrides of `[local_cache] expiration_time`, as a mapping of region
+names to numbers of seconds.
+"""))
+
+region_id_expiration_time = cfg.IntOpt(
+    'region_id_expiration_time',
+    default=1,
+    min=0,
+    help=utils.fmt("""
+Number of seconds the ids of the cache regions are kept in process memory.
+Every cache key carries the id of its region, and invalidating a region gives
+it a new id, so this bounds how long a region invalidated by another keystone
+process may still be served from the cache. The ids of all the regions are
+fetched again at once when they expire. Set to 0 to look the id up in the
+cache backend for every cache key, which doubles the round trips to the
+backend.
+"""))
+
+
+GROUP_NAME = __name__.split('.')[-1]
+ALL_OPTS = [
+    regions,
+    size,
+    expiration_time,
+    region_sizes,
+    region_expiration_times,
+    region_id_expiration_time,
+]
+
+
+def register_opts(conf):
+    conf.register_opts(ALL_OPTS, group=GROUP_NAME)
+
+
+def list_opts():
+    return {GROUP_NAME: ALL_OPTS}
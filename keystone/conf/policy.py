@@ -31,11 +31,24 @@ list_limit = cfg.IntOpt(
 Maximum number of entities that will be returned in a policy collection.
 """))
 
+enforcement_cache_size = cfg.IntOpt(
+    'enforcement_cache_size',
+    default=0,
+    min=0,
+    help=utils.fmt("""
+Maximum number of policy decisions for read-only (GET and HEAD) API requests
+kept in an in-memory cache per keystone process. A decision is reused only for
+the same rule, the same credentials (including the roles of the token) and the
+same target, and all cached decisions are dropped when the policy files change.
+Set to 0 to disable the cache.
+"""))
+
 
 GROUP_NAME = __name__.split('.')[-1]
 ALL_OPTS = [
     driver,
     list_limit,
+    enforcement_cache_size,
 ]
 
 
@@ -33,6 +33,28 @@ The number of seconds after a token has expired before a corresponding
 revocation event may be purged from the backend.
 """))
 
+prune_interval = cfg.IntOpt(
+    'prune_interval',
+    default=300,
+    min=0,
+    help=utils.fmt("""
+Minimum number of seconds between two purges of expired revocation events
+triggered by recording a new revocation event, per keystone process. The purge
+runs after the new event is committed. Set this to 0 to never purge while
+recording events and run `keystone-manage revocation_prune` periodically
+instead.
+"""))
+
+prune_batch_size = cfg.IntOpt(
+    'prune_batch_size',
+    default=1000,
+    min=1,
+    help=utils.fmt("""
+Maximum number of expired revocation events deleted in a single database
+transaction. Smaller values keep write transactions short at the cost of more
+round trips.
+"""))
+
 caching = cfg.BoolOpt(
     'caching',
     default=True,
@@ -56,6 +78,8 @@ GROUP_NAME = __name__.split('.')[-1]
 ALL_OPTS = [
     driver,
     expiration_buffer,
+    prune_interval,
+    prune_batch_size,
     caching,
     cache_time,
 ]
@@ -42,12 +42,41 @@ Keystone only provides a `sql` driver, so there is no reason to change this
 unless you are providing a custom entry point.
 """))
 
+flush_batch_size = cfg.IntOpt(
+    'flush_batch_size',
+    default=1000,
+    min=1,
+    help=utils.fmt("""
+Maximum number of trusts deleted in a single database transaction when
+purging expired trusts with `keystone-manage trust_flush` or deleting the
+trusts of a removed project. Smaller values keep write transactions short on
+large deployments at the cost of more round trips.
+"""))
+
+caching = cfg.BoolOpt(
+    'caching',
+    default=True,
+    help=utils.fmt("""
+Toggle for caching the chains of redelegated trusts. This has no effect unless
+global caching is enabled. The cached chains are dropped whenever a trust is
+deleted.
+"""))
+
+cache_time = cfg.IntOpt(
+    'cache_time',
+    help=utils.fmt("""
+Time to cache the chains of redelegated trusts (in seconds). This has no
+effect unless global and trust caching are both enabled.
+"""))
 
 GROUP_NAME = __name__.split('.')[-1]
 ALL_OPTS = [
     allow_redelegation,
     max_redelegation_count,
     driver,
+    flush_batch_size,
+    caching,
+    cache_time,
 ]
 
 
@@ -36,9 +36,23 @@ WARNING: NOT INTENDED FOR USE IN PRODUCTION. THIS MIDDLEWARE CAN AND WILL EMIT
 SENSITIVE/PRIVILEGED DATA.
 """))
 
+warm_start = cfg.BoolOpt(
+    'warm_start',
+    default=False,
+    help=utils.fmt("""
+If set to true, keystone loads the domain specific drivers, checks that the
+Fernet keys can be read, opens the cache connections and primes the caches of
+the roles, domains, catalog and service providers before serving the first
+request, so a process that joins the pool after a restart is already fast.
+The caches are primed from a single list call per entity type, which every
+process runs when it starts. The time taken by each startup step is logged.
+Priming the caches requires `[cache] enabled`.
+"""))
+
 GROUP_NAME = __name__.split('.')[-1]
 ALL_OPTS = [
     debug_middlware,
+    warm_start,
 ]
 
 
@@ -118,6 +118,17 @@ class EndpointPolicyDriverBase(object):
         """
         raise exception.NotImplemented()  # pragma: no cover
 
+    def list_policy_associations(self):
+        """List all the policy associations.
+
+        This method is not exposed as a public API, but is used to resolve
+        the policies of all endpoints at once.
+
+        :returns: List of association dicts
+
+        """
+        raise exception.NotImplemented()  # pragma: no cover
+
     @abc.abstractmethod
     def delete_association_by_endpoint(self, endpoint_id):
         """Remove all the policy associations with the specific endpoint.
@@ -116,6 +116,11 @@ class EndpointPolicy(base.EndpointPolicyDriverBase):
             query = query.filter_by(policy_id=policy_id)
             return [ref.to_dict() for ref in query.all()]
 
+    def list_policy_associations(self):
+        with sql.session_for_read() as session:
+            query = session.query(PolicyAssociation)
+            return [ref.to_dict() for ref in query.all()]
+
     def delete_association_by_endpoint(self, endpoint_id):
         with sql.session_for_write() as session:
             query = session.query(PolicyAssociation)
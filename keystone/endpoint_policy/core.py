@@ -14,17 +14,27 @@
 
 from oslo_log import log
 
+from keystone.common import cache
 from keystone.common import manager
 from keystone.common import provider_api
 import keystone.conf
 from keystone import exception
 from keystone.i18n import _
+from keystone import notifications
 
 
 CONF = keystone.conf.CONF
 LOG = log.getLogger(__name__)
 PROVIDERS = provider_api.ProviderAPIs
 
+# This is a general cache region for the policies resolved for endpoints. Any
+# change to a policy association or to the catalog entities they refer to
+# invalidates the whole region.
+ENDPOINT_POLICY_REGION = cache.create_region(name='endpoint policy region')
+MEMOIZE_ENDPOINT_POLICY = cache.get_memoization_decorator(
+    group='endpoint_policy',
+    region=ENDPOINT_POLICY_REGION)
+
 
 class Manager(manager.Manager):
     """Default pivot point for the Endpoint Policy backend.
@@ -39,6 +49,15 @@ class Manager(manager.Manager):
 
     def __init__(self):
         super(Manager, self).__init__(CONF.endpoint_policy.driver)
+        for resource_type in ['endpoint', 'service', 'region']:
+            for action in [notifications.ACTIONS.created,
+                           notifications.ACTIONS.updated,
+                           notifications.ACTIONS.deleted]:
+                notifications.register_event_callback(
+                    action, resource_type, self._on_catalog_change)
+
+    def _on_catalog_change(self, service, resource_type, operation, payload):
+        ENDPOINT_POLICY_REGION.invalidate()
 
     def _assert_valid_association(self, endpoint_id, service_id, region_id):
         """Assert that the association is supported.
@@ -69,6 +88,7 @@ class Manager(manager.Manager):
         self._assert_valid_association(endpoint_id, service_id, region_id)
         self.driver.create_policy_association(policy_id, endpoint_id,
                                               service_id, region_id)
+        ENDPOINT_POLICY_REGION.invalidate()
 
     def check_policy_association(self, policy_id, endpoint_id=None,
                                  service_id=None, region_id=None):
@@ -81,6 +101,97 @@ class Manager(manager.Manager):
         self._assert_valid_association(endpoint_id, service_id, region_id)
         self.driver.delete_policy_association(policy_id, endpoint_id,
                                               service_id, region_id)
+        ENDPOINT_POLICY_REGION.invalidate()
+
+    def delete_association_by_endpoint(self, endpoint_id):
+        self.driver.delete_association_by_endpoint(endpoint_id)
+        ENDPOINT_POLICY_REGION.invalidate()
+
+    def delete_association_by_service(self, service_id):
+        self.driver.delete_association_by_service(service_id)
+        ENDPOINT_POLICY_REGION.invalidate()
+
+    def delete_association_by_region(self, region_id):
+        self.driver.delete_association_by_region(region_id)
+        ENDPOINT_POLICY_REGION.invalidate()
+
+    def delete_association_by_policy(self, policy_id):
+        self.driver.delete_association_by_policy(policy_id)
+        ENDPOINT_POLICY_REGION.invalidate()
+
+    @MEMOIZE_ENDPOINT_POLICY
+    def _get_endpoint_policy_table(self):
+        """Resolve the policy associations of all endpoints at once.
+
+        :returns: a dict containing ``policy_ids``, which maps endpoint IDs
+                  to the ID of the policy in effect for the endpoint,
+                  ``endpoints_by_service``, which maps service IDs to the IDs
+                  of their endpoints, and ``endpoints_by_region``, which maps
+                  region IDs to a dict of service IDs and the IDs of their
+                  endpoints in that region or any region below it.
+
+        """
+        by_endpoint = {}
+        by_service = {}
+        by_service_and_region = {}
+        for ref in self.driver.list_policy_associations():
+            if ref.get('endpoint_id') is not None:
+                by_endpoint[ref['endpoint_id']] = ref['policy_id']
+            elif ref.get('region_id') is not None:
+                by_service_and_region[
+                    (ref['service_id'], ref['region_id'])] = ref['policy_id']
+            else:
+                by_service[ref['service_id']] = ref['policy_id']
+
+        parent_region_ids = dict(
+            (region['id'], region.get('parent_region_id'))
+            for region in PROVIDERS.catalog_api.list_regions())
+
+        def _get_region_chain(region_id):
+            """Return the region and its parents, nearest first."""
+            chain = []
+            while region_id is not None:
+                if region_id in chain:
+                    msg = ('Circular reference or a repeated entry found '
+                           'in region tree - %(region_id)s.')
+                    LOG.error(msg, {'region_id': region_id})
+                    break
+                chain.append(region_id)
+                region_id = parent_region_ids.get(region_id)
+            return chain
+
+        # Explicit associations apply even if the endpoint is not (or no
+        # longer) in the catalog.
+        policy_ids = dict(by_endpoint)
+        endpoints_by_service = {}
+        endpoints_by_region = {}
+        for endpoint in PROVIDERS.catalog_api.list_endpoints():
+            endpoint_id = endpoint['id']
+            service_id = endpoint['service_id']
+            endpoints_by_service.setdefault(service_id, []).append(
+                endpoint_id)
+            region_chain = _get_region_chain(endpoint.get('region_id'))
+            for region_id in region_chain:
+                endpoints_by_region.setdefault(region_id, {}).setdefault(
+                    service_id, []).append(endpoint_id)
+
+            if endpoint_id in policy_ids:
+                continue
+            # Look in the region of the endpoint and then up the region tree
+            # for a policy for the service, and finally for one for the
+            # service in any region.
+            for region_id in region_chain:
+                policy_id = by_service_and_region.get((service_id, region_id))
+                if policy_id is not None:
+                    policy_ids[endpoint_id] = policy_id
+                    break
+            else:
+                if service_id in by_service:
+                    policy_ids[endpoint_id] = by_service[service_id]
+
+        return {'policy_ids': policy_ids,
+                'endpoints_by_service': endpoints_by_service,
+                'endpoints_by_region': endpoints_by_region}
 
     def list_endpoints_for_policy(self, policy_id):
 
@@ -94,67 +205,9 @@ class Manager(manager.Manager):
                                   'endpoint_id': endpoint_id})
                 raise
 
-        def _get_endpoints_for_service(service_id, endpoints):
-            # TODO(henry-nash): Consider optimizing this in the future by
-            # adding an explicit list_endpoints_for_service to the catalog API.
-            return [ep for ep in endpoints if ep['service_id'] == service_id]
-
-        def _get_endpoints_for_service_and_region(
-                service_id, region_id, endpoints, regions):
-            # TODO(henry-nash): Consider optimizing this in the future.
-            # The lack of a two-way pointer in the region tree structure
-            # makes this somewhat inefficient.
-
-            def _recursively_get_endpoints_for_region(
-                region_id, service_id, endpoint_list, region_list,
-                    endpoints_found, regions_examined):
-                """Recursively search down a region tree for endpoints.
-
-                :param region_id: the point in the tree to examine
-                :param service_id: the service we are interested in
-                :param endpoint_list: list of all endpoints
-                :param region_list: list of all regions
-                :param endpoints_found: list of matching endpoints found so
-                                        far - which will be updated if more are
-                                        found in this iteration
-                :param regions_examined: list of regions we have already looked
-                                         at - used to spot illegal circular
-                                         references in the tree to avoid never
-                                         completing search
-                :returns: list of endpoints that match
-
-                """
-                if region_id in regions_examined:
-                    msg = ('Circular reference or a repeated entry found '
-                           'in region tree - %(region_id)s.')
-                    LOG.error(msg, {'region_id': ref.region_id})
-                    return
-
-                regions_examined.append(region_id)
-                endpoints_found += (
-                    [ep for ep in endpoint_list if
-                     ep['service_id'] == service_id and
-                     ep['region_id'] == region_id])
-
-                for region in region_list:
-                    if region['parent_region_id'] == region_id:
-                        _recursively_get_endpoints_for_region(
-                            region['id'], service_id, endpoints, regions,
-                            endpoints_found, regions_examined)
-
-            endpoints_found = []
-            regions_examined = []
-
-            # Now walk down the region tree
-            _recursively_get_endpoints_for_region(
-                region_id, service_id, endpoints, regions,
-                endpoints_found, regions_examined)
-
-            return endpoints_found
-
+        table = self._get_endpoint_policy_table()
+        endpoints = None
         matching_endpoints = []
-        endpoints = PROVIDERS.catalog_api.list_endpoints()
-        regions = PROVIDERS.catalog_api.list_regions()
         for ref in self.list_associations_for_policy(policy_id):
             if ref.get('endpoint_id') is not None:
                 matching_endpoints.append(
@@ -163,25 +216,29 @@ class Manager(manager.Manager):
 
             if (ref.get('service_id') is not None and
                     ref.get('region_id') is None):
-                matching_endpoints += _get_endpoints_for_service(
-                    ref['service_id'], endpoints)
-                continue
-
-            if (ref.get('service_id') is not None and
+                endpoint_ids = table['endpoints_by_service'].get(
+                    ref['service_id'], [])
+            elif (ref.get('service_id') is not None and
                     ref.get('region_id') is not None):
-                matching_endpoints += (
-                    _get_endpoints_for_service_and_region(
-                        ref['service_id'], ref['region_id'],
-                        endpoints, regions))
+                endpoint_ids = table['endpoints_by_region'].get(
+                    ref['region_id'], {}).get(ref['service_id'], [])
+            else:
+                msg = ('Unsupported policy association found - '
+                       'Policy %(policy_id)s, Endpoint %(endpoint_id)s, '
+                       'Service %(service_id)s, Region %(region_id)s, ')
+                LOG.warning(msg, {'policy_id': policy_id,
+                                  'endpoint_id': ref['endpoint_id'],
+                                  'service_id': ref['service_id'],
+                                  'region_id': ref['region_id']})
                 continue
 
-            msg = ('Unsupported policy association found - '
-                   'Policy %(policy_id)s, Endpoint %(endpoint_id)s, '
-                   'Service %(service_id)s, Region %(region_id)s, ')
-            LOG.warning(msg, {'policy_id': policy_id,
-                              'endpoint_id': ref['endpoint_id'],
-                              'service_id': ref['service_id'],
-                              'region_id': ref['region_id']})
+            if endpoint_ids and endpoints is None:
+                endpoints = dict(
+                    (endpoint['id'], endpoint)
+                    for endpoint in PROVIDERS.catalog_api.list_endpoints())
+            matching_endpoints += [endpoints[endpoint_id]
+                                   for endpoint_id in endpoint_ids
+                                   if endpoint_id in endpoints]
 
         return matching_endpoints
 
@@ -197,67 +254,14 @@ class Manager(manager.Manager):
                                   'endpoint_id': endpoint_id})
                 raise
 
-        def _look_for_policy_for_region_and_service(endpoint):
-            """Look in the region and its parents for a policy.
-
-            Examine the region of the endpoint for a policy appropriate for
-            the service of the endpoint. If there isn't a match, then chase up
-            the region tree to find one.
-
-            """
-            region_id = endpoint['region_id']
-            regions_examined = []
-            while region_id is not None:
-                try:
-                    ref = self.get_policy_association(
-                        service_id=endpoint['service_id'],
-                        region_id=region_id)
-                    return ref['policy_id']
-                except exception.PolicyAssociationNotFound:  # nosec
-                    # There wasn't one for that region & service, handle below.
-                    pass
-
-                # There wasn't one for that region & service, let's
-                # chase up the region tree
-                regions_examined.append(region_id)
-                region = PROVIDERS.catalog_api.get_region(region_id)
-                region_id = None
-                if region.get('parent_region_id') is not None:
-                    region_id = region['parent_region_id']
-                    if region_id in regions_examined:
-                        msg = ('Circular reference or a repeated entry '
-                               'found in region tree - %(region_id)s.')
-                        LOG.error(msg, {'region_id': region_id})
-                        break
-
-        # First let's see if there is a policy explicitly defined for
-        # this endpoint.
-
-        try:
-            ref = self.get_policy_association(endpoint_id=endpoint_id)
-            return _get_policy(ref['policy_id'], endpoint_id)
-        except exception.PolicyAssociationNotFound:  # nosec
-            # There wasn't a policy explicitly defined for this endpoint,
-            # handled below.
-            pass
-
-        # There wasn't a policy explicitly defined for this endpoint, so
-        # now let's see if there is one for the Region & Service.
-
-        endpoint = PROVIDERS.catalog_api.get_endpoint(endpoint_id)
-        policy_id = _look_for_policy_for_region_and_service(endpoint)
+        policy_id = self._get_endpoint_policy_table()['policy_ids'].get(
+            endpoint_id)
         if policy_id is not None:
             return _get_policy(policy_id, endpoint_id)
 
-        # Finally, just check if there is one for the service.
-        try:
-            ref = self.get_policy_association(
-                service_id=endpoint['service_id'])
-            return _get_policy(ref['policy_id'], endpoint_id)
-        except exception.PolicyAssociationNotFound:  # nosec
-            # No policy is associated with endpoint, handled below.
-            pass
-
+        # Make sure the endpoint exists before reporting that it has no
+        # policy.
+        PROVIDERS.catalog_api.get_endpoint(endpoint_id)
         msg = _('No policy is associated with endpoint '
                 '%(endpoint_id)s.') % {'endpoint_id': endpoint_id}
         raise exception.NotFound(msg)
@@ -27,7 +27,6 @@ from keystone.common import validation
 from keystone.common import wsgi
 import keystone.conf
 from keystone import exception
-from keystone.federation import idp as keystone_idp
 from keystone.federation import schema
 from keystone.federation import utils
 from keystone.i18n import _
@@ -176,6 +175,10 @@ class Auth(auth_controllers.Auth):
         project_domain_name = token.project_domain['name']
         subject_domain_name = token.user_domain['name']
 
+        # The SAML IdP pulls in pysaml2, which most deployments never use,
+        # so it is only imported when an assertion is generated.
+        from keystone.federation import idp as keystone_idp
+
         generator = keystone_idp.SAMLGenerator()
         response = generator.samlize_token(
             issuer, sp_url, subject, subject_domain_name,
@@ -215,6 +218,8 @@ class Auth(auth_controllers.Auth):
         (saml_assertion, service_provider) = t
         relay_state_prefix = service_provider['relay_state_prefix']
 
+        from keystone.federation import idp as keystone_idp
+
         generator = keystone_idp.ECPGenerator()
         ecp_assertion = generator.generate_ecp(saml_assertion,
                                                relay_state_prefix)
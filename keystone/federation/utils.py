@@ -340,10 +340,9 @@ def validate_mapped_group_ids(group_ids, mapping_id, identity_api):
         mapping was not found in the backend.
 
     """
+    groups = identity_api.get_groups_by_ids(group_ids)
     for group_id in group_ids:
-        try:
-            identity_api.get_group(group_id)
-        except exception.GroupNotFound:
+        if group_id not in groups:
             raise exception.MappedGroupNotFound(
                 group_id=group_id, mapping_id=mapping_id)
 
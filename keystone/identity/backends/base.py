@@ -415,6 +415,27 @@ class IdentityDriverBase(object):
         """
         raise exception.NotImplemented()  # pragma: no cover
 
+    def list_groups_from_ids(self, group_ids):
+        """List groups for the provided list of IDs.
+
+        :param list group_ids: group IDs.
+
+        :returns: a list of group_refs, IDs that do not exist are skipped. See
+                  group schema in :class:`~.IdentityDriverBase`.
+
+        This method is used internally by the identity manager to bulk read a
+        set of groups given their IDs.
+
+        """
+        groups = []
+        for group_id in group_ids:
+            try:
+                groups.append(self.get_group(group_id))
+            except exception.GroupNotFound:  # nosec
+                # Skip the groups that do not exist.
+                pass
+        return groups
+
     @abc.abstractmethod
     def get_group_by_name(self, group_name, domain_id):
         """Get a group by name.
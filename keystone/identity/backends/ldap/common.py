@@ -1640,13 +1640,6 @@ class BaseLdap(object):
             ldap_attr = self.attribute_mapping[filter_['name']]
             val_esc = ldap.filter.escape_filter_chars(filter_['value'])
 
-            if filter_['case_sensitive']:
-                # NOTE(henry-nash): Although dependent on the schema being
-                # used, most LDAP attributes are configured with case
-                # insensitive matching rules, so we'll leave this to the
-                # controller to filter.
-                return
-
             if filter_['name'] == 'enabled':
                 # NOTE(henry-nash): Due to the different options for storing
                 # the enabled attribute (e,g, emulated or not), for now we
@@ -1697,9 +1690,18 @@ class BaseLdap(object):
             if filter_['name'] not in self.attribute_mapping:
                 continue
             new_filter = build_filter(filter_)
-            if new_filter is not None:
-                filter_list.append(new_filter)
-                satisfied_filters.append(filter_)
+            if new_filter is None:
+                continue
+            filter_list.append(new_filter)
+            if filter_['case_sensitive']:
+                # NOTE(henry-nash): Although dependent on the schema being
+                # used, most LDAP attributes are configured with case
+                # insensitive matching rules, so we'll leave this to the
+                # controller to filter.
+                # The query term still narrows the results down to a superset
+                # of the matches.
+                continue
+            satisfied_filters.append(filter_)
 
         if filter_list:
             query = u'(&%s%s)' % (query, ''.join(filter_list))
@@ -108,18 +108,21 @@ class Identity(base.IdentityDriverBase):
         return False
 
     def _record_failed_auth(self, user_id):
+        # Increment the counter in the database so that concurrent failed
+        # attempts are all counted.
         with sql.session_for_write() as session:
-            user_ref = session.query(model.User).get(user_id)
-            if not user_ref.local_user.failed_auth_count:
-                user_ref.local_user.failed_auth_count = 0
-            user_ref.local_user.failed_auth_count += 1
-            user_ref.local_user.failed_auth_at = datetime.datetime.utcnow()
+            query = session.query(model.LocalUser).filter_by(user_id=user_id)
+            query.update(
+                {'failed_auth_count': sqlalchemy.func.coalesce(
+                    model.LocalUser.failed_auth_count, 0) + 1,
+                 'failed_auth_at': datetime.datetime.utcnow()},
+                synchronize_session=False)
 
     def _reset_failed_auth(self, user_id):
         with sql.session_for_write() as session:
-            user_ref = session.query(model.User).get(user_id)
-            user_ref.local_user.failed_auth_count = 0
-            user_ref.local_user.failed_auth_at = None
+            query = session.query(model.LocalUser).filter_by(user_id=user_id)
+            query.update({'failed_auth_count': 0, 'failed_auth_at': None},
+                         synchronize_session=False)
 
     # user crud
 
@@ -367,6 +370,14 @@ class Identity(base.IdentityDriverBase):
         with sql.session_for_read() as session:
             return self._get_group(session, group_id).to_dict()
 
+    def list_groups_from_ids(self, group_ids):
+        if not group_ids:
+            return []
+        with sql.session_for_read() as session:
+            query = session.query(model.Group)
+            query = query.filter(model.Group.id.in_(group_ids))
+            return [ref.to_dict() for ref in query.all()]
+
     def get_group_by_name(self, group_name, domain_id):
         with sql.session_for_read() as session:
             query = session.query(model.Group)
@@ -14,6 +14,7 @@
 
 """Main entry point into the Identity service."""
 
+import collections
 import copy
 import functools
 import itertools
@@ -24,7 +25,9 @@ import uuid
 
 from oslo_config import cfg
 from oslo_log import log
+from oslo_serialization import msgpackutils
 from pycadf import reason
+import six
 
 from keystone import assignment  # TODO(lbragstad): Decouple this dependency
 from keystone.common import cache
@@ -36,6 +39,7 @@ from keystone.common.validation import validators
 import keystone.conf
 from keystone import exception
 from keystone.i18n import _
+from keystone.identity.backends import resource_options as ro
 from keystone.identity.mapping_backends import mapping
 from keystone import notifications
 from oslo_utils import timeutils
@@ -48,6 +52,7 @@ LOG = log.getLogger(__name__)
 PROVIDERS = provider_api.ProviderAPIs
 
 MEMOIZE = cache.get_memoization_decorator(group='identity')
+MEMOIZE_MULTI = cache.get_multi_memoization_decorator(group='identity')
 
 ID_MAPPING_REGION = cache.create_region(name='id mapping')
 MEMOIZE_ID_MAPPING = cache.get_memoization_decorator(group='identity',
@@ -65,6 +70,147 @@ REGISTRATION_ATTEMPTS = 10
 SQL_DRIVER = 'SQL'
 
 
+class UserAuthOptions(object):
+    """The resource options of a user consulted on every authentication.
+
+    The options are compiled once per user and cached alongside the user
+    reference, instances are immutable so they can be shared safely.
+    """
+
+    __slots__ = ('mfa_rules', 'mfa_enabled',
+                 'ignore_lockout_failure_attempts',
+                 'ignore_change_password_upon_first_use',
+                 'ignore_password_expiry', 'lock_password')
+
+    def __init__(self, mfa_rules=(), mfa_enabled=True,
+                 ignore_lockout_failure_attempts=False,
+                 ignore_change_password_upon_first_use=False,
+                 ignore_password_expiry=False, lock_password=False):
+        set_attr = super(UserAuthOptions, self).__setattr__
+        set_attr('mfa_rules', tuple(frozenset(r) for r in mfa_rules))
+        set_attr('mfa_enabled', mfa_enabled)
+        set_attr('ignore_lockout_failure_attempts',
+                 ignore_lockout_failure_attempts)
+        set_attr('ignore_change_password_upon_first_use',
+                 ignore_change_password_upon_first_use)
+        set_attr('ignore_password_expiry', ignore_password_expiry)
+        set_attr('lock_password', lock_password)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s is immutable' % type(self).__name__)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if not isinstance(other, UserAuthOptions):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.to_dict())
+
+    def __reduce__(self):
+        return (type(self),
+                tuple(getattr(self, name) for name in self.__slots__))
+
+
+class _UserAuthOptionsHandler(object):
+    identity = 125
+    handles = (UserAuthOptions,)
+
+    def __init__(self, registry):
+        self._registry = registry
+
+    def serialize(self, obj):
+        return msgpackutils.dumps(obj.to_dict(), registry=self._registry)
+
+    def deserialize(self, data):
+        return UserAuthOptions(
+            **msgpackutils.loads(data, registry=self._registry))
+
+
+cache.register_model_handler(_UserAuthOptionsHandler)
+
+
+def compile_mfa_rules(rules, user_id):
+    """Validate and compile the MFA rule data structure.
+
+    Rule sets must be in the form of list of lists. The lists may not
+    have duplicates and must not be empty. The top-level list may be empty
+    indicating that no rules exist.
+
+    :param rules: The list of rules from the user_ref
+    :type rules: list
+    :param user_id: the user_id, used for logging purposes
+    :type user_id: str
+    :returns: tuple of frozensets, duplicates are stripped
+    """
+    # NOTE(notmorgan): Most of this is done at the API request validation
+    # and in the storage layer, it makes sense to also validate here and
+    # ensure the data returned from the DB is sane, This will not raise
+    # any exceptions, but just produce a usable set of data for rules
+    # processing.
+    if not isinstance(rules, list):
+        LOG.error('Corrupt rule data structure for user %(user_id)s, '
+                  'no rules loaded.',
+                  {'user_id': user_id})
+        # Corrupt Data means no rules. Auth success > MFA rules in this
+        # case.
+        return ()
+
+    rule_set = []
+    for r_list in rules:
+        if not isinstance(r_list, list):
+            # Rule was not a list, it is invalid, drop the rule from
+            # being considered.
+            LOG.info('Ignoring Rule %(type)r; rule must be a list of '
+                     'strings.',
+                     {'type': type(r_list)})
+            continue
+
+        if not r_list:
+            # No empty rules are allowed.
+            continue
+
+        if not all(isinstance(item, six.string_types) for item in r_list):
+            # Rules may only contain strings for method names, reject a
+            # rule with non-string values.
+            LOG.info('Ignoring Rule %(rule)r; rule contains '
+                     'non-string values.',
+                     {'rule': r_list})
+            continue
+
+        # The de-dupe should never be needed, but we are being extra
+        # careful at all levels of validation for the MFA rules.
+        rule_set.append(frozenset(r_list))
+
+    return tuple(rule_set)
+
+
+def compile_user_auth_options(user_ref):
+    """Compile the authentication related options of a user reference.
+
+    :param user_ref: a user reference as returned by ``get_user``
+    :returns: an immutable :class:`UserAuthOptions`
+    """
+    options = user_ref.get('options', {})
+    return UserAuthOptions(
+        mfa_rules=compile_mfa_rules(
+            options.get(ro.MFA_RULES_OPT.option_name, []), user_ref['id']),
+        mfa_enabled=options.get(ro.MFA_ENABLED_OPT.option_name, True),
+        ignore_lockout_failure_attempts=options.get(
+            ro.IGNORE_LOCKOUT_ATTEMPT_OPT.option_name, False),
+        ignore_change_password_upon_first_use=options.get(
+            ro.IGNORE_CHANGE_PASSWORD_OPT.option_name, False),
+        ignore_password_expiry=options.get(
+            ro.IGNORE_PASSWORD_EXPIRY_OPT.option_name, False),
+        lock_password=options.get(ro.LOCK_PASSWORD_OPT.option_name, False))
+
+
 class DomainConfigs(provider_api.ProviderAPIMixin, dict):
     """Discover, store and provide access to domain specific configs.
 
@@ -495,6 +641,14 @@ class Manager(manager.Manager):
             },
         }
 
+    @domains_configured
+    def load_domain_drivers(self):
+        """Load the domain specific drivers, if they are enabled.
+
+        Otherwise they are loaded by the first identity call.
+        """
+        pass
+
     def _domain_deleted(self, service, resource_type, operation,
                         payload):
         domain_id = payload['resource_info']
@@ -968,6 +1122,18 @@ class Manager(manager.Manager):
         return self._set_domain_id_and_mapping(
             ref, domain_id, driver, mapping.EntityType.USER)
 
+    @MEMOIZE
+    def get_user_auth_options(self, user_id):
+        """Return the compiled authentication options of a user.
+
+        The result is cached and invalidated together with ``get_user``, so
+        the resource options are only parsed once per user rather than on
+        every authentication.
+
+        :returns: :class:`UserAuthOptions`
+        """
+        return compile_user_auth_options(self.get_user(user_id))
+
     def assert_user_enabled(self, user_id, user=None):
         """Assert the user and the user's domain are enabled.
 
@@ -1104,6 +1270,7 @@ class Manager(manager.Manager):
             self._get_domain_driver_and_entity_id(user_id))
         user = self._clear_domain_id_if_domain_unaware(driver, user)
         self.get_user.invalidate(self, old_user_ref['id'])
+        self.get_user_auth_options.invalidate(self, old_user_ref['id'])
         self.get_user_by_name.invalidate(self, old_user_ref['name'],
                                          old_user_ref['domain_id'])
 
@@ -1141,6 +1308,7 @@ class Manager(manager.Manager):
         driver.delete_user(entity_id)
         PROVIDERS.assignment_api.delete_user_assignments(user_id)
         self.get_user.invalidate(self, user_id)
+        self.get_user_auth_options.invalidate(self, user_id)
         self.get_user_by_name.invalidate(self, user_old['name'],
                                          user_old['domain_id'])
         for fed_user in fed_users:
@@ -1191,6 +1359,33 @@ class Manager(manager.Manager):
         return self._set_domain_id_and_mapping(
             ref, domain_id, driver, mapping.EntityType.GROUP)
 
+    @domains_configured
+    @MEMOIZE_MULTI(get_group)
+    def get_groups_by_ids(self, group_ids):
+        """Get the groups with the given ids.
+
+        :param group_ids: list of group ids
+        :returns: a dict of the group refs found, keyed by group id.
+
+        """
+        # Read the groups of each driver at once.
+        entity_ids = collections.OrderedDict()
+        for group_id in group_ids:
+            try:
+                domain_id, driver, entity_id = (
+                    self._get_domain_driver_and_entity_id(group_id))
+            except exception.PublicIDNotFound:
+                continue
+            entity_ids.setdefault((domain_id, driver), []).append(entity_id)
+
+        groups = {}
+        for (domain_id, driver), ids in entity_ids.items():
+            for ref in driver.list_groups_from_ids(ids):
+                ref = self._set_domain_id_and_mapping(
+                    ref, domain_id, driver, mapping.EntityType.GROUP)
+                groups[ref['id']] = ref
+        return groups
+
     @domains_configured
     @exception_translated('group')
     def get_group_by_name(self, group_name, domain_id):
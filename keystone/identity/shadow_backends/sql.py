@@ -26,8 +26,18 @@ from keystone.identity.shadow_backends import base
 
 CONF = cfg.CONF
 
+# Maximum number of users remembered as active today, see
+# ShadowUsers.set_last_active_at.
+ACTIVE_USERS_CACHE_SIZE = 10000
+
 
 class ShadowUsers(base.ShadowUsersDriverBase):
+    def __init__(self):
+        super(ShadowUsers, self).__init__()
+        # The date and the IDs of the users this process recorded as active
+        # on that date.
+        self._active_users = (None, set())
+
     @sql.handle_conflicts(conflict_type='federated_user')
     def create_federated_user(self, domain_id, federated_dict, email=None):
         user = {
@@ -120,10 +130,29 @@ class ShadowUsers(base.ShadowUsersDriverBase):
             return user_ref
 
     def set_last_active_at(self, user_id):
-        if CONF.security_compliance.disable_user_account_days_inactive:
-            with sql.session_for_write() as session:
-                user_ref = session.query(model.User).get(user_id)
-                user_ref.last_active_at = datetime.datetime.utcnow().date()
+        if not CONF.security_compliance.disable_user_account_days_inactive:
+            return
+
+        # last_active_at only has day granularity, once a user has been
+        # recorded as active today there is nothing left to write until
+        # tomorrow.
+        today = datetime.datetime.utcnow().date()
+        active_date, active_users = self._active_users
+        if active_date != today:
+            active_users = set()
+            self._active_users = (today, active_users)
+        elif user_id in active_users:
+            return
+
+        with sql.session_for_write() as session:
+            query = session.query(model.User).filter_by(id=user_id).filter(
+                sqlalchemy.or_(model.User.last_active_at.is_(None),
+                               model.User.last_active_at < today))
+            query.update({'last_active_at': today}, synchronize_session=False)
+
+        if len(active_users) >= ACTIVE_USERS_CACHE_SIZE:
+            active_users.clear()
+        active_users.add(user_id)
 
     @sql.handle_conflicts(conflict_type='federated_user')
     def update_federated_user_display_name(self, idp_id, protocol_id,
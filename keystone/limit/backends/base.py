@@ -142,6 +142,37 @@ class UnifiedLimitDriverBase(object):
         """
         raise exception.NotImplemented()  # pragma: no cover
 
+    def list_limits_from_project_ids(self, project_ids, hints):
+        """List the limits of the provided projects.
+
+        :param project_ids: list of project ids
+        :param hints: contains the list of filters yet to be satisfied.
+                      Any filters satisfied here will be removed so that
+                      the caller will know if any filters remain.
+
+        :returns: a list of dictionaries or an empty list.
+
+        """
+        project_ids = set(project_ids)
+        return [limit for limit in self.list_limits(hints)
+                if limit['project_id'] in project_ids]
+
+    def list_effective_limits(self, project_id, hints):
+        """List the limits that apply to a project.
+
+        Every registered limit is returned, resolved to the project's limit
+        if one exists and to the registered default limit otherwise.
+
+        :param project_id: the project to resolve the limits of.
+        :param hints: contains the list of filters yet to be satisfied.
+                      Any filters satisfied here will be removed so that
+                      the caller will know if any filters remain.
+
+        :returns: a list of dictionaries or an empty list.
+
+        """
+        raise exception.NotImplemented()  # pragma: no cover
+
     @abc.abstractmethod
     def get_limit(self, limit_id):
         """Get a limit.
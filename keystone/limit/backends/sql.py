@@ -47,6 +47,10 @@ class RegisteredLimitModel(sql.ModelBase, sql.ModelDictMixin):
     resource_name = sql.Column(sql.String(255))
     default_limit = sql.Column(sql.Integer, nullable=False)
     description = sql.Column(sql.Text())
+    __table_args__ = (
+        sql.Index('ix_registered_limit_service_id_region_id_resource_name',
+                  'service_id', 'region_id', 'resource_name'),
+    )
 
     def to_dict(self):
         ref = super(RegisteredLimitModel, self).to_dict()
@@ -82,6 +86,10 @@ class LimitModel(sql.ModelBase, sql.ModelDictMixin):
                                      sql.ForeignKey('registered_limit.id'))
 
     registered_limit = sqlalchemy.orm.relationship('RegisteredLimitModel')
+    __table_args__ = (
+        sql.Index('ix_limit_project_id_registered_limit_id',
+                  'project_id', 'registered_limit_id'),
+    )
 
     @hybrid_property
     def service_id(self):
@@ -304,32 +312,87 @@ class UnifiedLimit(base.UnifiedLimitDriverBase):
             ref.description = new_limit.description
             return ref.to_dict()
 
+    def _resolved_limit_column(self, name):
+        # Limits created before the registered_limit_id column existed store
+        # service_id, region_id and resource_name themselves, newer ones get
+        # them from the registered limit. This mirrors the hybrid properties
+        # of LimitModel so both formats can be filtered in one query.
+        return sqlalchemy.case(
+            [(LimitModel.registered_limit_id.isnot(None),
+              getattr(RegisteredLimitModel, name))],
+            else_=getattr(LimitModel, '_' + name))
+
     @driver_hints.truncated
     def list_limits(self, hints):
-        hint_copy = copy.deepcopy(hints)
-        new_format_data = []
+        return self._list_limits(hints)
+
+    def list_limits_from_project_ids(self, project_ids, hints):
+        if not project_ids:
+            return []
+        return self._list_limits(hints, project_ids=project_ids)
+
+    def _list_limits(self, hints, project_ids=None):
         with sql.session_for_read() as session:
-            query = session.query(LimitModel)
-            limits = sql.filter_limit_query(LimitModel,
-                                            query,
-                                            hints)
-            old_format_data = [s.to_dict() for s in limits]
-            project_filter = hint_copy.get_exact_filter_by_name('project_id')
-            if hint_copy.filters and (not project_filter
-                                      or len(hint_copy.filters) > 1):
-                # If the hints contain "service_id", "region_id" or
-                # "resource_name", we should combine the registered_limit table
-                # first to fetch these information.
-                query_new = session.query(
-                    LimitModel).outerjoin(RegisteredLimitModel)
-                limits = sql.filter_limit_query(RegisteredLimitModel,
-                                                query_new,
-                                                hint_copy)
-                if project_filter:
-                    limits = limits.filter(
-                        LimitModel.project_id == project_filter['value'])
-                new_format_data = [s.to_dict() for s in limits]
-            return old_format_data + new_format_data
+            query = session.query(LimitModel).outerjoin(
+                RegisteredLimitModel).options(
+                    sqlalchemy.orm.contains_eager(LimitModel.registered_limit))
+            satisfied_filters = []
+            for filter_ in hints.filters:
+                if (filter_['comparator'] == 'equals' and
+                        filter_['name'] in ('service_id', 'region_id',
+                                            'resource_name')):
+                    column = self._resolved_limit_column(filter_['name'])
+                    query = query.filter(column == filter_['value'])
+                    satisfied_filters.append(filter_)
+            for filter_ in satisfied_filters:
+                hints.filters.remove(filter_)
+            if project_ids is not None:
+                query = query.filter(LimitModel.project_id.in_(project_ids))
+            limits = sql.filter_limit_query(LimitModel, query, hints)
+            return [s.to_dict() for s in limits]
+
+    def list_effective_limits(self, project_id, hints):
+        with sql.session_for_read() as session:
+            # Every limit references a registered limit, either through
+            # registered_limit_id or, for limits created before that column
+            # existed, through matching service_id, region_id and
+            # resource_name. Outer join them so that resources without a
+            # project limit fall back to the registered default.
+            region_match = sqlalchemy.or_(
+                LimitModel._region_id == RegisteredLimitModel.region_id,
+                sqlalchemy.and_(LimitModel._region_id.is_(None),
+                                RegisteredLimitModel.region_id.is_(None)))
+            old_format_match = sqlalchemy.and_(
+                LimitModel.registered_limit_id.is_(None),
+                LimitModel._service_id == RegisteredLimitModel.service_id,
+                LimitModel._resource_name ==
+                RegisteredLimitModel.resource_name,
+                region_match)
+            query = session.query(
+                RegisteredLimitModel, LimitModel.id,
+                LimitModel.resource_limit).outerjoin(
+                    LimitModel, sqlalchemy.and_(
+                        LimitModel.project_id == project_id,
+                        sqlalchemy.or_(
+                            LimitModel.registered_limit_id ==
+                            RegisteredLimitModel.id,
+                            old_format_match)))
+            query = sql.filter_limit_query(RegisteredLimitModel, query, hints)
+
+            effective_limits = []
+            for registered_limit, limit_id, resource_limit in query:
+                if limit_id is None:
+                    resource_limit = registered_limit.default_limit
+                effective_limits.append({
+                    'project_id': project_id,
+                    'service_id': registered_limit.service_id,
+                    'region_id': registered_limit.region_id,
+                    'resource_name': registered_limit.resource_name,
+                    'resource_limit': resource_limit,
+                    'limit_id': limit_id,
+                    'registered_limit_id': registered_limit.id,
+                })
+            return effective_limits
 
     def _get_limit(self, session, limit_id):
         query = session.query(LimitModel).filter_by(id=limit_id)
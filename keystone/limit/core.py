@@ -121,6 +121,15 @@ class Manager(manager.Manager):
     def list_limits(self, hints=None):
         return self.driver.list_limits(hints or driver_hints.Hints())
 
+    @manager.response_truncated
+    def list_effective_limits(self, project_id, hints=None):
+        """List the limits that apply to a project.
+
+        Resources without a project limit resolve to the registered default.
+        """
+        return self.driver.list_effective_limits(
+            project_id, hints or driver_hints.Hints())
+
     @MEMOIZE
     def get_limit(self, limit_id):
         return self.driver.get_limit(limit_id)
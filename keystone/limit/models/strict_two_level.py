@@ -30,112 +30,137 @@ class StrictTwoLevelModel(base.ModelBase):
     )
     MAX_PROJECT_TREE_DEPTH = 2
 
-    def _get_specified_limit_value(self, project_id, resource_name, service_id,
-                                   region_id, is_parent=True):
-        """Get the specified limit value.
+    @staticmethod
+    def _limit_key(limit):
+        return (limit['service_id'], limit.get('region_id'),
+                limit['resource_name'])
 
-        Try to give the resource limit first. If the specified limit is a
-        parent in a project tree and the resource limit value is None, get the
-        related registered limit value instead.
+    def _load_hierarchy(self, project_ids):
+        """Map the given projects and their children to their parent.
+
+        Top level projects, whose parent is a domain, map to None. This
+        issues one query for the projects and one for their children.
+
+        """
+        parent_ids = {}
+        projects = PROVIDERS.resource_api.list_projects_from_ids(
+            list(project_ids))
+        for project in projects:
+            parent_id = project['parent_id']
+            if parent_id == project['domain_id']:
+                parent_id = None
+            parent_ids[project['id']] = parent_id
+        children = PROVIDERS.resource_api.list_projects_from_parent_ids(
+            list(project_ids))
+        for project in children:
+            parent_ids[project['id']] = project['parent_id']
+        return parent_ids
+
+    def _load_limits(self, keys, project_ids):
+        """Load the registered limits and the limits of the given projects.
+
+        This issues one registered limit and one limit query per distinct
+        (service_id, region_id, resource_name) tuple, no matter how many
+        projects are involved.
+
+        :returns: a tuple of two dictionaries. The first maps resource keys to
+                  their registered default limit, the second maps
+                  (project_id,) + resource key to the project's limit.
 
         """
-        hints = driver_hints.Hints()
-        hints.add_filter('project_id', project_id)
-        hints.add_filter('service_id', service_id)
-        hints.add_filter('resource_name', resource_name)
-        hints.add_filter('region_id', region_id)
-        limits = PROVIDERS.unified_limit_api.list_limits(hints)
-        limit_value = limits[0]['resource_limit'] if limits else None
-        if not limits and is_parent:
+        default_limits = {}
+        project_limits = {}
+        for key in keys:
+            service_id, region_id, resource_name = key
             hints = driver_hints.Hints()
             hints.add_filter('service_id', service_id)
             hints.add_filter('resource_name', resource_name)
             hints.add_filter('region_id', region_id)
-            limits = PROVIDERS.unified_limit_api.list_registered_limits(hints)
-            limit_value = limits[0]['default_limit'] if limits else None
-        return limit_value
+            registered_limits = (
+                PROVIDERS.unified_limit_api.list_registered_limits(hints))
+            if registered_limits:
+                default_limits[key] = registered_limits[0]['default_limit']
 
-    def _check_limit(self, project_id, resource_name, resource_limit,
-                     service_id, region_id, parent_id):
-        """Check the specified limit value satisfies the related project tree.
-
-        1. Ensure the limit is smaller than its parent.
-        2. Ensure the limit is bigger than its children.
-
-        """
-        if parent_id:
-            parent_limit_value = self._get_specified_limit_value(
-                parent_id, resource_name, service_id, region_id)
-            if parent_limit_value and resource_limit > parent_limit_value:
-                raise exception.InvalidLimit(
-                    reason="Limit is bigger than parent.")
-
-        sub_projects = PROVIDERS.resource_api.list_projects_in_subtree(
-            project_id)
-        for sub_project in sub_projects:
-            sub_limit_value = self._get_specified_limit_value(
-                sub_project['id'], resource_name, service_id, region_id,
-                is_parent=False)
-            if sub_limit_value and resource_limit < sub_limit_value:
-                raise exception.InvalidLimit(
-                    reason="Limit is smaller than child.")
+            hints = driver_hints.Hints()
+            hints.add_filter('service_id', service_id)
+            hints.add_filter('resource_name', resource_name)
+            hints.add_filter('region_id', region_id)
+            limits = PROVIDERS.unified_limit_api.list_limits_from_project_ids(
+                list(project_ids), hints)
+            for limit in limits:
+                project_limits[(limit['project_id'],) + key] = (
+                    limit['resource_limit'])
+        return default_limits, project_limits
+
+    def _raise_invalid_limit(self, limit):
+        values = {
+            'project_id': limit['project_id'],
+            'resource_name': limit['resource_name'],
+            'resource_limit': limit['resource_limit'],
+            'service_id': limit['service_id'],
+            'region_id': limit.get('region_id')
+        }
+        error = ("The resource limit (project_id: %(project_id)s, "
+                 "resource_name: %(resource_name)s, "
+                 "resource_limit: %(resource_limit)s, "
+                 "service_id: %(service_id)s, "
+                 "region_id: %(region_id)s) doesn't satisfy "
+                 "current hierarchy model.") % values
+        tr_error = _("The resource limit (project_id: %(project_id)s, "
+                     "resource_name: %(resource_name)s, "
+                     "resource_limit: %(resource_limit)s, "
+                     "service_id: %(service_id)s, "
+                     "region_id: %(region_id)s) doesn't satisfy "
+                     "current hierarchy model.") % values
+        LOG.error(error)
+        raise exception.InvalidLimit(reason=tr_error)
 
     def check_limit(self, limits):
         """Check the input limits satisfy the related project tree or not.
 
-        1. Ensure the input is legal.
-        2. Ensure the input will not break the exist limit tree.
+        1. Ensure the limit is smaller than its parent, or the registered
+           default limit if the parent has no limit.
+        2. Ensure the limit is bigger than its children.
+
+        The existing limits of the affected resources in the projects of the
+        batch, their parents and their children are loaded in bulk and merged
+        with the input, so the whole batch is validated in memory.
 
         """
+        # Only the projects of the batch, their parents and their children
+        # take part in the validation.
+        parent_ids = self._load_hierarchy(
+            set(limit['project_id'] for limit in limits))
+        project_ids = set(parent_ids)
+        project_ids.update(p for p in parent_ids.values() if p)
+
+        default_limits, project_limits = self._load_limits(
+            set(self._limit_key(limit) for limit in limits), project_ids)
+        # The input limits override the stored ones, so that new and updated
+        # limits are validated against each other as well as the backend.
         for limit in limits:
-            project_id = limit['project_id']
-            resource_name = limit['resource_name']
+            key = (limit['project_id'],) + self._limit_key(limit)
+            project_limits[key] = limit['resource_limit']
+
+        child_limits = {}
+        for key, resource_limit in project_limits.items():
+            parent_id = parent_ids.get(key[0])
+            if parent_id:
+                child_limits.setdefault(
+                    (parent_id,) + key[1:], []).append(resource_limit)
+
+        for limit in limits:
+            key = self._limit_key(limit)
             resource_limit = limit['resource_limit']
-            service_id = limit['service_id']
-            region_id = limit.get('region_id')
-            try:
-                parent_project = PROVIDERS.resource_api.list_project_parents(
-                    project_id)[0]
-                if not parent_project['is_domain']:
-                    parent_id = parent_project['id']
-                    parent_limit = list(filter(
-                        lambda x: x['project_id'] == parent_id, limits))
-                    if parent_limit:
-                        if resource_limit > parent_limit[0]['resource_limit']:
-                            raise exception.InvalidLimit(
-                                reason="The input hierarchy tree is invalid.")
-                        # The limit's parent is in request body, no need to
-                        # check the backend any more.
-                        continue
-                else:
-                    parent_id = None
-
-                self._check_limit(project_id, resource_name, resource_limit,
-                                  service_id, region_id, parent_id)
-            except exception.InvalidLimit:
-                error = ("The resource limit (project_id: %(project_id)s, "
-                         "resource_name: %(resource_name)s, "
-                         "resource_limit: %(resource_limit)s, "
-                         "service_id: %(service_id)s, "
-                         "region_id: %(region_id)s) doesn't satisfy "
-                         "current hierarchy model.") % {
-                    'project_id': project_id,
-                    'resource_name': resource_name,
-                    'resource_limit': resource_limit,
-                    'service_id': service_id,
-                    'region_id': region_id
-                }
-                tr_error = _("The resource limit (project_id: %(project_id)s, "
-                             "resource_name: %(resource_name)s, "
-                             "resource_limit: %(resource_limit)s, "
-                             "service_id: %(service_id)s, "
-                             "region_id: %(region_id)s) doesn't satisfy "
-                             "current hierarchy model.") % {
-                    'project_id': project_id,
-                    'resource_name': resource_name,
-                    'resource_limit': resource_limit,
-                    'service_id': service_id,
-                    'region_id': region_id
-                }
-                LOG.error(error)
-                raise exception.InvalidLimit(reason=tr_error)
+
+            parent_id = parent_ids.get(limit['project_id'])
+            if parent_id:
+                parent_limit = project_limits.get(
+                    (parent_id,) + key, default_limits.get(key))
+                if parent_limit is not None and resource_limit > parent_limit:
+                    self._raise_invalid_limit(limit)
+
+            for child_limit in child_limits.get(
+                    (limit['project_id'],) + key, []):
+                if resource_limit < child_limit:
+                    self._raise_invalid_limit(limit)
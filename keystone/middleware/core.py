@@ -12,15 +12,25 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import time
+
 from oslo_log import log
 from oslo_serialization import jsonutils
+import webob.dec
 
+from keystone.common import context
+from keystone.common import request as request_mod
+from keystone.common import sql
 from keystone.common import wsgi
+import keystone.conf
 from keystone import exception
 
 
+CONF = keystone.conf.CONF
 LOG = log.getLogger(__name__)
 
+SQL_STATS_HEADER = 'X-Keystone-SQL-Stats'
+
 
 class JsonBodyMiddleware(wsgi.Middleware):
     """Middleware to allow method arguments to be passed as serialized JSON.
@@ -85,3 +95,35 @@ class NormalizingFilter(wsgi.Middleware):
         # Rewrites path to root if no path is given.
         elif not request.environ['PATH_INFO']:
             request.environ['PATH_INFO'] = '/'
+
+
+class SqlStatsMiddleware(wsgi.Middleware):
+    """Middleware counting the SQL statements issued for each request.
+
+    The statistics are available to the rest of the pipeline in the request
+    environment and on the request context. Slow requests are logged and, if
+    `[DEFAULT] sql_stats_header` is enabled, the statistics are returned in a
+    response header.
+
+    """
+
+    @webob.dec.wsgify(RequestClass=request_mod.Request)
+    def __call__(self, request):
+        started = time.time()
+        with sql.statement_stats() as stats:
+            request.environ[context.SQL_STATS_ENV] = stats
+            response = request.get_response(self.application)
+        elapsed = time.time() - started
+
+        slow_request_time = CONF.sql_slow_request_time
+        if slow_request_time and elapsed >= slow_request_time:
+            LOG.warning('%(method)s %(path)s took %(elapsed).3f seconds, '
+                        '%(time).3f of them in %(statements)d SQL statements '
+                        'returning %(rows)d rows.',
+                        {'method': request.method, 'path': request.path,
+                         'elapsed': elapsed, 'time': stats.time,
+                         'statements': stats.statements, 'rows': stats.rows})
+
+        if CONF.sql_stats_header:
+            response.headers[SQL_STATS_HEADER] = stats.to_header()
+        return response
@@ -39,9 +39,36 @@ class TokenModel(object):
     about a user's authentication or authorization.
     """
 
+    __slots__ = (
+        'id', 'user_id', '__user', 'user_domain_id', '__user_domain',
+        'methods', 'audit_id', 'parent_audit_id', '__expires_at',
+        '__issued_at', 'system', 'domain_id', '__domain', 'project_id',
+        '__project', '__project_domain', 'trust_id', '__trust', '__trustor',
+        '__trustee', '__trust_project', '__trust_project_domain',
+        'is_federated', 'identity_provider_id', 'protocol_id',
+        'federated_groups', 'access_token_id', '__access_token',
+        'application_credential_id', '__application_credential',
+    )
+
+    # Bump the version whenever the attributes below change, entries cached
+    # with another version are refused instead of being misread.
+    _CACHE_VERSION = 1
+
+    # Only the attributes describing the token itself are cached. The users,
+    # projects, domains, trusts and credentials it refers to are looked up
+    # again through their own managers, and caches, when the token is used.
+    _CACHED_ATTRIBUTES = (
+        'id', 'user_id', 'user_domain_id', 'methods', 'audit_id',
+        'parent_audit_id', 'expires_at', 'issued_at', 'system', 'domain_id',
+        'project_id', 'trust_id', 'is_federated', 'identity_provider_id',
+        'protocol_id', 'federated_groups', 'access_token_id',
+        'application_credential_id',
+    )
+
     def __init__(self):
         self.user_id = None
         self.__user = None
+        self.user_domain_id = None
         self.__user_domain = None
 
         self.methods = None
@@ -88,6 +115,22 @@ class TokenModel(object):
                        'audit_ids': self.audit_ids,
                        'loc': hex(id(self))}
 
+    def __getstate__(self):
+        """Return the compact representation of the token for caching."""
+        return [self._CACHE_VERSION,
+                [getattr(self, name, None)
+                 for name in self._CACHED_ATTRIBUTES]]
+
+    def __setstate__(self, state):
+        version, values = state
+        if version != self._CACHE_VERSION:
+            raise ValueError('Unsupported TokenModel cache version %s'
+                             % version)
+        self.__init__()
+        for name, value in zip(self._CACHED_ATTRIBUTES, values):
+            if value is not None:
+                setattr(self, name, value)
+
     @property
     def audit_ids(self):
         if self.parent_audit_id:
@@ -167,6 +210,20 @@ class TokenModel(object):
     def project_scoped(self):
         return self.project_id is not None
 
+    def set_scope_refs(self, project=None, domain=None):
+        """Set the scope references already looked up by the caller.
+
+        :param project: the project reference the token is scoped to
+        :param domain: the domain reference the token is scoped to, or the
+                       domain of ``project`` for project scoped tokens
+        """
+        if project is not None and project['id'] == self.project_id:
+            self.__project = project
+            if domain is not None and domain['id'] == project['domain_id']:
+                self.__project_domain = domain
+        elif domain is not None and domain['id'] == self.domain_id:
+            self.__domain = domain
+
     @property
     def project_domain(self):
         if not self.__project_domain:
@@ -271,7 +328,6 @@ class TokenModel(object):
         return roles
 
     def _get_trust_roles(self):
-        roles = []
         # If redelegated_trust_id is set, then we must traverse the trust_chain
         # in order to determine who the original trustor is. We need to do this
         # because the user ID of the original trustor helps us determine scope
@@ -284,37 +340,18 @@ class TokenModel(object):
         else:
             original_trustor_id = self.trustor['id']
 
-        trust_roles = [
-            {'role_id': role['id']} for role in self.trust['roles']
-        ]
-        effective_trust_roles = (
-            PROVIDERS.assignment_api.add_implied_roles(trust_roles)
-        )
-        effective_trust_role_ids = (
-            set([r['role_id'] for r in effective_trust_roles])
-        )
-
-        trustor_assignments = (
-            PROVIDERS.assignment_api.list_role_assignments(
-                user_id=original_trustor_id,
-                project_id=self.trust.get('project_id'),
-                effective=True, strip_domain_roles=False
-            )
-        )
-        current_effective_trustor_roles = (
-            set([x['role_id'] for x in trustor_assignments])
+        role_ids = PROVIDERS.assignment_api.list_delegated_role_ids(
+            original_trustor_id, self.trust.get('project_id'),
+            sorted(role['id'] for role in self.trust['roles'])
         )
+        return self._get_roles_by_ids(role_ids)
 
-        for trust_role_id in effective_trust_role_ids:
-            if trust_role_id in current_effective_trustor_roles:
-                role = PROVIDERS.role_api.get_role(trust_role_id)
-                if role['domain_id'] is None:
-                    roles.append(role)
-            else:
-                raise exception.Forbidden(
-                    _('Trustee has no delegated roles.'))
-
-        return roles
+    def _get_roles_by_ids(self, role_ids):
+        roles = PROVIDERS.role_api.get_roles_by_ids(role_ids)
+        for role_id in role_ids:
+            if role_id not in roles:
+                raise exception.RoleNotFound(role_id=role_id)
+        return [roles[role_id] for role_id in role_ids]
 
     def _get_federated_roles(self):
         roles = []
@@ -363,9 +400,11 @@ class TokenModel(object):
         # logic since they are both considered unique. By using `in` we're
         # performing a containment check, which also does a deep comparison
         # of the objects, which is what we want.
+        refs = iter(self._get_roles_by_ids(
+            [role for role in federated_roles if not isinstance(role, dict)]))
         for role in federated_roles:
             if not isinstance(role, dict):
-                role = PROVIDERS.role_api.get_role(role)
+                role = next(refs)
             if role not in roles:
                 roles.append(role)
 
@@ -378,8 +417,7 @@ class TokenModel(object):
                 self.user_id, self.domain_id
             )
         )
-        for role_id in domain_roles:
-            role = PROVIDERS.role_api.get_role(role_id)
+        for role in self._get_roles_by_ids(domain_roles):
             roles.append({'id': role['id'], 'name': role['name']})
 
         return roles
@@ -391,8 +429,7 @@ class TokenModel(object):
                 self.user_id, self.project_id
             )
         )
-        for role_id in project_roles:
-            r = PROVIDERS.role_api.get_role(role_id)
+        for r in self._get_roles_by_ids(project_roles):
             roles.append({'id': r['id'], 'name': r['name']})
 
         return roles
@@ -509,34 +546,14 @@ class TokenModel(object):
             raise exception.Unauthorized(tr_msg)
 
     def _validate_trust_scope(self):
-        trust_roles = []
         if self.trust_id:
-            refs = [{'role_id': role['id']} for role in self.trust['roles']]
-            effective_trust_roles = PROVIDERS.assignment_api.add_implied_roles(
-                refs
+            # Make sure the trustor still has each of the effective trust
+            # roles, if any have been removed, then we will treat the trust
+            # as invalid
+            PROVIDERS.assignment_api.list_delegated_role_ids(
+                self.trustor['id'], self.project_id,
+                sorted(role['id'] for role in self.trust['roles'])
             )
-            effective_trust_role_ids = (
-                set([r['role_id'] for r in effective_trust_roles])
-            )
-            assignments = PROVIDERS.assignment_api.list_role_assignments(
-                user_id=self.trustor['id'], system=self.system,
-                project_id=self.project_id, effective=True,
-                strip_domain_roles=False
-            )
-            current_effective_trustor_roles = (
-                set([x['role_id'] for x in assignments])
-            )
-            # Go through each of the effective trust roles, making sure the
-            # trustor still has them, if any have been removed, then we
-            # will treat the trust as invalid
-            for trust_role_id in effective_trust_role_ids:
-                if trust_role_id in current_effective_trustor_roles:
-                    role = PROVIDERS.role_api.get_role(trust_role_id)
-                    if role['domain_id'] is None:
-                        trust_roles.append(role)
-                else:
-                    raise exception.Forbidden(
-                        _('Trustee has no delegated roles.'))
 
     def mint(self, token_id, issued_at):
         """Set the ``id`` and ``issued_at`` attributes of a token.
@@ -567,15 +584,21 @@ class _TokenModelHandler(object):
         self._registry = registry
 
     def serialize(self, obj):
-        serialized = msgpackutils.dumps(obj.__dict__, registry=self._registry)
+        serialized = msgpackutils.dumps(obj.__getstate__(),
+                                        registry=self._registry)
         return serialized
 
     def deserialize(self, data):
         token_data = msgpackutils.loads(data, registry=self._registry)
         try:
             token_model = TokenModel()
-            for k, v in iter(token_data.items()):
-                setattr(token_model, k, v)
+            if isinstance(token_data, dict):
+                # Entries cached before the compact representation hold the
+                # attributes of the token, entities included.
+                for k, v in iter(token_data.items()):
+                    setattr(token_model, k, v)
+            else:
+                token_model.__setstate__(token_data)
         except Exception:
             LOG.debug(
                 "Failed to deserialize TokenModel. Data is %s", token_data
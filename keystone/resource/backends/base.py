@@ -16,6 +16,7 @@ import abc
 
 import six
 
+from keystone.common import driver_hints
 import keystone.conf
 from keystone import exception
 
@@ -144,6 +145,21 @@ class ResourceDriverBase(object):
         """
         raise exception.NotImplemented()
 
+    def list_projects_from_parent_ids(self, parent_ids):
+        """List the projects whose parent is one of the provided ids.
+
+        :param parent_ids: list of ids
+
+        :returns: a list of project_refs or an empty list.
+
+        """
+        projects = []
+        for parent_id in parent_ids:
+            hints = driver_hints.Hints()
+            hints.add_filter('parent_id', parent_id)
+            projects += self.list_projects(hints)
+        return projects
+
     @abc.abstractmethod
     def list_projects_in_subtree(self, project_id):
         """List all projects in the subtree of a given project.
@@ -127,6 +127,12 @@ class Resource(base.ResourceDriverBase):
         project_refs = query.all()
         return [project_ref.to_dict() for project_ref in project_refs]
 
+    def list_projects_from_parent_ids(self, parent_ids):
+        if not parent_ids:
+            return []
+        with sql.session_for_read() as session:
+            return self._get_children(session, parent_ids)
+
     def list_projects_in_subtree(self, project_id):
         with sql.session_for_read() as session:
             children = self._get_children(session, [project_id])
@@ -61,3 +61,14 @@ class RevokeDriverBase(object):
 
         """
         raise exception.NotImplemented()  # pragma: no cover
+
+    def prune_expired_events(self, batch_size=None, dry_run=False):
+        """Delete the events of tokens that have all expired.
+
+        :param batch_size: maximum number of events deleted per transaction,
+                           defaults to ``[revoke] prune_batch_size``.
+        :param dry_run: only count the events that would be deleted.
+        :returns: the number of events deleted, or that would be deleted.
+
+        """
+        raise exception.NotImplemented()  # pragma: no cover
@@ -10,15 +10,24 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
+from oslo_log import log
+from oslo_utils import timeutils
 import sqlalchemy
 
 from keystone.common import sql
+import keystone.conf
 from keystone.models import revoke_model
 from keystone.revoke.backends import base
 
 from oslo_db import api as oslo_db_api
 
 
+CONF = keystone.conf.CONF
+LOG = log.getLogger(__name__)
+
+
 class RevocationEvent(sql.ModelBase, sql.ModelDictMixin):
     __tablename__ = 'revocation_event'
     attributes = revoke_model.REVOKE_KEYS
@@ -49,46 +58,64 @@ class RevocationEvent(sql.ModelBase, sql.ModelDictMixin):
 
 
 class Revoke(base.RevokeDriverBase):
-    def _flush_batch_size(self, dialect):
-        batch_size = 0
-        if dialect == 'ibm_db_sa':
-            # This functionality is limited to DB2, because
-            # it is necessary to prevent the transaction log
-            # from filling up, whereas at least some of the
-            # other supported databases do not support update
-            # queries with LIMIT subqueries nor do they appear
-            # to require the use of such queries when deleting
-            # large numbers of records at once.
-            batch_size = 100
-            # Limit of 100 is known to not fill a transaction log
-            # of default maximum size while not significantly
-            # impacting the performance of large token purges on
-            # systems where the maximum transaction log size has
-            # been increased beyond the default.
-        return batch_size
-
-    def _prune_expired_events(self):
+    def __init__(self):
+        super(Revoke, self).__init__()
+        self._last_pruned_at = None
+
+    def _expired_events_query(self, session, oldest, *columns):
+        return (session.query(*columns).
+                filter(RevocationEvent.revoked_at < oldest))
+
+    @oslo_db_api.wrap_db_retry(retry_on_deadlock=True)
+    def prune_expired_events(self, batch_size=None, dry_run=False):
+        batch_size = batch_size or CONF.revoke.prune_batch_size
         oldest = base.revoked_before_cutoff_time()
 
-        with sql.session_for_write() as session:
-            dialect = session.bind.dialect.name
-            batch_size = self._flush_batch_size(dialect)
-            if batch_size > 0:
-                query = session.query(RevocationEvent.id)
-                query = query.filter(RevocationEvent.revoked_at < oldest)
-                query = query.limit(batch_size).subquery()
-                delete_query = (session.query(RevocationEvent).
-                                filter(RevocationEvent.id.in_(query)))
-                while True:
-                    rowcount = delete_query.delete(synchronize_session=False)
-                    if rowcount == 0:
-                        break
-            else:
-                query = session.query(RevocationEvent)
-                query = query.filter(RevocationEvent.revoked_at < oldest)
-                query.delete(synchronize_session=False)
-
-            session.flush()
+        if dry_run:
+            with sql.session_for_read() as session:
+                return self._expired_events_query(
+                    session, oldest, RevocationEvent.id).count()
+
+        pruned = 0
+        while True:
+            # Every batch is deleted in its own transaction so that pruning
+            # a large backlog of events never holds long-running locks on
+            # the revocation table.
+            with sql.session_for_write() as session:
+                query = self._expired_events_query(
+                    session, oldest, RevocationEvent.id)
+                event_ids = [ref.id for ref in query.limit(batch_size)]
+                if not event_ids:
+                    break
+                (session.query(RevocationEvent).
+                 filter(RevocationEvent.id.in_(event_ids)).
+                 delete(synchronize_session=False))
+            pruned += len(event_ids)
+            LOG.debug('Pruned %(count)d expired revocation events, '
+                      '%(total)d so far.',
+                      {'count': len(event_ids), 'total': pruned})
+            if len(event_ids) < batch_size:
+                break
+        return pruned
+
+    def _prune_expired_events_if_due(self):
+        interval = CONF.revoke.prune_interval
+        if not interval:
+            return
+        now = timeutils.utcnow()
+        if self._last_pruned_at is not None:
+            next_prune_at = (self._last_pruned_at +
+                             datetime.timedelta(seconds=interval))
+            if now < next_prune_at:
+                return
+        self._last_pruned_at = now
+        try:
+            self.prune_expired_events()
+        except Exception as e:
+            # The event is already recorded, the expired events will be
+            # pruned by a later revocation or `keystone-manage
+            # revocation_prune`.
+            LOG.warning('Unable to prune expired revocation events: %s', e)
 
     def _list_token_events(self, token):
         with sql.session_for_read() as session:
@@ -131,11 +158,14 @@ class Revoke(base.RevokeDriverBase):
             return self._list_last_fetch_events(last_fetch)
 
     @oslo_db_api.wrap_db_retry(retry_on_deadlock=True)
-    def revoke(self, event):
+    def _add_event(self, event):
         kwargs = dict()
         for attr in revoke_model.REVOKE_KEYS:
             kwargs[attr] = getattr(event, attr)
         record = RevocationEvent(**kwargs)
         with sql.session_for_write() as session:
             session.add(record)
-            self._prune_expired_events()
+
+    def revoke(self, event):
+        self._add_event(event)
+        self._prune_expired_events_if_due()
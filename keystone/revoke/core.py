@@ -19,6 +19,7 @@ from keystone import exception
 from keystone.i18n import _
 from keystone.models import revoke_model
 from keystone import notifications
+from keystone.revoke.backends import base as revoke_base
 
 
 CONF = keystone.conf.CONF
@@ -51,11 +52,21 @@ class Manager(manager.Manager):
         self.model = revoke_model
 
     @MEMOIZE
-    def _list_events(self, last_fetch):
-        return self.driver.list_events(last_fetch)
+    def _list_events(self):
+        # Only the events newer than the cutoff are cached, which bounds the
+        # size of the entry. The older events revoke tokens that have all
+        # expired and are pruned from the backend.
+        return self.driver.list_events(
+            last_fetch=revoke_base.revoked_before_cutoff_time())
 
     def list_events(self, last_fetch=None):
-        return self._list_events(last_fetch)
+        # The events are cached under a single key and filtered here, so
+        # that consumers polling with distinct `last_fetch` values are served
+        # from the cache rather than each scanning the backend.
+        events = self._list_events()
+        if last_fetch:
+            events = [e for e in events if e.revoked_at > last_fetch]
+        return events
 
     def _user_callback(self, service, resource_type, operation,
                        payload):
@@ -139,3 +150,10 @@ class Manager(manager.Manager):
     def revoke(self, event):
         self.driver.revoke(event)
         REVOKE_REGION.invalidate()
+
+    def prune_expired_events(self, batch_size=None, dry_run=False):
+        pruned = self.driver.prune_expired_events(batch_size=batch_size,
+                                                  dry_run=dry_run)
+        if pruned and not dry_run:
+            REVOKE_REGION.invalidate()
+        return pruned
@@ -41,9 +41,11 @@ def load_backends():
     cache.configure_cache()
     cache.configure_cache(region=catalog.COMPUTED_CATALOG_REGION)
     cache.configure_cache(region=assignment.COMPUTED_ASSIGNMENTS_REGION)
+    cache.configure_cache(region=endpoint_policy.ENDPOINT_POLICY_REGION)
     cache.configure_cache(region=revoke.REVOKE_REGION)
     cache.configure_cache(region=token.provider.TOKENS_REGION)
     cache.configure_cache(region=identity.ID_MAPPING_REGION)
+    cache.configure_cache(region=trust.TRUST_CHAIN_REGION)
     cache.configure_invalidation_region()
 
     managers = [application_credential.Manager, assignment.Manager,
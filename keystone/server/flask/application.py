@@ -27,6 +27,7 @@ import keystone.api
 from keystone.application_credential import routers as app_cred_routers
 from keystone.assignment import routers as assignment_routers
 from keystone.auth import routers as auth_routers
+from keystone.common import rbac_enforcer
 from keystone.common import wsgi as keystone_wsgi
 from keystone.contrib.ec2 import routers as ec2_routers
 from keystone.contrib.s3 import routers as s3_routers
@@ -178,7 +179,7 @@ class _ComposibleRouterStub(keystone_wsgi.ComposableRouter):
 def _add_vary_x_auth_token_header(response):
     # Add the expected Vary Header, this is run after every request in the
     # response-phase
-    response.headers['Vary'] = 'X-Auth-Token'
+    response.vary.add('X-Auth-Token')
     return response
 
 
@@ -240,6 +241,14 @@ def application_factory(name='public'):
         for api_bp in api.APIs:
             api_bp.instantiate_and_register_to_app(app)
 
+    # All APIs have registered their JSON Home resources, build the discovery
+    # documents once instead of on the first requests.
+    keystone.api.discovery.prime_document_cache()
+
+    # Build the policy enforcer and load the policy rules now rather than on
+    # the first enforced request.
+    rbac_enforcer.RBACEnforcer.prepare_enforcer()
+
     # Build and construct the dispatching for the Legacy dispatching model
     sub_routers.append(_ComposibleRouterStub(_routers))
     legacy_dispatcher = keystone_wsgi.ComposingRouter(mapper, sub_routers)
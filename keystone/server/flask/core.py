@@ -12,6 +12,7 @@
 
 import collections
 import os
+import time
 
 import oslo_i18n
 from oslo_log import log
@@ -28,6 +29,7 @@ oslo_i18n.enable_lazy()
 from keystone.common import profiler
 import keystone.conf
 import keystone.server
+from keystone.server import warmup
 from keystone.server.flask import application
 
 # NOTE(morgan): Middleware Named Tuple with the following values:
@@ -96,11 +98,17 @@ def setup_app_middleware(app):
     # Add in optional (config-based) middleware
     # NOTE(morgan): Each of these may need to be in a specific location
     # within the pipeline therefore cannot be magically appended/prepended
+    if CONF.sql_instrumentation:
+        # Count the statements issued while validating the token as well, so
+        # go ahead of the auth context middleware.
+        MW = MW[:-1] + (_Middleware(namespace='keystone.server_middleware',
+                                    ep='sql_stats',
+                                    conf={}),) + MW[-1:]
     if CONF.wsgi.debug_middleware:
         # Add in the Debug Middleware
         MW = (_Middleware(namespace='keystone.server_middleware',
                           ep='debug',
-                          conf={}),) + _APP_MIDDLEWARE
+                          conf={}),) + MW
 
     # Apply the middleware to the application.
     for mw in reversed(MW):
@@ -145,7 +153,9 @@ def initialize_application(name, post_log_configured_function=lambda: None,
         if os.path.exists(dev_conf):
             config_files = [dev_conf]
 
-    keystone.server.configure(config_files=config_files)
+    timer = warmup.StartupTimer()
+    with timer.step('configuration'):
+        keystone.server.configure(config_files=config_files)
 
     # Log the options used when starting if we're in debug mode...
     if CONF.debug:
@@ -156,14 +166,31 @@ def initialize_application(name, post_log_configured_function=lambda: None,
     # TODO(morgan): Provide a better mechanism than "loadapp", this was for
     # paste-deploy specific mechanisms.
     def loadapp():
-        app = application.application_factory(name)
+        with timer.step('application'):
+            app = application.application_factory(name)
         return app
 
+    # The extra backends are loaded right after the managers, use that hook
+    # to time loading them.
+    def backends_loaded():
+        timer.timings['backends'] = time.time() - backends_start
+        return {}
+
+    backends_start = time.time()
     _unused, app = keystone.server.setup_backends(
+        load_extra_backends_fn=backends_loaded,
         startup_application_fn=loadapp)
 
     # setup OSprofiler notifier and enable the profiling if that is configured
     # in Keystone configuration file.
     profiler.setup(name)
 
-    return setup_app_middleware(app)
+    app = setup_app_middleware(app)
+
+    # Initialize everything that would otherwise be initialized by the first
+    # requests, before this process starts serving.
+    if CONF.wsgi.warm_start:
+        warmup.warm_up(timer)
+    timer.report()
+
+    return app
@@ -0,0 +1,166 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Warm up a keystone process before it serves its first request."""
+
+import collections
+import contextlib
+import time
+
+from oslo_log import log
+
+from keystone import assignment
+from keystone import catalog
+from keystone.common import cache
+from keystone.common import fernet_utils
+from keystone.common import provider_api
+import keystone.conf
+from keystone import endpoint_policy
+from keystone import exception
+from keystone import identity
+from keystone import revoke
+from keystone import token
+from keystone import trust
+
+
+CONF = keystone.conf.CONF
+LOG = log.getLogger(__name__)
+PROVIDERS = provider_api.ProviderAPIs
+
+
+class StartupTimer(object):
+    """Record how long each startup step takes."""
+
+    def __init__(self):
+        self.timings = collections.OrderedDict()
+
+    @contextlib.contextmanager
+    def step(self, name):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.time() - start
+
+    def report(self):
+        """Log the startup timing report and return the timings."""
+        LOG.info('Keystone started in %(total).3fs (%(steps)s)',
+                 {'total': sum(self.timings.values()),
+                  'steps': ', '.join('%s: %.3fs' % step
+                                     for step in self.timings.items())})
+        return self.timings
+
+
+def _load_domain_drivers():
+    PROVIDERS.identity_api.load_domain_drivers()
+
+
+def _check_fernet_keys():
+    # The token formatter reads the keys from the repository every time it
+    # needs them, so they cannot be loaded ahead of time. Reading them once
+    # reports an unreadable or empty repository at startup rather than on
+    # the first token request.
+    if CONF.token.provider != 'fernet':
+        return
+    keys = fernet_utils.FernetUtils(
+        CONF.fernet_tokens.key_repository,
+        CONF.fernet_tokens.max_active_keys,
+        'fernet_tokens'
+    ).load_keys()
+    if not keys:
+        raise exception.KeysNotFound()
+
+
+def _connect_cache_backends():
+    if not CONF.cache.enabled:
+        return
+    for region in (cache.CACHE_REGION,
+                   catalog.COMPUTED_CATALOG_REGION,
+                   assignment.COMPUTED_ASSIGNMENTS_REGION,
+                   endpoint_policy.ENDPOINT_POLICY_REGION,
+                   revoke.REVOKE_REGION,
+                   token.provider.TOKENS_REGION,
+                   identity.ID_MAPPING_REGION,
+                   trust.TRUST_CHAIN_REGION):
+        # Any lookup makes the backend open its connections.
+        region.get('keystone-warm-up')
+
+
+def _prime(manager, getter, refs, group, key='id'):
+    # Cache the refs of a list call under the keys of the memoized getter of
+    # a single ref, instead of calling the getter for each of them.
+    cache.prime_memoization(manager, getter,
+                            dict((ref[key], ref) for ref in refs), group)
+
+
+def _prime_roles():
+    role_api = PROVIDERS.role_api
+    _prime(role_api, role_api.get_role, role_api.list_roles(), 'role')
+
+
+def _prime_domains():
+    resource_api = PROVIDERS.resource_api
+    domains = resource_api.list_domains()
+    _prime(resource_api, resource_api.get_domain, domains, 'resource')
+    _prime(resource_api, resource_api.get_domain_by_name, domains,
+           'resource', key='name')
+
+
+def _prime_catalog():
+    catalog_api = PROVIDERS.catalog_api
+    _prime(catalog_api, catalog_api.get_region, catalog_api.list_regions(),
+           'catalog')
+    _prime(catalog_api, catalog_api.get_service, catalog_api.list_services(),
+           'catalog')
+    _prime(catalog_api, catalog_api.get_endpoint,
+           catalog_api.list_endpoints(), 'catalog')
+
+
+def _prime_service_providers():
+    PROVIDERS.federation_api.get_enabled_service_providers()
+
+
+_LOAD_STEPS = (
+    ('domain_drivers', _load_domain_drivers),
+    ('fernet_keys_check', _check_fernet_keys),
+    ('cache_connections', _connect_cache_backends),
+)
+
+_PRIME_STEPS = (
+    ('roles', _prime_roles),
+    ('domains', _prime_domains),
+    ('catalog', _prime_catalog),
+    ('service_providers', _prime_service_providers),
+)
+
+
+def warm_up(timer):
+    """Load the lazily initialized components and prime the hot caches.
+
+    Every step is timed with ``timer``. A failing step is logged and does
+    not prevent keystone from starting, the component will be initialized
+    by the first request that needs it instead.
+
+    :param timer: the :class:`StartupTimer` of the process.
+    """
+    steps = _LOAD_STEPS
+    # Without caching, priming would only run queries whose results are
+    # thrown away.
+    if CONF.cache.enabled:
+        steps += _PRIME_STEPS
+    for name, func in steps:
+        with timer.step(name):
+            try:
+                func()
+            except Exception as e:
+                LOG.warning('Unable to warm up %(step)s: %(error)s',
+                            {'step': name, 'error': e})
@@ -0,0 +1,93 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Benchmark the import of the keystone WSGI application.
+
+Every WSGI worker imports the application before it can serve requests. This
+imports it in fresh interpreters and reports the time it took, the number of
+modules loaded, the peak resident memory and which of the optional
+subsystems (SAML, OAuth1, LDAP) were imported along the way.
+
+Run it with::
+
+    $ python -m keystone.tests.benchmark.import_time --runs 5
+"""
+
+from __future__ import print_function
+
+import argparse
+import subprocess
+import sys
+
+from oslo_serialization import jsonutils
+
+
+APPLICATION_MODULE = 'keystone.server.flask.application'
+
+# Modules only needed by deployments using the matching subsystem.
+OPTIONAL_MODULES = ('saml2', 'oauthlib', 'ldap', 'ldappool')
+
+_PROBE = """
+import json
+import resource
+import sys
+import time
+
+start = time.time()
+import %(module)s
+elapsed = time.time() - start
+print(json.dumps({
+    'elapsed_seconds': elapsed,
+    'modules': len(sys.modules),
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'optional_modules': sorted(m for m in %(optional)r if m in sys.modules),
+}))
+"""
+
+
+def import_in_subprocess(module=APPLICATION_MODULE):
+    """Import ``module`` in a fresh interpreter and return its statistics."""
+    probe = _PROBE % {'module': module, 'optional': OPTIONAL_MODULES}
+    output = subprocess.check_output([sys.executable, '-c', probe])
+    # Only the last line is ours, importing may print warnings.
+    return jsonutils.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def run(runs, module=APPLICATION_MODULE):
+    samples = [import_in_subprocess(module) for _ in range(runs)]
+    elapsed = sorted(s['elapsed_seconds'] for s in samples)
+    return {
+        'module': module,
+        'runs': runs,
+        'min_seconds': elapsed[0],
+        'mean_seconds': sum(elapsed) / runs,
+        'modules': samples[-1]['modules'],
+        'max_rss_kb': max(s['max_rss_kb'] for s in samples),
+        'optional_modules': samples[-1]['optional_modules'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of interpreters to import in.')
+    parser.add_argument('--module', default=APPLICATION_MODULE,
+                        help='Module to import.')
+    args = parser.parse_args(argv)
+
+    print(jsonutils.dumps(run(args.runs, args.module), indent=2,
+                          sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Benchmark password authentication, token issue and token validation.
+
+This seeds a scratch deployment with users, groups, a tree of projects,
+implied roles, catalog endpoints and revocation events, and then measures
+the throughput and latency of the operations behind the token API:
+
+* ``password_auth``: authenticating a user with a password.
+* ``issue_scoped_token``: issuing and rendering a project scoped token.
+* ``validate_token``: validating and rendering such a token.
+* ``list_role_assignments``: listing the effective role assignments of a
+  user, which expands group membership, inheritance and implied roles.
+* ``get_catalog``: generating the catalog of a user on a project.
+
+Every run prints a JSON document, so results can be compared across commits.
+Run it with::
+
+    $ python -m keystone.tests.benchmark.token_flow --users 200 \\
+        --iterations 500
+
+By default a temporary SQLite database holds all the data.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+from cryptography import fernet
+from oslo_db import options as db_options
+from oslo_serialization import jsonutils
+from six.moves import range
+
+from keystone.common import context
+from keystone.common import controller
+from keystone.common import provider_api
+from keystone.common import request
+from keystone.common import sql
+import keystone.conf
+from keystone.server import backends
+
+
+CONF = keystone.conf.CONF
+PROVIDERS = provider_api.ProviderAPIs
+
+_DOMAIN_ID = 'default'
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            '%s is not a positive integer' % value)
+    return number
+
+
+def _percentile(samples, percent):
+    if not samples:
+        return 0.0
+    index = int(round((len(samples) - 1) * percent / 100.0))
+    return samples[index]
+
+
+def _configure(workdir, connection, cache):
+    keystone.conf.configure()
+    db_options.set_defaults(CONF, connection=connection)
+    CONF([], project='keystone', default_config_files=[])
+
+    key_repository = os.path.join(workdir, 'fernet-keys')
+    os.mkdir(key_repository, 0o700)
+    for index in ('0', '1'):
+        with open(os.path.join(key_repository, index), 'wb') as f:
+            f.write(fernet.Fernet.generate_key())
+    CONF.set_override('key_repository', key_repository,
+                      group='fernet_tokens')
+    CONF.set_override('key_repository', key_repository, group='credential')
+
+    # Measure keystone, not the password hashing.
+    CONF.set_override('password_hash_rounds', 4, group='identity')
+
+    CONF.set_override('enabled', cache, group='cache')
+    CONF.set_override('backend', 'dogpile.cache.memory', group='cache')
+
+
+def _load_backends():
+    drivers = backends.load_backends()
+    with sql.session_for_write() as session:
+        engine = session.get_bind()
+    sql.ModelBase.metadata.create_all(bind=engine)
+    return drivers
+
+
+def _make_request():
+    environ = {context.REQUEST_CONTEXT_ENV: context.RequestContext(
+        authenticated=True)}
+    return request.Request.blank(path='/', environ=environ)
+
+
+def _seed(users, groups, projects, depth, roles, implied_roles, services,
+          revocations):
+    """Create the data set and return what the measurements need."""
+    resource_api = PROVIDERS.resource_api
+    role_api = PROVIDERS.role_api
+    assignment_api = PROVIDERS.assignment_api
+    identity_api = PROVIDERS.identity_api
+    catalog_api = PROVIDERS.catalog_api
+
+    resource_api.create_domain(_DOMAIN_ID, {
+        'id': _DOMAIN_ID, 'name': 'Default', 'enabled': True})
+
+    # A tree of projects ``depth`` levels deep, the projects of a level are
+    # spread over the projects of the level above.
+    levels = []
+    parents = [_DOMAIN_ID]
+    per_level = max(1, projects // depth)
+    for level in range(depth):
+        level_projects = []
+        for index in range(per_level):
+            project_id = uuid.uuid4().hex
+            resource_api.create_project(project_id, {
+                'id': project_id, 'name': project_id,
+                'domain_id': _DOMAIN_ID,
+                'parent_id': parents[index % len(parents)],
+                'enabled': True, 'is_domain': False})
+            level_projects.append(project_id)
+        levels.append(level_projects)
+        parents = level_projects
+    root_projects = levels[0]
+    leaf_projects = levels[-1]
+
+    # Every role implies the next one, up to ``implied_roles`` of them.
+    role_ids = []
+    for index in range(roles):
+        role_id = uuid.uuid4().hex
+        role_api.create_role(role_id, {'id': role_id, 'name': role_id})
+        role_ids.append(role_id)
+    for index in range(min(implied_roles, roles - 1)):
+        role_api.create_implied_role(role_ids[index], role_ids[index + 1])
+
+    group_ids = []
+    for index in range(groups):
+        group = identity_api.create_group(
+            {'name': uuid.uuid4().hex, 'domain_id': _DOMAIN_ID})
+        group_ids.append(group['id'])
+        # Inherited to the whole subtree of a root project.
+        assignment_api.create_grant(
+            role_ids[index % roles], group_id=group['id'],
+            project_id=root_projects[index % len(root_projects)],
+            inherited_to_projects=True)
+
+    password = uuid.uuid4().hex
+    principals = []
+    for index in range(users):
+        user = identity_api.create_user({
+            'name': uuid.uuid4().hex, 'domain_id': _DOMAIN_ID,
+            'enabled': True, 'password': password})
+        project_id = leaf_projects[index % len(leaf_projects)]
+        assignment_api.create_grant(
+            role_ids[index % roles], user_id=user['id'],
+            project_id=project_id)
+        if group_ids:
+            identity_api.add_user_to_group(
+                user['id'], group_ids[index % len(group_ids)])
+        principals.append((user['id'], project_id))
+
+    region_id = uuid.uuid4().hex
+    catalog_api.create_region({'id': region_id})
+    for index in range(services):
+        service_id = uuid.uuid4().hex
+        catalog_api.create_service(service_id, {
+            'id': service_id, 'type': uuid.uuid4().hex,
+            'name': uuid.uuid4().hex, 'enabled': True})
+        for interface in ('public', 'internal', 'admin'):
+            endpoint_id = uuid.uuid4().hex
+            catalog_api.create_endpoint(endpoint_id, {
+                'id': endpoint_id, 'service_id': service_id,
+                'region_id': region_id, 'interface': interface,
+                'url': 'http://%s/%s' % (interface, service_id),
+                'enabled': True})
+
+    for index in range(revocations):
+        PROVIDERS.revoke_api.revoke_by_user(uuid.uuid4().hex)
+
+    return principals, password
+
+
+def _measure(func, iterations):
+    latencies = []
+    started = time.time()
+    for index in range(iterations):
+        op_started = time.time()
+        func(index)
+        latencies.append(time.time() - op_started)
+    elapsed = time.time() - started
+    latencies.sort()
+    return {
+        'iterations': iterations,
+        'elapsed_seconds': elapsed,
+        'ops_per_second': iterations / elapsed if elapsed else 0.0,
+        'latency_ms': {
+            'p50': _percentile(latencies, 50) * 1000,
+            'p95': _percentile(latencies, 95) * 1000,
+            'p99': _percentile(latencies, 99) * 1000,
+            'max': (latencies[-1] if latencies else 0.0) * 1000,
+        },
+    }
+
+
+def run(iterations, users=100, groups=10, projects=50, depth=3, roles=10,
+        implied_roles=3, services=10, revocations=100, cache=True,
+        connection=None):
+    for name, value in (('users', users), ('projects', projects),
+                        ('depth', depth), ('roles', roles)):
+        # The seeded data is spread over these with modulo operations.
+        if value < 1:
+            raise ValueError('%s must be at least 1, got %d' % (name, value))
+    workdir = tempfile.mkdtemp()
+    try:
+        if connection is None:
+            connection = 'sqlite:///%s' % os.path.join(workdir, 'keystone.db')
+        _configure(workdir, connection, cache)
+        _load_backends()
+        principals, password = _seed(
+            users, groups, projects, depth, roles, implied_roles, services,
+            revocations)
+
+        def principal(index):
+            return principals[index % len(principals)]
+
+        def password_auth(index):
+            user_id, project_id = principal(index)
+            PROVIDERS.identity_api.authenticate(
+                _make_request(), user_id, password)
+
+        tokens = []
+
+        def issue_scoped_token(index):
+            user_id, project_id = principal(index)
+            token = PROVIDERS.token_provider_api.issue_token(
+                user_id, ['password'], project_id=project_id)
+            controller.render_token_response_from_model(token)
+            tokens.append(token.id)
+
+        def validate_token(index):
+            token = PROVIDERS.token_provider_api.validate_token(
+                tokens[index % len(tokens)])
+            controller.render_token_response_from_model(token)
+
+        def list_role_assignments(index):
+            user_id, project_id = principal(index)
+            PROVIDERS.assignment_api.list_role_assignments(
+                user_id=user_id, effective=True)
+
+        def get_catalog(index):
+            user_id, project_id = principal(index)
+            PROVIDERS.catalog_api.get_v3_catalog(user_id, project_id)
+
+        result = {
+            'dataset': {
+                'cache': cache, 'users': users, 'groups': groups,
+                'projects': projects, 'depth': depth, 'roles': roles,
+                'implied_roles': implied_roles, 'services': services,
+                'revocations': revocations,
+            },
+        }
+        for func in (password_auth, issue_scoped_token, validate_token,
+                     list_role_assignments, get_catalog):
+            result[func.__name__] = _measure(func, iterations)
+        return result
+    finally:
+        shutil.rmtree(workdir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=_positive_int, default=200,
+                        help='Number of times each operation is measured.')
+    parser.add_argument('--users', type=_positive_int, default=100,
+                        help='Number of users.')
+    parser.add_argument('--groups', type=int, default=10,
+                        help='Number of groups, every user is a member of '
+                             'one of them.')
+    parser.add_argument('--projects', type=_positive_int, default=50,
+                        help='Number of projects.')
+    parser.add_argument('--depth', type=_positive_int, default=3,
+                        help='Depth of the project tree.')
+    parser.add_argument('--roles', type=_positive_int, default=10,
+                        help='Number of roles.')
+    parser.add_argument('--implied-roles', type=int, default=3,
+                        help='Length of the chain of implied roles.')
+    parser.add_argument('--services', type=int, default=10,
+                        help='Number of services, each has a public, '
+                             'internal and admin endpoint.')
+    parser.add_argument('--revocations', type=int, default=100,
+                        help='Number of revocation events.')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='Disable caching.')
+    parser.add_argument('--connection', default=None,
+                        help='SQLAlchemy connection string of a scratch '
+                             'database. Defaults to a temporary SQLite '
+                             'database.')
+    args = parser.parse_args(argv)
+
+    result = run(args.iterations, users=args.users, groups=args.groups,
+                 projects=args.projects, depth=args.depth, roles=args.roles,
+                 implied_roles=args.implied_roles, services=args.services,
+                 revocations=args.revocations, cache=args.cache,
+                 connection=args.connection)
+    print(jsonutils.dumps(result, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
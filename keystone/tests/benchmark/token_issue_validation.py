@@ -0,0 +1,98 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Benchmark validation of token issue request bodies.
+
+Every ``POST /v3/auth/tokens`` request body is validated against the token
+issue schema. This measures that validation with the cached validators used
+by the API and, for comparison, with a validator built for every request as
+keystone used to do.
+
+Run it with::
+
+    $ python -m keystone.tests.benchmark.token_issue_validation \\
+        --iterations 20000
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+import timeit
+import uuid
+
+import jsonschema
+from oslo_serialization import jsonutils
+
+from keystone.auth import schema
+from keystone.common.validation import validators
+
+
+def _password_auth():
+    return {
+        'identity': {
+            'methods': ['password'],
+            'password': {
+                'user': {
+                    'name': uuid.uuid4().hex,
+                    'domain': {'id': 'default'},
+                    'password': uuid.uuid4().hex,
+                },
+            },
+        },
+        'scope': {
+            'project': {
+                'name': uuid.uuid4().hex,
+                'domain': {'name': 'Default'},
+            },
+        },
+    }
+
+
+def _validate_uncached(auth):
+    # This is what keystone did before validators were cached: extend the
+    # validator class and collect the format checkers for every request.
+    validator_cls = jsonschema.validators.extend(
+        validators.SchemaValidator.validator_org, {})
+    validator = validator_cls(schema.token_issue,
+                              format_checker=jsonschema.FormatChecker())
+    validator.validate(auth)
+
+
+def run(iterations):
+    auth = _password_auth()
+    result = {'iterations': iterations}
+    for name, func in [('cached', schema.validate_issue_token_auth),
+                       ('uncached', _validate_uncached)]:
+        elapsed = timeit.timeit(lambda: func(auth), number=iterations)
+        result[name] = {
+            'elapsed_seconds': elapsed,
+            'validations_per_second': iterations / elapsed if elapsed else 0.0,
+            'mean_us': elapsed / iterations * 1000000,
+        }
+    result['speedup'] = (result['uncached']['elapsed_seconds'] /
+                         result['cached']['elapsed_seconds'])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10000,
+                        help='Number of request bodies to validate.')
+    args = parser.parse_args(argv)
+
+    print(jsonutils.dumps(run(args.iterations), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1988,6 +1988,41 @@ class AssignmentTests(AssignmentTestHelperMixin):
         )
         self.assertEqual(3, len(user_projects))
 
+    def test_list_projects_and_domains_for_user_without_expansion(self):
+        domain = unit.new_domain_ref()
+        PROVIDERS.resource_api.create_domain(domain['id'], domain)
+        user = unit.new_user_ref(domain_id=domain['id'])
+        user = PROVIDERS.identity_api.create_user(user)
+        group = unit.new_group_ref(domain_id=domain['id'])
+        group = PROVIDERS.identity_api.create_group(group)
+        PROVIDERS.identity_api.add_user_to_group(user['id'], group['id'])
+        project = unit.new_project_ref(domain_id=domain['id'])
+        PROVIDERS.resource_api.create_project(project['id'], project)
+        PROVIDERS.assignment_api.create_grant(
+            user_id=user['id'], project_id=self.tenant_bar['id'],
+            role_id=self.role_member['id']
+        )
+        PROVIDERS.assignment_api.create_grant(
+            group_id=group['id'], project_id=project['id'],
+            role_id=self.role_member['id']
+        )
+        PROVIDERS.assignment_api.create_grant(
+            group_id=group['id'], domain_id=domain['id'],
+            role_id=self.role_member['id']
+        )
+
+        # The effective role assignments of the user are never built.
+        with mock.patch.object(PROVIDERS.assignment_api,
+                               'list_role_assignments') as mocked:
+            user_projects = PROVIDERS.assignment_api.list_projects_for_user(
+                user['id'])
+            user_domains = PROVIDERS.assignment_api.list_domains_for_user(
+                user['id'])
+        mocked.assert_not_called()
+        self.assertItemsEqual([self.tenant_bar['id'], project['id']],
+                              [p['id'] for p in user_projects])
+        self.assertEqual([domain['id']], [d['id'] for d in user_domains])
+
     def test_create_grant_no_user(self):
         # If call create_grant with a user that doesn't exist, doesn't fail.
         PROVIDERS.assignment_api.create_grant(
@@ -3899,6 +3934,34 @@ class ImpliedRoleTests(AssignmentTestHelperMixin):
         }
         self.execute_assignment_plan(test_plan)
 
+    def test_list_projects_for_user_with_domain_specific_roles(self):
+        domain = unit.new_domain_ref()
+        PROVIDERS.resource_api.create_domain(domain['id'], domain)
+        user = unit.new_user_ref(domain_id=domain['id'])
+        user = PROVIDERS.identity_api.create_user(user)
+        domain_role = unit.new_role_ref(domain_id=domain['id'])
+        PROVIDERS.role_api.create_role(domain_role['id'], domain_role)
+        prior_role = unit.new_role_ref(domain_id=domain['id'])
+        PROVIDERS.role_api.create_role(prior_role['id'], prior_role)
+        PROVIDERS.role_api.create_implied_role(
+            prior_role['id'], self.role_member['id'])
+        project1 = unit.new_project_ref(domain_id=domain['id'])
+        PROVIDERS.resource_api.create_project(project1['id'], project1)
+        project2 = unit.new_project_ref(domain_id=domain['id'])
+        PROVIDERS.resource_api.create_project(project2['id'], project2)
+
+        # A domain specific role only grants access through the global roles
+        # it implies.
+        PROVIDERS.assignment_api.create_grant(
+            user_id=user['id'], project_id=project1['id'],
+            role_id=domain_role['id'])
+        PROVIDERS.assignment_api.create_grant(
+            user_id=user['id'], project_id=project2['id'],
+            role_id=prior_role['id'])
+        user_projects = PROVIDERS.assignment_api.list_projects_for_user(
+            user['id'])
+        self.assertEqual([project2['id']], [p['id'] for p in user_projects])
+
 
 class SystemAssignmentTests(AssignmentTestHelperMixin):
     def test_create_system_grant_for_user(self):
@@ -30,6 +30,19 @@ class RoleTests(object):
                           PROVIDERS.role_api.get_role,
                           uuid.uuid4().hex)
 
+    def test_get_roles_by_ids(self):
+        roles = [unit.new_role_ref() for _ in range(3)]
+        for role in roles:
+            PROVIDERS.role_api.create_role(role['id'], role)
+        role_ids = [role['id'] for role in roles]
+
+        refs = PROVIDERS.role_api.get_roles_by_ids(
+            role_ids + [uuid.uuid4().hex])
+        self.assertEqual(sorted(role_ids), sorted(refs))
+        for role_id in role_ids:
+            self.assertEqual(PROVIDERS.role_api.get_role(role_id),
+                             refs[role_id])
+
     def test_get_unique_role_by_name_returns_not_found(self):
         self.assertRaises(exception.RoleNotFound,
                           PROVIDERS.role_api.get_unique_role_by_name,
@@ -121,6 +134,21 @@ class RoleTests(object):
         expected_role_ids = set(role['id'] for role in default_fixtures.ROLES)
         self.assertEqual(expected_role_ids, role_ids)
 
+    @unit.skip_if_cache_disabled('role')
+    def test_cache_layer_get_roles_by_ids(self):
+        role = unit.new_role_ref()
+        PROVIDERS.role_api.create_role(role['id'], role)
+        role_ref = PROVIDERS.role_api.get_role(role['id'])
+        # Delete the role bypassing the role api manager, it is still served
+        # from the cache entry of get_role.
+        PROVIDERS.role_api.driver.delete_role(role['id'])
+        self.assertEqual({role['id']: role_ref},
+                         PROVIDERS.role_api.get_roles_by_ids([role['id']]))
+        PROVIDERS.role_api.get_role.invalidate(PROVIDERS.role_api,
+                                               role['id'])
+        self.assertEqual({},
+                         PROVIDERS.role_api.get_roles_by_ids([role['id']]))
+
     @unit.skip_if_cache_disabled('role')
     def test_cache_layer_role_crud(self):
         role = unit.new_role_ref()
@@ -491,6 +491,18 @@ class CatalogTests(object):
                           PROVIDERS.catalog_api.get_endpoint,
                           uuid.uuid4().hex)
 
+    def test_get_endpoints_by_ids(self):
+        dummy_service_ref, endpoint_ref, disabled_endpoint_ref = (
+            self._create_endpoints())
+        endpoint_ids = [endpoint_ref['id'], disabled_endpoint_ref['id']]
+
+        refs = PROVIDERS.catalog_api.get_endpoints_by_ids(
+            endpoint_ids + [uuid.uuid4().hex])
+        self.assertEqual(sorted(endpoint_ids), sorted(refs))
+        for endpoint_id in endpoint_ids:
+            self.assertEqual(PROVIDERS.catalog_api.get_endpoint(endpoint_id),
+                             refs[endpoint_id])
+
     def test_delete_endpoint_returns_not_found(self):
         self.assertRaises(exception.EndpointNotFound,
                           PROVIDERS.catalog_api.delete_endpoint,
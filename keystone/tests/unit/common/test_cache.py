@@ -10,13 +10,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import time
 import uuid
 
 from dogpile.cache import api as dogpile
 from dogpile.cache.backends import memory
+import mock
 from oslo_config import fixture as config_fixture
 
 from keystone.common import cache
+from keystone.common.cache import _local_cache
 import keystone.conf
 from keystone.tests import unit
 
@@ -40,6 +43,8 @@ class TestCacheRegion(unit.BaseTestCase):
             backend='dogpile.cache.memory',
             expiration_time=None,
             replace_existing_backend=True)
+        # The region ids kept in memory belong to the replaced backend.
+        cache.core._REGION_IDS.clear()
 
         self.region_name = uuid.uuid4().hex
         self.region0 = cache.create_region('test_region')
@@ -173,6 +178,66 @@ class TestCacheRegion(unit.BaseTestCase):
         # ensure that a get doesn't have a value
         self.assertIsInstance(self.region0.get(key), dogpile.NoValue)
 
+    def test_multi_memoize_decorator_shares_entries(self):
+        memoize = cache.get_memoization_decorator('cache', region=self.region0)
+        memoize_multi = cache.get_multi_memoization_decorator(
+            'cache', region=self.region0)
+        driver = mock.Mock()
+        driver.get.side_effect = lambda id_: id_ + uuid.uuid4().hex
+        driver.get_multi.side_effect = lambda ids: dict(
+            (id_, id_ + uuid.uuid4().hex) for id_ in ids if id_ != 'missing')
+
+        class Manager(object):
+            @memoize
+            def get(self, id_):
+                return driver.get(id_)
+
+            @memoize_multi(get)
+            def get_multi(self, ids):
+                return driver.get_multi(ids)
+
+        manager = Manager()
+        cached = manager.get('a')
+        values = manager.get_multi(['a', 'b', 'missing', 'b'])
+        # Only the ids that were not cached are looked up, once.
+        driver.get_multi.assert_called_once_with(['b', 'missing'])
+        self.assertEqual(['a', 'b'], sorted(values))
+        self.assertEqual(cached, values['a'])
+        self.assertEqual(values['b'], manager.get('b'))
+        driver.get.assert_called_once_with('a')
+
+        # Invalidating the single entity drops it for both.
+        Manager.get.invalidate(manager, 'b')
+        self.assertNotEqual(values['b'], manager.get_multi(['b'])['b'])
+
+    def test_prime_memoization(self):
+        memoize = cache.get_memoization_decorator('cache', region=self.region0)
+        driver = mock.Mock()
+
+        class Manager(object):
+            @memoize
+            def get(self, id_):
+                return driver.get(id_)
+
+        manager = Manager()
+        refs = {'a': uuid.uuid4().hex, 'b': uuid.uuid4().hex}
+        with mock.patch.object(self.region0, 'set_multi',
+                               wraps=self.region0.set_multi) as set_multi:
+            cache.prime_memoization(manager, manager.get, refs, 'cache',
+                                    region=self.region0)
+        set_multi.assert_called_once_with(mock.ANY)
+        self.assertEqual(refs['a'], manager.get('a'))
+        self.assertEqual(refs['b'], manager.get('b'))
+        driver.get.assert_not_called()
+
+        # Nothing is cached when caching is disabled for the group.
+        self.config_fixture.config(group='cache', enabled=False)
+        cache.prime_memoization(manager, manager.get, {'c': 'c'}, 'cache',
+                                region=self.region0)
+        self.config_fixture.config(group='cache', enabled=True)
+        manager.get('c')
+        driver.get.assert_called_once_with('c')
+
     def test_direct_region_key_invalidation(self):
         """Invalidate by manually clearing the region key's value.
 
@@ -180,6 +245,8 @@ class TestCacheRegion(unit.BaseTestCase):
         logic, but in this case we need to. There are too many ways that
         the tests above can erroneosly pass that we need this sanity check.
         """
+        self.config_fixture.config(group='local_cache',
+                                   region_id_expiration_time=60)
         region_key = cache.RegionInvalidationManager(
             None, self.region0.name)._region_key
         key = uuid.uuid4().hex
@@ -192,6 +259,139 @@ class TestCacheRegion(unit.BaseTestCase):
         # ensure it exists
         self.assertEqual(value, self.region0.get(key))
 
-        # test invalidation
+        # test invalidation, the region id is kept in memory for a while
+        cache.CACHE_INVALIDATION_REGION.delete(region_key)
+        self.assertEqual(value, self.region0.get(key))
+        with mock.patch.object(time, 'time', return_value=time.time() + 60):
+            self.assertIsInstance(self.region0.get(key), dogpile.NoValue)
+
+    def test_region_ids_kept_in_memory(self):
+        self.config_fixture.config(group='local_cache',
+                                   region_id_expiration_time=60)
+        key = uuid.uuid4().hex
+        self.region0.set(key, uuid.uuid4().hex)
+
+        invalidation_region = cache.CACHE_INVALIDATION_REGION
+        with mock.patch.object(invalidation_region, 'get_multi',
+                               wraps=invalidation_region.get_multi) as m:
+            for _ in range(3):
+                self.region0.get(key)
+                self.region1.get(key)
+            with mock.patch.object(time, 'time',
+                                   return_value=time.time() + 60):
+                self.region0.get(key)
+                self.region1.get(key)
+        # Fetched once for all the regions when the ids expired.
+        self.assertEqual(1, m.call_count)
+
+    def test_region_ids_fetched_without_lock(self):
+        self.config_fixture.config(group='local_cache',
+                                   region_id_expiration_time=60)
+        region_ids = cache.core._REGION_IDS
+        region_key = cache.RegionInvalidationManager(
+            None, self.region0.name)._region_key
+        invalidation_region = cache.CACHE_INVALIDATION_REGION
+        get_multi = invalidation_region.get_multi
+        new_region_id = uuid.uuid4().hex
+
+        def fetch(region_keys):
+            # Other threads can use and set the ids during the fetch.
+            self.assertFalse(region_ids._lock.locked())
+            values = get_multi(region_keys)
+            region_ids.set(region_key, new_region_id)
+            return values
+
+        with mock.patch.object(invalidation_region, 'get_multi',
+                               side_effect=fetch):
+            self.region0.get(uuid.uuid4().hex)
+        # The id set during the fetch is not overwritten by the fetched one.
+        self.assertEqual(new_region_id,
+                         region_ids.get(region_key, uuid.uuid4().hex))
+
+    def test_region_ids_looked_up_without_expiration_time(self):
+        self.config_fixture.config(group='local_cache',
+                                   region_id_expiration_time=0)
+        key = uuid.uuid4().hex
+        value = uuid.uuid4().hex
+        self.region0.set(key, value)
+
+        region_key = cache.RegionInvalidationManager(
+            None, self.region0.name)._region_key
         cache.CACHE_INVALIDATION_REGION.delete(region_key)
         self.assertIsInstance(self.region0.get(key), dogpile.NoValue)
+
+
+class TestLocalCache(unit.BaseTestCase):
+
+    def setUp(self):
+        super(TestLocalCache, self).setUp()
+        self.cache_dict = {}
+        self.backend = memory.MemoryBackend({'cache_dict': self.cache_dict})
+        self.local_cache = _local_cache._LocalCacheProxy(
+            size=2, expiration_time=10)
+        self.proxied = self.local_cache.wrap(self.backend)
+
+    def _cached_value(self, payload):
+        return dogpile.CachedValue(payload, {'ct': time.time(), 'v': 1})
+
+    def test_get_served_from_process_memory(self):
+        key = uuid.uuid4().hex
+        self.proxied.set(key, self._cached_value([1]))
+
+        # Deleted behind the proxy, as another process would.
+        self.cache_dict.clear()
+        self.assertEqual([1], self.proxied.get(key).payload)
+        self.assertEqual({'hits': 1, 'misses': 0, 'entries': 1},
+                         self.local_cache.stats())
+
+    def test_returned_values_are_copies(self):
+        key = uuid.uuid4().hex
+        self.proxied.set(key, self._cached_value({'name': 'a'}))
+
+        self.proxied.get(key).payload['name'] = 'b'
+        self.assertEqual({'name': 'a'}, self.proxied.get(key).payload)
+
+    def test_entries_expire(self):
+        key = uuid.uuid4().hex
+        self.proxied.set(key, self._cached_value([1]))
+        self.cache_dict.clear()
+
+        with mock.patch.object(time, 'time', return_value=time.time() + 11):
+            self.assertIsInstance(self.proxied.get(key), dogpile.NoValue)
+        self.assertEqual(1, self.local_cache.stats()['misses'])
+
+    def test_least_recently_used_entries_dropped(self):
+        keys = [uuid.uuid4().hex for _ in range(3)]
+        self.proxied.set(keys[0], self._cached_value([0]))
+        self.proxied.set(keys[1], self._cached_value([1]))
+        # Use the first entry so that the second one is dropped.
+        self.proxied.get(keys[0])
+        self.proxied.set(keys[2], self._cached_value([2]))
+        self.cache_dict.clear()
+
+        values = self.proxied.get_multi(keys)
+        self.assertEqual([0], values[0].payload)
+        self.assertIsInstance(values[1], dogpile.NoValue)
+        self.assertEqual([2], values[2].payload)
+
+    def test_delete_drops_entry(self):
+        key = uuid.uuid4().hex
+        self.proxied.set(key, self._cached_value([1]))
+        self.proxied.delete(key)
+        self.assertIsInstance(self.proxied.get(key), dogpile.NoValue)
+
+    def test_configured_for_listed_regions(self):
+        self.config_fixture = self.useFixture(config_fixture.Config(CONF))
+        self.config_fixture.config(group='cache', enabled=True,
+                                   backend='dogpile.cache.memory')
+        self.config_fixture.config(group='local_cache',
+                                   regions=['local region'],
+                                   region_sizes={'local region': '5'})
+        cache.configure_cache(region=cache.create_region('local region'))
+        cache.configure_cache(region=cache.create_region('other region'))
+
+        local_caches = cache.core._LOCAL_CACHES
+        self.assertEqual(5, local_caches['local region'].size)
+        self.assertEqual(CONF.local_cache.expiration_time,
+                         local_caches['local region'].expiration_time)
+        self.assertNotIn('other region', cache.get_local_cache_stats())
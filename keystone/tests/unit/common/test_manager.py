@@ -0,0 +1,115 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import uuid
+
+import fixtures
+from oslo_serialization import jsonutils
+
+from keystone.common import cache
+from keystone.common import manager
+from keystone.common import provider_api
+from keystone.tests import unit
+
+
+MEMOIZE = cache.get_memoization_decorator(group='resource')
+
+
+class TestManagerInstrumentation(unit.TestCase):
+
+    def setUp(self):
+        super(TestManagerInstrumentation, self).setUp()
+        provider_api.ProviderAPIs._clear_registry_instances()
+        self.addCleanup(provider_api.ProviderAPIs._clear_registry_instances)
+        manager.INSTRUMENTATION.reset()
+        self.addCleanup(manager.INSTRUMENTATION.reset)
+
+    def _create_manager_class(self):
+
+        class TestManager(manager.Manager):
+            _provides_api = '%s_api' % uuid.uuid4().hex
+            driver_namespace = '_TEST_NOTHING'
+
+            def do_something(self, value):
+                return value
+
+            def fail(self):
+                raise ValueError()
+
+            @MEMOIZE
+            def get_something(self, value):
+                return value
+
+        return TestManager
+
+    def _fn_info(self, manager_cls, method):
+        return '%s.%s.%s' % (__name__, manager_cls.__name__, method)
+
+    def test_methods_not_wrapped_by_default(self):
+        manager_cls = self._create_manager_class()
+        do_something = manager_cls.__dict__['do_something']
+        manager_cls(driver_name=None)
+        self.assertIs(do_something, manager_cls.__dict__['do_something'])
+        self.assertEqual({}, manager.get_method_stats())
+
+    def test_instrumentation_records_calls(self):
+        self.config_fixture.config(manager_instrumentation=True)
+        manager_cls = self._create_manager_class()
+        test_manager = manager_cls(driver_name=None)
+
+        self.assertEqual(1, test_manager.do_something(1))
+        self.assertEqual(2, test_manager.do_something(2))
+        self.assertRaises(ValueError, test_manager.fail)
+
+        stats = manager.get_method_stats()
+        do_something = stats[self._fn_info(manager_cls, 'do_something')]
+        self.assertEqual(2, do_something['calls'])
+        self.assertEqual(0, do_something['errors'])
+        self.assertEqual(2, sum(do_something['latency_histogram'].values()))
+        fail = stats[self._fn_info(manager_cls, 'fail')]
+        self.assertEqual(1, fail['calls'])
+        self.assertEqual(1, fail['errors'])
+
+    @unit.skip_if_cache_disabled('resource')
+    def test_instrumentation_records_cache_hits_and_misses(self):
+        self.config_fixture.config(manager_instrumentation=True)
+        manager_cls = self._create_manager_class()
+        test_manager = manager_cls(driver_name=None)
+        value = uuid.uuid4().hex
+
+        test_manager.get_something(value)
+        test_manager.get_something(value)
+        test_manager.get_something.invalidate(test_manager, value)
+        test_manager.get_something(value)
+
+        stats = manager.get_method_stats()[
+            self._fn_info(manager_cls, 'get_something')]
+        self.assertEqual(3, stats['calls'])
+        self.assertEqual(1, stats['cache_hits'])
+        self.assertEqual(2, stats['cache_misses'])
+
+    def test_instrumentation_writes_stats_file(self):
+        stats_dir = self.useFixture(fixtures.TempDir()).path
+        self.config_fixture.config(manager_instrumentation=True,
+                                   manager_stats_dir=stats_dir)
+        manager_cls = self._create_manager_class()
+        manager_cls(driver_name=None).do_something(1)
+
+        path = os.path.join(stats_dir,
+                            'keystone-manager-stats-%d.json' % os.getpid())
+        with open(path) as f:
+            stats = jsonutils.loads(f.read())
+        self.assertEqual(os.getpid(), stats['pid'])
+        self.assertEqual(
+            1, stats['methods'][self._fn_info(manager_cls,
+                                              'do_something')]['calls'])
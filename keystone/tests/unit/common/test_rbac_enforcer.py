@@ -50,6 +50,12 @@ class TestRBACEnforcer(unit.TestCase):
         enforcer._reset()
         self.assertIsNotNone(enforcer._enforcer)
 
+    def test_prepare_enforcer(self):
+        enforcer = rbac_enforcer.enforcer.RBACEnforcer()
+        enforcer._reset()
+        rbac_enforcer.enforcer.RBACEnforcer.prepare_enforcer()
+        self.assertTrue(enforcer._enforcer.rules)
+
 
 class _TestRBACEnforcerBase(rest.RestfulTestCase):
 
@@ -660,3 +666,51 @@ class TestRBACEnforcerRest(_TestRBACEnforcerBase):
                 getattr(flask.g,
                         rbac_enforcer.enforcer._ENFORCEMENT_CHECK_ATTR),
                 True)
+
+    def _get_argument_with_token(self, c):
+        r = c.post('/v3/auth/tokens', json=self._auth_json(),
+                   expected_status_code=201)
+        token_id = r.headers.get('X-Subject-Token')
+        c.get('%s/argument/%s' % (
+            self.restful_api_url_prefix, uuid.uuid4().hex),
+            headers={'X-Auth-Token': token_id})
+
+    def test_enforce_call_caches_decisions(self):
+        self.config_fixture.config(group='policy', enforcement_cache_size=10)
+        oslo_enforcer = self.enforcer._enforcer
+        enforce_mock = self.useFixture(fixtures.MockPatchObject(
+            oslo_enforcer, 'enforce', wraps=oslo_enforcer.enforce)).mock
+        with self.test_client() as c:
+            self._get_argument_with_token(c)
+            self.enforcer.enforce_call(action='example:allowed')
+            self.enforcer.enforce_call(action='example:allowed')
+            self.assertEqual(1, enforce_mock.call_count)
+
+            # Denials are cached as well and still raise.
+            for _ in range(2):
+                self.assertRaises(exception.ForbiddenAction,
+                                  self.enforcer.enforce_call,
+                                  action='example:denied')
+            self.assertEqual(2, enforce_mock.call_count)
+
+    def test_enforce_call_decisions_not_cached_by_default(self):
+        oslo_enforcer = self.enforcer._enforcer
+        enforce_mock = self.useFixture(fixtures.MockPatchObject(
+            oslo_enforcer, 'enforce', wraps=oslo_enforcer.enforce)).mock
+        with self.test_client() as c:
+            self._get_argument_with_token(c)
+            self.enforcer.enforce_call(action='example:allowed')
+            self.enforcer.enforce_call(action='example:allowed')
+            self.assertEqual(2, enforce_mock.call_count)
+
+    def test_cached_decisions_dropped_when_rules_change(self):
+        self.config_fixture.config(group='policy', enforcement_cache_size=10)
+        oslo_enforcer = self.enforcer._enforcer
+        enforce_mock = self.useFixture(fixtures.MockPatchObject(
+            oslo_enforcer, 'enforce', wraps=oslo_enforcer.enforce)).mock
+        with self.test_client() as c:
+            self._get_argument_with_token(c)
+            self.enforcer.enforce_call(action='example:allowed')
+            oslo_enforcer.set_rules(oslo_enforcer.rules)
+            self.enforcer.enforce_call(action='example:allowed')
+            self.assertEqual(2, enforce_mock.call_count)
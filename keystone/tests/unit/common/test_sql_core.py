@@ -10,7 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-
+import fixtures
+import sqlalchemy
 from sqlalchemy.ext import declarative
 
 from keystone.common import sql
@@ -52,3 +53,46 @@ class TestModelDictMixin(unit.BaseTestCase):
         # NOTE(notmorgan): This is currently explicitly harmless as this does
         # not actually use SQL-Alchemy.
         self.assertEqual(expected, m.to_dict())
+
+
+class TestStatementStats(unit.TestCase):
+
+    def setUp(self):
+        super(TestStatementStats, self).setUp()
+        self.engine = sqlalchemy.create_engine('sqlite://')
+        self.addCleanup(self.engine.dispose)
+
+    def test_statements_counted(self):
+        with sql.statement_stats() as stats:
+            self.engine.execute('SELECT 1')
+            self.engine.execute('SELECT 2')
+        self.engine.execute('SELECT 3')
+        self.assertEqual(2, stats.statements)
+        self.assertGreaterEqual(stats.time, 0)
+        self.assertIsNone(stats.recorded)
+
+    def test_nested_stats(self):
+        with sql.statement_stats(record_statements=True) as outer:
+            self.engine.execute('SELECT 1')
+            with sql.statement_stats(record_statements=True) as inner:
+                self.engine.execute('SELECT 2')
+        self.assertEqual(['SELECT 1', 'SELECT 2'], outer.recorded)
+        self.assertEqual(['SELECT 2'], inner.recorded)
+
+    def test_failed_statement_counted(self):
+        with sql.statement_stats() as stats:
+            self.assertRaises(sqlalchemy.exc.OperationalError,
+                              self.engine.execute, 'SELECT * FROM missing')
+        self.assertEqual(1, stats.statements)
+
+    def test_slow_statement_logged(self):
+        log_fix = self.useFixture(fixtures.FakeLogger())
+        self.config_fixture.config(sql_slow_statement_time=0.000001)
+        with sql.statement_stats():
+            self.engine.execute('SELECT 42')
+        self.assertIn('SELECT 42', log_fix.output)
+
+        self.config_fixture.config(sql_slow_statement_time=0)
+        with sql.statement_stats():
+            self.engine.execute('SELECT 43')
+        self.assertNotIn('SELECT 43', log_fix.output)
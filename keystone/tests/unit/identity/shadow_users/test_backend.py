@@ -13,6 +13,8 @@
 import datetime
 import uuid
 
+import mock
+
 from keystone.common import provider_api
 from keystone.common import sql
 import keystone.conf
@@ -128,6 +130,24 @@ class ShadowUsersBackendTests(object):
         user_ref = self._get_user_ref(user_auth['id'])
         self.assertGreaterEqual(now, user_ref.last_active_at)
 
+    def test_set_last_active_at_once_per_day(self):
+        self.config_fixture.config(group='security_compliance',
+                                   disable_user_account_days_inactive=90)
+        user = self._create_user(uuid.uuid4().hex)
+        yesterday = datetime.datetime.utcnow().date() - datetime.timedelta(1)
+        with sql.session_for_write() as session:
+            user_ref = session.query(model.User).get(user['id'])
+            user_ref.last_active_at = yesterday
+
+        PROVIDERS.shadow_users_api.set_last_active_at(user['id'])
+        user_ref = self._get_user_ref(user['id'])
+        self.assertGreater(user_ref.last_active_at, yesterday)
+
+        # the user is already recorded as active today, nothing is written
+        with mock.patch.object(sql, 'session_for_write') as session_mock:
+            PROVIDERS.shadow_users_api.set_last_active_at(user['id'])
+        session_mock.assert_not_called()
+
     def test_set_last_active_at_when_config_setting_is_none(self):
         self.config_fixture.config(group='security_compliance',
                                    disable_user_account_days_inactive=None)
@@ -677,6 +677,28 @@ class LockingOutUserTests(test_backend_sql.SqlTests):
                               user_id=self.user['id'],
                               password=uuid.uuid4().hex)
 
+    def test_failed_auth_count_recorded_and_reset(self):
+        self._fail_auth_repeatedly(self.user['id'])
+        with sql.session_for_read() as session:
+            local_user = session.query(model.LocalUser).filter_by(
+                user_id=self.user['id']).one()
+            self.assertEqual(
+                CONF.security_compliance.lockout_failure_attempts,
+                local_user.failed_auth_count)
+            self.assertIsNotNone(local_user.failed_auth_at)
+
+        # an unlocked user authenticating successfully resets the count
+        PROVIDERS.identity_api.driver._reset_failed_auth(self.user['id'])
+        PROVIDERS.identity_api.driver._record_failed_auth(self.user['id'])
+        PROVIDERS.identity_api.authenticate(
+            self.make_request(), user_id=self.user['id'],
+            password=self.password)
+        with sql.session_for_read() as session:
+            local_user = session.query(model.LocalUser).filter_by(
+                user_id=self.user['id']).one()
+            self.assertEqual(0, local_user.failed_auth_count)
+            self.assertIsNone(local_user.failed_auth_at)
+
     def _fail_auth_repeatedly(self, user_id):
         wrong_password = uuid.uuid4().hex
         for _ in range(CONF.security_compliance.lockout_failure_attempts):
@@ -914,6 +914,18 @@ class IdentityTests(object):
                           uuid.uuid4().hex,
                           CONF.identity.default_domain_id)
 
+    def test_get_groups_by_ids(self):
+        groups = [PROVIDERS.identity_api.create_group(unit.new_group_ref(
+            domain_id=CONF.identity.default_domain_id)) for _ in range(3)]
+        group_ids = [group['id'] for group in groups]
+
+        refs = PROVIDERS.identity_api.get_groups_by_ids(
+            group_ids + [uuid.uuid4().hex])
+        self.assertEqual(sorted(group_ids), sorted(refs))
+        for group_id in group_ids:
+            self.assertEqual(PROVIDERS.identity_api.get_group(group_id),
+                             refs[group_id])
+
     @unit.skip_if_cache_disabled('identity')
     def test_cache_layer_group_crud(self):
         group = unit.new_group_ref(domain_id=CONF.identity.default_domain_id)
@@ -18,12 +18,14 @@ import uuid
 
 import mock
 from oslo_config import fixture as config_fixture
+from oslo_serialization import msgpackutils
 
 from keystone.common import provider_api
 import keystone.conf
 from keystone import exception
 from keystone import identity
 from keystone.tests import unit
+from keystone.tests.unit import default_fixtures
 from keystone.tests.unit.ksfixtures import database
 
 
@@ -178,3 +180,63 @@ class TestDatabaseDomainConfigs(unit.TestCase):
         self.assertEqual(CONF.ldap.suffix, res.ldap.suffix)
         self.assertEqual(CONF.ldap.use_tls, res.ldap.use_tls)
         self.assertEqual(CONF.ldap.query_scope, res.ldap.query_scope)
+
+
+class TestUserAuthOptions(unit.TestCase):
+
+    def setUp(self):
+        super(TestUserAuthOptions, self).setUp()
+        self.useFixture(database.Database())
+        self.load_backends()
+        self.load_fixtures(default_fixtures)
+
+    def test_compile_mfa_rules_drops_invalid_rules(self):
+        rules = [['password', 'totp', 'password'], [], 'password',
+                 ['token', 1], ['totp']]
+        self.assertEqual(
+            (frozenset(['password', 'totp']), frozenset(['totp'])),
+            identity.compile_mfa_rules(rules, uuid.uuid4().hex))
+
+    def test_compile_mfa_rules_with_corrupt_rules(self):
+        self.assertEqual(
+            (), identity.compile_mfa_rules('password', uuid.uuid4().hex))
+
+    def test_user_auth_options_survive_cache_serialization(self):
+        auth_options = identity.UserAuthOptions(
+            mfa_rules=[['password', 'totp']], lock_password=True)
+        self.assertEqual(
+            auth_options,
+            msgpackutils.loads(msgpackutils.dumps(auth_options)))
+        self.assertRaises(AttributeError, setattr, auth_options,
+                          'mfa_enabled', False)
+
+    def test_get_user_auth_options_defaults(self):
+        user = unit.create_user(PROVIDERS.identity_api,
+                                CONF.identity.default_domain_id)
+        auth_options = PROVIDERS.identity_api.get_user_auth_options(
+            user['id'])
+        self.assertEqual((), auth_options.mfa_rules)
+        self.assertTrue(auth_options.mfa_enabled)
+        self.assertFalse(auth_options.ignore_lockout_failure_attempts)
+        self.assertFalse(auth_options.ignore_password_expiry)
+
+    def test_get_user_auth_options_invalidated_on_user_update(self):
+        user = unit.create_user(PROVIDERS.identity_api,
+                                CONF.identity.default_domain_id)
+        PROVIDERS.identity_api.get_user_auth_options(user['id'])
+
+        user.pop('password')
+        user['options'] = {'multi_factor_auth_rules': [['password', 'totp']],
+                           'ignore_lockout_failure_attempts': True}
+        PROVIDERS.identity_api.update_user(user['id'], user)
+
+        auth_options = PROVIDERS.identity_api.get_user_auth_options(
+            user['id'])
+        self.assertEqual((frozenset(['password', 'totp']),),
+                         auth_options.mfa_rules)
+        self.assertTrue(auth_options.ignore_lockout_failure_attempts)
+
+        PROVIDERS.identity_api.delete_user(user['id'])
+        self.assertRaises(exception.UserNotFound,
+                          PROVIDERS.identity_api.get_user_auth_options,
+                          user['id'])
@@ -16,3 +16,4 @@ from keystone.tests.unit.ksfixtures.backendloader import BackendLoader  # noqa
 from keystone.tests.unit.ksfixtures.cache import Cache  # noqa
 from keystone.tests.unit.ksfixtures.key_repository import KeyRepository  # noqa
 from keystone.tests.unit.ksfixtures.policy import Policy  # noqa
+from keystone.tests.unit.ksfixtures.statement_budget import StatementBudget  # noqa
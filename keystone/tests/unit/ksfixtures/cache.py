@@ -15,11 +15,14 @@ import fixtures
 
 from keystone import catalog
 from keystone.common import cache
+from keystone import endpoint_policy
 from keystone import revoke
+from keystone import trust
 
 
 CACHE_REGIONS = (cache.CACHE_REGION, catalog.COMPUTED_CATALOG_REGION,
-                 revoke.REVOKE_REGION)
+                 revoke.REVOKE_REGION, endpoint_policy.ENDPOINT_POLICY_REGION,
+                 trust.TRUST_CHAIN_REGION)
 
 
 class Cache(fixtures.Fixture):
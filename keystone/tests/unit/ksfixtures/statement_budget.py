@@ -0,0 +1,47 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import fixtures
+
+from keystone.common import sql
+
+
+class StatementBudget(fixtures.Fixture):
+    """Fail if more SQL statements than the budget are issued.
+
+    Only the statements issued while the fixture is in use count, so use it
+    as a context manager around the calls being measured::
+
+        with ksfixtures.StatementBudget(5):
+            self.get('/auth/projects')
+
+    """
+
+    def __init__(self, budget):
+        super(StatementBudget, self).__init__()
+        self.budget = budget
+        self.stats = None
+
+    def setUp(self):
+        super(StatementBudget, self).setUp()
+        collecting = sql.statement_stats(record_statements=True)
+        self.stats = collecting.__enter__()
+        # Cleanups run in reverse order, stop counting before checking.
+        self.addCleanup(self._check_budget)
+        self.addCleanup(collecting.__exit__, None, None, None)
+
+    def _check_budget(self):
+        if self.stats.statements > self.budget:
+            raise AssertionError(
+                '%d SQL statements issued, the budget is %d:\n%s' % (
+                    self.stats.statements, self.budget,
+                    '\n'.join(self.stats.recorded)))
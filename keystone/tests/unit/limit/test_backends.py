@@ -635,6 +635,39 @@ class LimitTests(object):
         res = PROVIDERS.unified_limit_api.list_limits(hints)
         self.assertEqual(1, len(res))
 
+    def test_list_effective_limits(self):
+        limit_1 = unit.new_limit_ref(
+            project_id=self.tenant_bar['id'],
+            service_id=self.service_one['id'],
+            region_id=self.region_one['id'],
+            resource_name='volume', resource_limit=5, id=uuid.uuid4().hex)
+        limit_2 = unit.new_limit_ref(
+            project_id=self.tenant_baz['id'],
+            service_id=self.service_one['id'],
+            region_id=self.region_two['id'],
+            resource_name='snapshot', resource_limit=5, id=uuid.uuid4().hex)
+        PROVIDERS.unified_limit_api.create_limits([limit_1, limit_2])
+
+        res = PROVIDERS.unified_limit_api.list_effective_limits(
+            self.tenant_bar['id'])
+        self.assertEqual(3, len(res))
+        limits = dict((ref['resource_name'], ref) for ref in res)
+        self.assertEqual(limit_1['id'], limits['volume']['limit_id'])
+        self.assertEqual(5, limits['volume']['resource_limit'])
+        # the limit of the other project doesn't apply, the registered
+        # default is used instead.
+        for resource_name in ['snapshot', 'backup']:
+            self.assertIsNone(limits[resource_name]['limit_id'])
+            self.assertEqual(10, limits[resource_name]['resource_limit'])
+
+        hints = driver_hints.Hints()
+        hints.add_filter('resource_name', 'snapshot')
+        res = PROVIDERS.unified_limit_api.list_effective_limits(
+            self.tenant_baz['id'], hints)
+        self.assertEqual(1, len(res))
+        self.assertEqual(limit_2['id'], res[0]['limit_id'])
+        self.assertEqual(self.tenant_baz['id'], res[0]['project_id'])
+
     def test_get_limit(self):
         # create two limits
         limit_1 = unit.new_limit_ref(
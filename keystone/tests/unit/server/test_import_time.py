@@ -0,0 +1,24 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from keystone.tests import unit
+from keystone.tests.benchmark import import_time
+
+
+class TestApplicationImport(unit.BaseTestCase):
+
+    def test_optional_subsystems_not_imported(self):
+        # OAuth1 is imported by its auth plugin, which is enabled by default.
+        result = import_time.run(runs=1)
+        self.assertNotIn('saml2', result['optional_modules'])
+        self.assertNotIn('ldap', result['optional_modules'])
+        self.assertNotIn('ldappool', result['optional_modules'])
@@ -0,0 +1,100 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import uuid
+
+import fixtures
+import mock
+
+from keystone.common import provider_api
+from keystone.server import warmup
+from keystone.tests import unit
+from keystone.tests.unit import ksfixtures
+from keystone.tests.unit.ksfixtures import database
+
+PROVIDERS = provider_api.ProviderAPIs
+
+
+class TestWarmUp(unit.TestCase):
+
+    def setUp(self):
+        super(TestWarmUp, self).setUp()
+        self.useFixture(database.Database())
+        self.useFixture(
+            ksfixtures.KeyRepository(
+                self.config_fixture,
+                'fernet_tokens',
+                unit.CONF.fernet_tokens.max_active_keys
+            )
+        )
+        self.load_backends()
+
+    def test_warm_up_times_every_step(self):
+        timer = warmup.StartupTimer()
+        warmup.warm_up(timer)
+        self.assertEqual(
+            ['domain_drivers', 'fernet_keys_check', 'cache_connections',
+             'roles', 'domains', 'catalog', 'service_providers'],
+            list(timer.timings))
+        self.assertEqual(timer.timings, timer.report())
+
+    @unit.skip_if_cache_disabled('role')
+    def test_warm_up_primes_caches(self):
+        role = unit.new_role_ref()
+        PROVIDERS.role_api.create_role(role['id'], role)
+        PROVIDERS.role_api.get_role.invalidate(PROVIDERS.role_api,
+                                               role['id'])
+        domain = unit.new_domain_ref()
+        domain = PROVIDERS.resource_api.create_domain(domain['id'], domain)
+        PROVIDERS.resource_api.get_domain_by_name.invalidate(
+            PROVIDERS.resource_api, domain['name'])
+
+        # The caches are primed from the list calls, the drivers are not
+        # asked for each entity.
+        with mock.patch.object(PROVIDERS.role_api.driver, 'get_role',
+                               side_effect=AssertionError) as m:
+            warmup.warm_up(warmup.StartupTimer())
+            self.assertEqual(role, PROVIDERS.role_api.get_role(role['id']))
+        m.assert_not_called()
+
+        with mock.patch.object(PROVIDERS.resource_api.driver,
+                               'get_project_by_name') as m:
+            self.assertEqual(domain,
+                             PROVIDERS.resource_api.get_domain_by_name(
+                                 domain['name']))
+        m.assert_not_called()
+
+    def test_fernet_keys_check_fails_without_keys(self):
+        self.config_fixture.config(group='fernet_tokens',
+                                   key_repository=self.useFixture(
+                                       fixtures.TempDir()).path)
+        with mock.patch.object(warmup.LOG, 'warning') as m:
+            warmup.warm_up(warmup.StartupTimer())
+        self.assertIn('fernet_keys_check',
+                      [c[0][1]['step'] for c in m.call_args_list])
+
+    def test_failing_step_does_not_stop_warm_up(self):
+        self.useFixture(fixtures.MockPatchObject(
+            PROVIDERS.role_api, 'list_roles',
+            side_effect=Exception(uuid.uuid4().hex)))
+        timer = warmup.StartupTimer()
+        warmup.warm_up(timer)
+        self.assertIn('roles', timer.timings)
+        self.assertIn('service_providers', timer.timings)
+
+    def test_caches_not_primed_without_caching(self):
+        self.config_fixture.config(group='cache', enabled=False)
+        timer = warmup.StartupTimer()
+        warmup.warm_up(timer)
+        self.assertEqual(
+            ['domain_drivers', 'fernet_keys_check', 'cache_connections'],
+            list(timer.timings))
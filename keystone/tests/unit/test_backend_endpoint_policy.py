@@ -213,6 +213,39 @@ class PolicyAssociationTests(object):
         self._assert_correct_endpoints(
             self.policy[0], [self.endpoint[0], self.endpoint[5]])
 
+    def test_policy_for_endpoint_follows_catalog_changes(self):
+        PROVIDERS.endpoint_policy_api.create_policy_association(
+            self.policy[1]['id'], service_id=self.service[0]['id'],
+            region_id=self.region[1]['id'])
+        PROVIDERS.endpoint_policy_api.create_policy_association(
+            self.policy[0]['id'], service_id=self.service[0]['id'])
+        self._assert_correct_policy(self.endpoint[5], self.policy[1])
+        self._assert_correct_policy(self.endpoint[0], self.policy[0])
+
+        # A new endpoint below region 1 is resolved to the region's policy.
+        endpoint = unit.new_endpoint_ref(interface='test',
+                                         region_id=self.region[2]['id'],
+                                         service_id=self.service[0]['id'],
+                                         url='/url')
+        PROVIDERS.catalog_api.create_endpoint(endpoint['id'], endpoint)
+        self._assert_correct_policy(endpoint, self.policy[1])
+        self._assert_correct_endpoints(
+            self.policy[1], [self.endpoint[5], endpoint])
+
+        # Moving region 2 out of the tree leaves only the service policy.
+        PROVIDERS.catalog_api.update_region(self.region[2]['id'],
+                                            {'parent_region_id': None})
+        self._assert_correct_policy(endpoint, self.policy[0])
+        self._assert_correct_policy(self.endpoint[5], self.policy[0])
+
+        # An explicit association takes precedence.
+        PROVIDERS.endpoint_policy_api.create_policy_association(
+            self.policy[2]['id'], endpoint_id=endpoint['id'])
+        self._assert_correct_policy(endpoint, self.policy[2])
+        PROVIDERS.endpoint_policy_api.delete_association_by_endpoint(
+            endpoint['id'])
+        self._assert_correct_policy(endpoint, self.policy[0])
+
     def test_delete_association_by_entity(self):
         PROVIDERS.endpoint_policy_api.create_policy_association(
             self.policy[0]['id'], endpoint_id=self.endpoint[0]['id'])
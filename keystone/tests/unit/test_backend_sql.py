@@ -12,6 +12,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 import uuid
 
 import mock
@@ -29,6 +30,7 @@ import keystone.conf
 from keystone.credential.providers import fernet as credential_provider
 from keystone import exception
 from keystone.identity.backends import sql_model as identity_sql
+from keystone.limit.backends import sql as limit_sql
 from keystone.resource.backends import base as resource
 from keystone.tests import unit
 from keystone.tests.unit.assignment import test_backends as assignment_tests
@@ -762,6 +764,42 @@ class SqlTrust(SqlTests, trust_tests.TrustTests):
             self.assertEqual(trust_ref._expires_at, trust_ref.expires_at_int)
             self.assertEqual(trust_ref.expires_at, trust_ref.expires_at_int)
 
+    def _count_trust_roles(self, trust_id):
+        with sql.session_for_read() as session:
+            return (session.query(trust_sql.TrustRole).
+                    filter_by(trust_id=trust_id).count())
+
+    def test_flush_expired_trusts_removes_trust_roles(self):
+        trust_ref = unit.new_trust_ref(
+            self.user_foo['id'], self.user_two['id'],
+            project_id=self.tenant_bar['id'])
+        trust_ref['expires_at'] = (
+            datetime.datetime.utcnow() - datetime.timedelta(minutes=1))
+        PROVIDERS.trust_api.create_trust(trust_ref['id'], trust_ref,
+                                         [{'id': 'member'}, {'id': 'other'}])
+        self.assertEqual(2, self._count_trust_roles(trust_ref['id']))
+
+        self.assertEqual(1, PROVIDERS.trust_api.flush_expired_trusts())
+        self.assertEqual(0, self._count_trust_roles(trust_ref['id']))
+
+    def test_flush_orphaned_trust_roles(self):
+        trust_id = uuid.uuid4().hex
+        self.create_sample_trust(trust_id)
+        orphan_trust_id = uuid.uuid4().hex
+        with sql.session_for_write() as session:
+            for role_id in ('member', 'other'):
+                session.add(trust_sql.TrustRole(trust_id=orphan_trust_id,
+                                                role_id=role_id))
+
+        self.assertEqual(
+            2, PROVIDERS.trust_api.flush_orphaned_trust_roles(dry_run=True))
+        self.assertEqual(2, self._count_trust_roles(orphan_trust_id))
+
+        self.assertEqual(
+            2, PROVIDERS.trust_api.flush_orphaned_trust_roles(batch_size=1))
+        self.assertEqual(0, self._count_trust_roles(orphan_trust_id))
+        self.assertEqual(3, self._count_trust_roles(trust_id))
+
 
 class SqlCatalog(SqlTests, catalog_tests.CatalogTests):
 
@@ -1009,6 +1047,37 @@ class SqlFilterTests(SqlTests, identity_tests.FilterTests):
         groups = PROVIDERS.identity_api.list_groups()
         self.assertGreater(len(groups), 0)
 
+    def test_inexact_filter_wildcards_match_literally(self):
+        names = ['ab_cd', 'abxcd', 'ab%cd', 'ab/cd']
+        for name in names:
+            PROVIDERS.identity_api.create_group(unit.new_group_ref(
+                domain_id=CONF.identity.default_domain_id, name=name))
+
+        for name in names:
+            hints = driver_hints.Hints()
+            hints.add_filter('name', name, comparator='contains')
+            groups = PROVIDERS.identity_api.list_groups(hints=hints)
+            self.assertEqual([name], [g['name'] for g in groups])
+
+    def test_case_sensitive_inexact_filter_narrows_query(self):
+        for name in ('Silly Walks', 'silly walks', 'Funny Walks'):
+            PROVIDERS.identity_api.create_group(unit.new_group_ref(
+                domain_id=CONF.identity.default_domain_id, name=name))
+
+        hints = driver_hints.Hints()
+        hints.add_filter('name', 'Silly', comparator='startswith',
+                         case_sensitive=True)
+        groups = PROVIDERS.identity_api.driver.list_groups(hints)
+        # SQLite compares case insensitively, the filter is left for the
+        # caller to finish.
+        self.assertEqual(['Silly Walks', 'silly walks'],
+                         sorted(g['name'] for g in groups))
+        self.assertEqual(1, len(hints.filters))
+
+        match = driver_hints.filter_predicate(hints.filters)
+        self.assertEqual(['Silly Walks'],
+                         [g['name'] for g in groups if match(g)])
+
 
 class SqlLimitTests(SqlTests, identity_tests.LimitTests):
     def setUp(self):
@@ -1221,3 +1290,39 @@ class SqlLimit(SqlTests, limit_tests.LimitTests):
             resource_name='backup', default_limit=10, id=uuid.uuid4().hex)
         PROVIDERS.unified_limit_api.create_registered_limits(
             [registered_limit_1, registered_limit_2, registered_limit_3])
+        self.registered_limit_1 = registered_limit_1
+
+    def _create_legacy_limit(self, registered_limit, project_id):
+        # Limits created before the registered_limit_id column existed only
+        # carry service_id, region_id and resource_name.
+        limit = limit_sql.LimitModel(
+            id=uuid.uuid4().hex, project_id=project_id, resource_limit=3,
+            registered_limit_id=None,
+            _service_id=registered_limit['service_id'],
+            _region_id=registered_limit['region_id'],
+            _resource_name=registered_limit['resource_name'])
+        with sql.session_for_write() as session:
+            session.add(limit)
+        return limit.id
+
+    def test_list_limits_includes_legacy_limits(self):
+        limit_id = self._create_legacy_limit(self.registered_limit_1,
+                                             self.tenant_bar['id'])
+
+        hints = driver_hints.Hints()
+        hints.add_filter('resource_name', 'volume')
+        hints.add_filter('region_id', self.region_one['id'])
+        limits = PROVIDERS.unified_limit_api.list_limits(hints)
+        self.assertEqual([limit_id], [limit['id'] for limit in limits])
+        self.assertEqual(self.service_one['id'], limits[0]['service_id'])
+
+    def test_list_effective_limits_resolves_legacy_limits(self):
+        limit_id = self._create_legacy_limit(self.registered_limit_1,
+                                             self.tenant_bar['id'])
+
+        limits = PROVIDERS.unified_limit_api.list_effective_limits(
+            self.tenant_bar['id'])
+        limits = dict((ref['resource_name'], ref) for ref in limits)
+        self.assertEqual(limit_id, limits['volume']['limit_id'])
+        self.assertEqual(3, limits['volume']['resource_limit'])
+        self.assertIsNone(limits['backup']['limit_id'])
@@ -299,6 +299,9 @@ class TestTemplatedCatalog(unit.TestCase, catalog_tests.CatalogTests):
         self.skip_test_overrides(
             "Templated backend doesn't use IDs for endpoints.")
 
+    def test_get_endpoints_by_ids(self):
+        self.skip_test_overrides(BROKEN_WRITE_FUNCTIONALITY_MSG)
+
     def test_delete_endpoint_returns_not_found(self):
         self.skip_test_overrides(BROKEN_WRITE_FUNCTIONALITY_MSG)
 
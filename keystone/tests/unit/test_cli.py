@@ -1648,6 +1648,8 @@ class TestTrustFlush(unit.SQLDriverOverrides, unit.BaseTestCase):
             self.project_id = parent.command_project_id
             self.trustor_user_id = parent.command_trustor_user_id
             self.trustee_user_id = parent.command_trustee_user_id
+            self.batch_size = getattr(parent, 'command_batch_size', None)
+            self.dry_run = getattr(parent, 'command_dry_run', False)
 
     def setUp(self):
         # Set up preset cli options and a parser
@@ -1682,3 +1684,92 @@ class TestTrustFlush(unit.SQLDriverOverrides, unit.BaseTestCase):
             side_effect=fake_load_backends))
         trust = cli.TrustFlush()
         trust.main()
+
+    def test_trust_flush_dry_run(self):
+        self.command_project_id = None
+        self.command_trustor_user_id = None
+        self.command_trustee_user_id = None
+        self.command_batch_size = 10
+        self.command_dry_run = True
+        self.useFixture(fixtures.MockPatchObject(
+            CONF, 'command', self.FakeConfCommand(self)))
+
+        trust_manager = mock.Mock()
+        trust_manager.flush_expired_trusts.return_value = 3
+        trust_manager.flush_orphaned_trust_roles.return_value = 5
+        self.useFixture(fixtures.MockPatch(
+            'keystone.server.backends.load_backends',
+            return_value={'trust_api': trust_manager}))
+        cli.TrustFlush.main()
+        trust_manager.flush_expired_trusts.assert_called_once_with(
+            project_id=None, trustor_user_id=None, trustee_user_id=None,
+            batch_size=10, dry_run=True)
+        trust_manager.flush_orphaned_trust_roles.assert_called_once_with(
+            batch_size=10, dry_run=True)
+
+    def test_trust_flush_rejects_invalid_batch_size(self):
+        self.command_project_id = None
+        self.command_trustor_user_id = None
+        self.command_trustee_user_id = None
+        self.command_batch_size = 0
+        self.useFixture(fixtures.MockPatchObject(
+            CONF, 'command', self.FakeConfCommand(self)))
+        self.useFixture(fixtures.MockPatch(
+            'keystone.server.backends.load_backends',
+            return_value={'trust_api': mock.Mock()}))
+        self.assertRaises(SystemExit, cli.TrustFlush.main)
+
+
+class TestRevocationPrune(unit.SQLDriverOverrides, unit.BaseTestCase):
+
+    class FakeConfCommand(object):
+        def __init__(self, parent):
+            self.extension = False
+            self.batch_size = getattr(parent, 'command_batch_size', None)
+            self.dry_run = getattr(parent, 'command_dry_run', False)
+
+    def setUp(self):
+        super(TestRevocationPrune, self).setUp()
+        self.useFixture(database.Database())
+        self.config_fixture = self.useFixture(oslo_config.fixture.Config(CONF))
+        self.config_fixture.register_cli_opt(cli.command_opt)
+
+    def config_files(self):
+        config_files = super(TestRevocationPrune, self).config_files()
+        config_files.append(unit.dirs.tests_conf('backend_sql.conf'))
+        return config_files
+
+    def test_revocation_prune(self):
+        self.useFixture(fixtures.MockPatchObject(
+            CONF, 'command', self.FakeConfCommand(self)))
+        revoke_manager = mock.Mock()
+        revoke_manager.prune_expired_events.return_value = 3
+        self.useFixture(fixtures.MockPatch(
+            'keystone.server.backends.load_backends',
+            return_value={'revoke_api': revoke_manager}))
+        cli.RevocationPrune.main()
+        revoke_manager.prune_expired_events.assert_called_once_with(
+            batch_size=None, dry_run=False)
+
+    def test_revocation_prune_dry_run(self):
+        self.command_batch_size = 10
+        self.command_dry_run = True
+        self.useFixture(fixtures.MockPatchObject(
+            CONF, 'command', self.FakeConfCommand(self)))
+        revoke_manager = mock.Mock()
+        revoke_manager.prune_expired_events.return_value = 3
+        self.useFixture(fixtures.MockPatch(
+            'keystone.server.backends.load_backends',
+            return_value={'revoke_api': revoke_manager}))
+        cli.RevocationPrune.main()
+        revoke_manager.prune_expired_events.assert_called_once_with(
+            batch_size=10, dry_run=True)
+
+    def test_revocation_prune_rejects_invalid_batch_size(self):
+        self.command_batch_size = 0
+        self.useFixture(fixtures.MockPatchObject(
+            CONF, 'command', self.FakeConfCommand(self)))
+        self.useFixture(fixtures.MockPatch(
+            'keystone.server.backends.load_backends',
+            return_value={'revoke_api': mock.Mock()}))
+        self.assertRaises(SystemExit, cli.RevocationPrune.main)
@@ -58,3 +58,61 @@ class ListHintsTests(test.TestCase):
         hints.set_limit(10, truncated=True)
         self.assertEqual(10, hints.limit['limit'])
         self.assertTrue(hints.limit['truncated'])
+
+
+class FilterPredicateTests(test.TestCase):
+
+    def _filter(self, refs, *filters):
+        hints = driver_hints.Hints()
+        for args, kwargs in filters:
+            hints.add_filter(*args, **kwargs)
+        match = driver_hints.filter_predicate(hints.filters)
+        return [ref['id'] for ref in refs if match(ref)]
+
+    def test_no_filters_match_everything(self):
+        refs = [{'id': 1}, {'id': 2}]
+        self.assertEqual([1, 2], self._filter(refs))
+
+    def test_equals(self):
+        refs = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}, {'id': 3}]
+        self.assertEqual([2], self._filter(refs, (('name', 'b'), {})))
+
+    def test_equals_boolean(self):
+        refs = [{'id': 1, 'enabled': True}, {'id': 2, 'enabled': False}]
+        self.assertEqual([1], self._filter(refs, (('enabled', 'true'), {})))
+        self.assertEqual([2], self._filter(refs, (('enabled', '0'), {})))
+        # The existence of the filter with no value implies True.
+        self.assertEqual([1], self._filter(refs, (('enabled', ''), {})))
+
+    def test_equals_nested_attribute(self):
+        refs = [{'id': 1, 'options': {'color': 'red'}},
+                {'id': 2, 'options': {'color': 'blue'}},
+                {'id': 3, 'options': 'red'}]
+        self.assertEqual(
+            [1], self._filter(refs, (('options.color', 'red'), {})))
+        # Nested dicts themselves never match.
+        self.assertEqual(
+            [], self._filter(refs, (('options', {'color': 'red'}), {})))
+
+    def test_inexact(self):
+        refs = [{'id': 1, 'name': 'The Ministry'},
+                {'id': 2, 'name': 'the ministry of silly walks'},
+                {'id': 3}]
+        self.assertEqual([1, 2], self._filter(
+            refs, (('name', 'MINISTRY'), {'comparator': 'contains'})))
+        self.assertEqual([1], self._filter(
+            refs, (('name', 'Th'), {'comparator': 'startswith',
+                                    'case_sensitive': True})))
+        self.assertEqual([2], self._filter(
+            refs, (('name', 'WALKS'), {'comparator': 'endswith'})))
+        # Unsupported comparators only require the attribute.
+        self.assertEqual([1, 2], self._filter(
+            refs, (('name', 'x'), {'comparator': 'regex'})))
+
+    def test_all_filters_must_match(self):
+        refs = [{'id': 1, 'name': 'abc', 'enabled': True},
+                {'id': 2, 'name': 'abd', 'enabled': False},
+                {'id': 3, 'name': 'xbc', 'enabled': True}]
+        self.assertEqual([1], self._filter(
+            refs, (('name', 'a'), {'comparator': 'startswith'}),
+            (('enabled', 'true'), {})))
@@ -12,9 +12,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from six.moves import http_client
 import uuid
 
+import mock
+from six.moves import http_client
+
 from keystone.common import provider_api
 from keystone.common.validation import validators
 import keystone.conf
@@ -804,6 +806,66 @@ class LimitsTestCase(test_v3.RestfulTestCase):
         self.assertEqual(1, len(limits))
         self.assertEqual(self.project_id, limits[0]['project_id'])
 
+    def test_list_effective_limits(self):
+        ref = unit.new_limit_ref(project_id=self.project_id,
+                                 service_id=self.service_id,
+                                 region_id=self.region_id,
+                                 resource_name='volume')
+        r = self.post(
+            '/limits',
+            body={'limits': [ref]},
+            expected_status=http_client.CREATED)
+        limit_id = r.result['limits'][0]['id']
+        r = self.get('/registered_limits', expected_status=http_client.OK)
+        default_limits = dict(
+            (registered_limit['resource_name'],
+             registered_limit['default_limit'])
+            for registered_limit in r.result['registered_limits'])
+
+        r = self.get('/limits/effective', expected_status=http_client.OK)
+        limits = dict((limit['resource_name'], limit)
+                      for limit in r.result['limits'])
+        self.assertEqual(set(['volume', 'snapshot', 'backup']), set(limits))
+        for limit in limits.values():
+            self.assertEqual(self.project_id, limit['project_id'])
+        self.assertEqual(limit_id, limits['volume']['limit_id'])
+        self.assertEqual(ref['resource_limit'],
+                         limits['volume']['resource_limit'])
+        for resource_name in ['snapshot', 'backup']:
+            self.assertIsNone(limits[resource_name]['limit_id'])
+            self.assertEqual(default_limits[resource_name],
+                             limits[resource_name]['resource_limit'])
+
+        r = self.get(
+            '/limits/effective?resource_name=backup&project_id=%s' %
+            self.project_id,
+            expected_status=http_client.OK)
+        limits = r.result['limits']
+        self.assertEqual(1, len(limits))
+        self.assertEqual('backup', limits[0]['resource_name'])
+
+    def test_list_effective_limits_of_other_project(self):
+        project_2 = unit.new_project_ref(domain_id=self.domain_id)
+        PROVIDERS.resource_api.create_project(project_2['id'], project_2)
+        PROVIDERS.assignment_api.create_system_grant_for_user(
+            self.user_id, self.role['id'])
+
+        # a project scoped request can only list the limits of its project.
+        self.get(
+            '/limits/effective?project_id=%s' % project_2['id'],
+            expected_status=http_client.FORBIDDEN)
+
+        system_auth = self.build_authentication_request(
+            user_id=self.user['id'], password=self.user['password'],
+            system=True)
+        r = self.get(
+            '/limits/effective?project_id=%s' % project_2['id'],
+            expected_status=http_client.OK, auth=system_auth)
+        self.assertEqual(3, len(r.result['limits']))
+        self.get(
+            '/limits/effective?project_id=%s' % uuid.uuid4().hex,
+            expected_status=http_client.NOT_FOUND, auth=system_auth)
+
     def test_show_limit(self):
         ref1 = unit.new_limit_ref(project_id=self.project_id,
                                   service_id=self.service_id,
@@ -1081,6 +1143,60 @@ class StrictTwoLevelLimitsTestCase(LimitsTestCase):
             body={'limits': [ref_A, ref_B, ref_C, ref_D, ref_E, ref_F]},
             expected_status=http_client.CREATED)
 
+    def test_create_multi_limits_loads_each_resource_once(self):
+        # The limits of a batch are validated in memory, so the backend is
+        # queried once per resource rather than once per limit and child.
+        refs = []
+        for project in (self.project_A, self.project_B, self.project_C,
+                        self.project_D, self.project_E, self.project_F):
+            refs.append(unit.new_limit_ref(project_id=project['id'],
+                                           service_id=self.service_id,
+                                           region_id=self.region_id,
+                                           resource_name='volume',
+                                           resource_limit=5))
+            refs.append(unit.new_limit_ref(project_id=project['id'],
+                                           service_id=self.service_id,
+                                           region_id=self.region_id,
+                                           resource_name='backup',
+                                           resource_limit=5))
+
+        list_limits = mock.patch.object(
+            PROVIDERS.unified_limit_api, 'list_limits_from_project_ids',
+            wraps=PROVIDERS.unified_limit_api.list_limits_from_project_ids)
+        with list_limits as mock_list_limits:
+            self.post(
+                '/limits',
+                body={'limits': refs},
+                expected_status=http_client.CREATED)
+        self.assertEqual(2, mock_list_limits.call_count)
+
+    def test_create_limit_loads_related_projects_only(self):
+        # Only the limits of the project, its parent and its children are
+        # needed, not those of the other trees.
+        ref_D = unit.new_limit_ref(project_id=self.project_D['id'],
+                                   service_id=self.service_id,
+                                   region_id=self.region_id,
+                                   resource_name='volume',
+                                   resource_limit=10)
+        self.post('/limits', body={'limits': [ref_D]},
+                  expected_status=http_client.CREATED)
+
+        ref_B = unit.new_limit_ref(project_id=self.project_B['id'],
+                                   service_id=self.service_id,
+                                   region_id=self.region_id,
+                                   resource_name='volume',
+                                   resource_limit=5)
+        list_limits = mock.patch.object(
+            PROVIDERS.unified_limit_api, 'list_limits_from_project_ids',
+            wraps=PROVIDERS.unified_limit_api.list_limits_from_project_ids)
+        with list_limits as mock_list_limits:
+            self.post('/limits', body={'limits': [ref_B]},
+                      expected_status=http_client.CREATED)
+        project_ids = mock_list_limits.call_args[0][0]
+        self.assertEqual(
+            sorted([self.project_A['id'], self.project_B['id']]),
+            sorted(project_ids))
+
     def test_create_multi_limits_invalid_input(self):
         # fail to create a tree in one request like:
         #    A,12         D,9
@@ -21,6 +21,8 @@ from six.moves import http_client
 import webtest
 
 from keystone.common import authorization
+from keystone.common import context
+from keystone.common import driver_hints
 from keystone.common import provider_api
 from keystone.common import tokenless_auth
 from keystone.common import wsgi
@@ -728,3 +730,43 @@ class AuthContextMiddlewareTest(test_backend_sql.SqlTests,
         headers = {authorization.AUTH_TOKEN_HEADER: 'NOT-ADMIN'}
         self._do_middleware_request(headers=headers)
         self.assertIn('Invalid user token', log_fix.output)
+
+
+class SqlStatsMiddlewareTest(test_backend_sql.SqlTests,
+                             MiddlewareRequestTestBase):
+
+    MIDDLEWARE_CLASS = middleware.SqlStatsMiddleware
+
+    def _application(self):
+        app = super(SqlStatsMiddlewareTest, self)._application()
+
+        def list_roles(environ, start_response):
+            PROVIDERS.role_api.driver.list_roles(driver_hints.Hints())
+            return app(environ, start_response)
+
+        return list_roles
+
+    def test_stats_in_environment(self):
+        req = self._do_middleware_request()
+        stats = req.environ[context.SQL_STATS_ENV]
+        self.assertGreater(stats.statements, 0)
+        self.assertIsNone(stats.recorded)
+
+    def test_stats_header(self):
+        resp = self._do_middleware_response()
+        self.assertNotIn(middleware.SQL_STATS_HEADER, resp.headers)
+
+        self.config_fixture.config(sql_stats_header=True)
+        resp = self._do_middleware_response()
+        stats = resp.request.environ[context.SQL_STATS_ENV]
+        self.assertEqual(stats.to_header(),
+                         resp.headers[middleware.SQL_STATS_HEADER])
+
+    def test_slow_request_logged(self):
+        log_fix = self.useFixture(fixtures.FakeLogger())
+        self._do_middleware_request()
+        self.assertNotIn('SQL statements', log_fix.output)
+
+        self.config_fixture.config(sql_slow_request_time=0.000001)
+        self._do_middleware_request(path='/slow')
+        self.assertIn('GET /slow took', log_fix.output)
@@ -397,6 +397,64 @@ class RevokeTests(object):
                           PROVIDERS.revoke_api.check_token,
                           token_values)
 
+    @mock.patch.object(timeutils, 'utcnow')
+    def test_expired_events_pruned_when_due(self, mock_utcnow):
+        self.config_fixture.config(group='revoke', prune_interval=3 * 3600)
+        now = datetime.datetime.utcnow()
+        mock_utcnow.return_value = now
+        PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+
+        # The first event has expired but the events were pruned less than
+        # prune_interval ago.
+        mock_utcnow.return_value = now + datetime.timedelta(hours=2)
+        PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+        self.assertEqual(2, len(PROVIDERS.revoke_api.driver.list_events()))
+
+        mock_utcnow.return_value = now + datetime.timedelta(hours=3)
+        PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+        self.assertEqual(2, len(PROVIDERS.revoke_api.driver.list_events()))
+
+    @mock.patch.object(timeutils, 'utcnow')
+    def test_expired_events_not_listed(self, mock_utcnow):
+        self.config_fixture.config(group='revoke', prune_interval=0)
+        now = datetime.datetime.utcnow()
+        mock_utcnow.return_value = now
+        PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+
+        # The first event revokes tokens that have all expired, it is still
+        # stored but left out of the list, and of its cache entry.
+        mock_utcnow.return_value = now + datetime.timedelta(hours=2)
+        PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+        self.assertEqual(2, len(PROVIDERS.revoke_api.driver.list_events()))
+        self.assertEqual(1, len(PROVIDERS.revoke_api.list_events()))
+        self.assertEqual(1, len(PROVIDERS.revoke_api.list_events(
+            last_fetch=now - datetime.timedelta(hours=1))))
+
+    def test_expired_events_not_pruned_without_interval(self):
+        self.config_fixture.config(group='revoke', prune_interval=0)
+        with mock.patch.object(PROVIDERS.revoke_api.driver,
+                               'prune_expired_events') as m:
+            PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+        m.assert_not_called()
+
+    @mock.patch.object(timeutils, 'utcnow')
+    def test_prune_expired_events_in_batches(self, mock_utcnow):
+        self.config_fixture.config(group='revoke', prune_interval=0)
+        now = datetime.datetime.utcnow()
+        mock_utcnow.return_value = now
+        for i in range(5):
+            PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+
+        mock_utcnow.return_value = now + datetime.timedelta(hours=2)
+        PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+        self.assertEqual(5, PROVIDERS.revoke_api.prune_expired_events(
+            dry_run=True))
+        self.assertEqual(6, len(PROVIDERS.revoke_api.driver.list_events()))
+
+        self.assertEqual(5, PROVIDERS.revoke_api.prune_expired_events(
+            batch_size=2))
+        self.assertEqual(1, len(PROVIDERS.revoke_api.driver.list_events()))
+
     def test_delete_group_without_role_does_not_revoke_users(self):
         revocation_backend = sql.Revoke()
         domain = unit.new_domain_ref()
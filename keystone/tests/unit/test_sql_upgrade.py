@@ -3179,6 +3179,26 @@ class FullMigration(SqlMigrateBase, unit.TestCase):
         }
         role_table.insert().values(role_without_description).execute()
 
+    def test_migration_054_adds_limit_lookup_indexes(self):
+        self.expand(53)
+        self.migrate(53)
+        self.contract(53)
+
+        limit_index = 'ix_limit_project_id_registered_limit_id'
+        registered_limit_index = (
+            'ix_registered_limit_service_id_region_id_resource_name')
+        self.assertFalse(self.does_index_exist('limit', limit_index))
+        self.assertFalse(self.does_index_exist('registered_limit',
+                                               registered_limit_index))
+
+        self.expand(54)
+        self.migrate(54)
+        self.contract(54)
+
+        self.assertTrue(self.does_index_exist('limit', limit_index))
+        self.assertTrue(self.does_index_exist('registered_limit',
+                                              registered_limit_index))
+
 
 class MySQLOpportunisticFullMigration(FullMigration):
     FIXTURE = db_fixtures.MySQLOpportunisticFixture
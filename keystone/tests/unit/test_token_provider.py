@@ -13,7 +13,9 @@
 # under the License.
 
 import datetime
+import uuid
 
+import mock
 from oslo_utils import timeutils
 from six.moves import urllib
 
@@ -478,6 +480,32 @@ class TestTokenProvider(unit.TestCase):
         token.expires_at = utils.isotime(timeutils.utcnow() + FUTURE_DELTA)
         self.assertIsNone(PROVIDERS.token_provider_api._is_valid_token(token))
 
+    def test_set_scope_refs_avoids_resource_lookups(self):
+        project = {'id': uuid.uuid4().hex, 'domain_id': uuid.uuid4().hex}
+        domain = {'id': project['domain_id']}
+        token = token_model.TokenModel()
+        token.project_id = project['id']
+
+        with mock.patch.object(PROVIDERS.resource_api, 'get_project') as gp:
+            with mock.patch.object(PROVIDERS.resource_api,
+                                   'get_domain') as gd:
+                token.set_scope_refs(project=project, domain=domain)
+                self.assertIs(project, token.project)
+                self.assertIs(domain, token.project_domain)
+                gp.assert_not_called()
+                gd.assert_not_called()
+
+    def test_set_scope_refs_ignores_refs_for_another_scope(self):
+        project = {'id': uuid.uuid4().hex, 'domain_id': uuid.uuid4().hex}
+        token = token_model.TokenModel()
+        token.domain_id = uuid.uuid4().hex
+
+        with mock.patch.object(PROVIDERS.resource_api, 'get_domain') as gd:
+            token.set_scope_refs(project=project,
+                                 domain={'id': project['domain_id']})
+            self.assertIs(gd.return_value, token.domain)
+            gd.assert_called_once_with(token.domain_id)
+
     def test_validate_v3_token_with_no_token_raises_token_not_found(self):
         self.assertRaises(
             exception.TokenNotFound,
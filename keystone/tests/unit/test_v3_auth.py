@@ -4665,6 +4665,30 @@ class TestTrustChain(test_v3.RestfulTestCase):
             self.head('/auth/tokens', headers=headers,
                       expected_status=http_client.NOT_FOUND)
 
+    @unit.skip_if_cache_disabled('trust')
+    def test_trust_chain_cached(self):
+        trust_id = self.trust_chain[-1]['id']
+        PROVIDERS.trust_api.get_trust(trust_id)
+
+        driver = PROVIDERS.trust_api.driver
+        with mock.patch.object(driver, 'get_trust',
+                               wraps=driver.get_trust) as m:
+            PROVIDERS.trust_api.get_trust(trust_id)
+        # Only the last trust of the chain is read from the backend.
+        m.assert_called_once_with(trust_id, False)
+
+    def test_cached_trust_chain_dropped_when_trust_deleted(self):
+        trust_id = self.trust_chain[-1]['id']
+        PROVIDERS.trust_api.get_trust(trust_id)
+
+        # Deleting the trustee of the first trust only deletes that trust,
+        # the rest of the chain is left in place.
+        PROVIDERS.identity_api.delete_user(self.user_list[0]['id'])
+        PROVIDERS.trust_api.driver.get_trust(self.trust_chain[1]['id'])
+
+        self.assertRaises(exception.TrustNotFound,
+                          PROVIDERS.trust_api.get_trust, trust_id)
+
 
 class TestAuthContext(unit.TestCase):
     def setUp(self):
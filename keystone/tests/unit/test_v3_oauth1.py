@@ -26,6 +26,7 @@ from six.moves import urllib
 from six.moves.urllib import parse as urlparse
 
 from keystone.common import provider_api
+from keystone.common.rbac_enforcer import policy
 import keystone.conf
 from keystone import exception
 from keystone import oauth1
@@ -622,6 +623,9 @@ class AuthTokenTests(object):
                                    policy_file=self.tmpfilename)
         with open(self.tmpfilename, "w") as policyfile:
             policyfile.write(jsonutils.dumps(new_policy))
+        # The enforcer was built for the previous policy file when the
+        # application was created.
+        policy.reset()
 
     def test_trust_token_cannot_authorize_request_token(self):
         trust_token = self._create_trust_get_token()
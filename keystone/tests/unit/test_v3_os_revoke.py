@@ -24,6 +24,7 @@ from testtools import matchers
 from keystone.common import provider_api
 from keystone.common import utils
 from keystone.models import revoke_model
+from keystone.tests import unit
 from keystone.tests.unit import test_v3
 
 PROVIDERS = provider_api.ProviderAPIs
@@ -139,6 +140,35 @@ class OSRevokeTests(test_v3.RestfulTestCase, test_v3.JsonHomeTestMixin):
         events = resp.json_body['events']
         self.assertEqual([], events)
 
+    def test_list_not_modified(self):
+        PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+        resp = self.get('/OS-REVOKE/events')
+        etag = resp.headers['ETag']
+
+        self.get('/OS-REVOKE/events', headers={'If-None-Match': etag},
+                 expected_status=http_client.NOT_MODIFIED)
+
+        PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+        resp = self.get('/OS-REVOKE/events', headers={'If-None-Match': etag})
+        self.assertThat(resp.json_body['events'], matchers.HasLength(2))
+        self.assertNotEqual(etag, resp.headers['ETag'])
+
+    @unit.skip_if_cache_disabled('revoke')
+    def test_list_since_served_from_cache(self):
+        PROVIDERS.revoke_api.revoke_by_user(user_id=uuid.uuid4().hex)
+        self.get('/OS-REVOKE/events')
+
+        driver = PROVIDERS.revoke_api.driver
+        with mock.patch.object(driver, 'list_events',
+                               wraps=driver.list_events) as m:
+            resp = self.get('/OS-REVOKE/events?since=%s' %
+                            _future_time_string())
+        # Validating the token of the request still checks its own events,
+        # but the feed itself doesn't go back to the backend.
+        for call in m.call_args_list:
+            self.assertIn('token', call[1])
+        self.assertEqual([], resp.json_body['events'])
+
     def test_revoked_at_in_list(self):
         time = datetime.datetime.utcnow()
         with freezegun.freeze_time(time) as frozen_datetime:
@@ -172,7 +202,7 @@ class OSRevokeTests(test_v3.RestfulTestCase, test_v3.JsonHomeTestMixin):
         self.assertNotIn('OS-OAUTH1:access_token_id', event)
 
     def test_retries_on_deadlock(self):
-        patcher = mock.patch('sqlalchemy.orm.query.Query.delete',
+        patcher = mock.patch('sqlalchemy.orm.session.Session.add',
                              autospec=True)
 
         # NOTE(mnikolaenko): raise 2 deadlocks and back to normal work of
@@ -192,9 +222,9 @@ class OSRevokeTests(test_v3.RestfulTestCase, test_v3.JsonHomeTestMixin):
                     self.patched = False
                 raise oslo_db_exception.DBDeadlock
 
-        sql_delete_mock = patcher.start()
+        sql_add_mock = patcher.start()
         side_effect = FakeDeadlock(patcher)
-        sql_delete_mock.side_effect = side_effect
+        sql_add_mock.side_effect = side_effect
 
         try:
             PROVIDERS.revoke_api.revoke(revoke_model.RevokeEvent(
@@ -203,7 +233,7 @@ class OSRevokeTests(test_v3.RestfulTestCase, test_v3.JsonHomeTestMixin):
             if side_effect.patched:
                 patcher.stop()
 
-        call_count = sql_delete_mock.call_count
+        call_count = sql_add_mock.call_count
 
         # initial attempt + 1 retry
         revoke_attempt_count = 2
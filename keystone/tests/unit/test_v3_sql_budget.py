@@ -0,0 +1,109 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import uuid
+
+from keystone.common import provider_api
+from keystone.tests import unit
+from keystone.tests.unit import ksfixtures
+from keystone.tests.unit import test_v3
+
+
+PROVIDERS = provider_api.ProviderAPIs
+
+# Number of groups, projects and services created for the user.
+ITEMS = 5
+
+
+class SqlStatementBudgetTestCase(test_v3.RestfulTestCase):
+    """Number of SQL statements issued by the most frequent API calls.
+
+    The budgets are what the calls issue today, including the statements
+    needed to authenticate the request, with the caches as warm as a
+    deployment serving these calls all day has them. A call starting to issue
+    a statement per item exceeds its budget.
+
+    """
+
+    def load_sample_data(self, **kwargs):
+        super(SqlStatementBudgetTestCase, self).load_sample_data(**kwargs)
+        self.tag = uuid.uuid4().hex
+        for _ in range(ITEMS):
+            group = PROVIDERS.identity_api.create_group(
+                unit.new_group_ref(domain_id=self.domain_id))
+            PROVIDERS.identity_api.add_user_to_group(self.user_id,
+                                                     group['id'])
+            project = unit.new_project_ref(domain_id=self.domain_id,
+                                           parent_id=self.project_id,
+                                           tags=[self.tag])
+            PROVIDERS.resource_api.create_project(project['id'], project)
+            PROVIDERS.assignment_api.create_grant(
+                self.role_id, group_id=group['id'],
+                project_id=project['id'])
+            PROVIDERS.assignment_api.create_grant(
+                self.role_id, group_id=group['id'],
+                project_id=self.project_id, inherited_to_projects=True)
+
+            service = unit.new_service_ref()
+            PROVIDERS.catalog_api.create_service(service['id'], service)
+            endpoint = unit.new_endpoint_ref(service_id=service['id'],
+                                             interface='public',
+                                             region_id=self.region_id)
+            PROVIDERS.catalog_api.create_endpoint(endpoint['id'], endpoint)
+
+    def assertWithinBudget(self, budget, path, **kwargs):
+        token = self.get_scoped_token()
+        with ksfixtures.StatementBudget(budget):
+            self.get(path, token=token, **kwargs)
+
+    def test_validate_token(self):
+        subject_token = self.get_scoped_token()
+        self.assertWithinBudget(12, '/auth/tokens',
+                                headers={'X-Subject-Token': subject_token})
+
+    def test_list_effective_role_assignments(self):
+        self.assertWithinBudget(
+            55, '/role_assignments?effective&user.id=%s' % self.user_id)
+
+    def test_list_projects_for_user(self):
+        self.assertWithinBudget(27, '/auth/projects')
+
+    def test_list_projects_by_tag(self):
+        self.assertWithinBudget(20, '/projects?tags=%s' % self.tag)
+
+    def test_get_catalog(self):
+        self.assertWithinBudget(6, '/auth/catalog')
+
+    def test_budget_exceeded(self):
+        token = self.get_scoped_token()
+        budget = ksfixtures.StatementBudget(0)
+        self.assertRaises(AssertionError, self._get_with_budget, budget,
+                          '/auth/catalog', token)
+        self.assertGreater(budget.stats.statements, 0)
+        self.assertEqual(budget.stats.statements,
+                         len(budget.stats.recorded))
+
+    def _get_with_budget(self, budget, path, token):
+        with budget:
+            self.get(path, token=token)
+
+
+class SqlInstrumentationTestCase(test_v3.RestfulTestCase):
+
+    def config_overrides(self):
+        super(SqlInstrumentationTestCase, self).config_overrides()
+        self.config_fixture.config(sql_instrumentation=True,
+                                   sql_stats_header=True)
+
+    def test_stats_header(self):
+        r = self.get('/auth/catalog')
+        self.assertIn('statements=', r.headers['X-Keystone-SQL-Stats'])
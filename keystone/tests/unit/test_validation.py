@@ -146,6 +146,24 @@ class CommonValidationTestCase(unit.BaseTestCase):
         for req in reqs_to_validate:
             validator.validate(req)
 
+    def test_lazy_validate_reuses_validator(self):
+        schema = {'type': 'object',
+                  'properties': {'name': parameter_types.name},
+                  'required': ['name']}
+        validator = validation.get_validator(schema)
+        self.assertIs(validator, validation.get_validator(schema))
+
+        validation.lazy_validate(schema, {'name': uuid.uuid4().hex})
+        self.assertIs(validator, validation.get_validator(schema))
+        self.assertRaises(exception.SchemaValidationError,
+                          validation.lazy_validate, schema, {})
+
+    def test_validators_are_not_shared_between_equal_schemas(self):
+        schema = {'type': 'object', 'required': ['name']}
+        other_schema = copy.deepcopy(schema)
+        self.assertIsNot(validation.get_validator(schema),
+                         validation.get_validator(other_schema))
+
 
 class EntityValidationTestCase(unit.BaseTestCase):
 
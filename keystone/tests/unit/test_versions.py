@@ -16,6 +16,7 @@
 import copy
 import functools
 import random
+import uuid
 
 import mock
 from oslo_serialization import jsonutils
@@ -633,6 +634,10 @@ V3_JSON_HOME_RESOURCES = {
         'href': '/limits/model',
         'hints': {'status': 'experimental'}
     },
+    json_home.build_v3_resource_relation('effective_limits'): {
+        'href': '/limits/effective',
+        'hints': {'status': 'experimental'}
+    },
     json_home.build_v3_resource_relation('application_credential'): {
         'href-template': APPLICATION_CREDENTIAL,
         'href-vars': {
@@ -869,6 +874,49 @@ class VersionTestCase(unit.TestCase):
         # If request some unknown mime-type, get JSON.
         self.assertThat(make_request(self.getUniqueString()), JSON_MATCHER)
 
+    def test_discovery_supports_conditional_requests(self):
+        self.config_fixture.config(discovery_cache_max_age=600)
+        client = TestClient(self.public_app)
+        for path, accept in [('/', None),
+                             ('/', discovery.MimeTypes.JSON_HOME),
+                             ('/v3', None),
+                             ('/v3', discovery.MimeTypes.JSON_HOME)]:
+            headers = {'Accept': accept} if accept else None
+            resp = client.get(path, headers=headers)
+            etag = resp.headers['ETag']
+            self.assertIn('max-age=600', resp.headers['Cache-Control'])
+            self.assertIn('Accept', resp.headers['Vary'])
+            self.assertIn('X-Auth-Token', resp.headers['Vary'])
+
+            headers = dict(headers or {}, **{'If-None-Match': etag})
+            resp = client.get(path, headers=headers)
+            self.assertEqual(http_client.NOT_MODIFIED, resp.status_int)
+            self.assertEqual(b'', resp.body)
+            self.assertEqual(etag, resp.headers['ETag'])
+
+            headers['If-None-Match'] = '"%s"' % uuid.uuid4().hex
+            resp = client.get(path, headers=headers)
+            self.assertNotEqual(http_client.NOT_MODIFIED, resp.status_int)
+            self.assertNotEqual(b'', resp.body)
+
+    def test_discovery_documents_are_built_once(self):
+        discovery._DOCUMENTS.clear()
+        client = TestClient(self.public_app)
+        with mock.patch.object(discovery, '_get_versions_list',
+                               wraps=discovery._get_versions_list) as m:
+            first = client.get('/v3')
+            second = client.get('/v3')
+        self.assertEqual(1, m.call_count)
+        self.assertEqual(first.body, second.body)
+        self.assertEqual(first.headers['ETag'], second.headers['ETag'])
+
+        # Documents for a different base URL are built separately.
+        self.config_fixture.config(public_endpoint='http://keystone.test')
+        resp = client.get('/v3')
+        data = jsonutils.loads(resp.body)
+        self.assertEqual('http://keystone.test/v3/',
+                         data['version']['links'][0]['href'])
+
     @mock.patch.object(discovery, '_VERSIONS', [])
     def test_no_json_home_document_returned_when_v3_disabled(self):
         json_home_document = discovery._v3_json_home_content()
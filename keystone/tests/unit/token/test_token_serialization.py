@@ -11,9 +11,11 @@
 # under the License.
 
 import datetime
+import pickle
 import uuid
 
 import mock
+from oslo_serialization import msgpackutils
 
 from keystone.common.cache import _context_cache
 from keystone.common import utils as ks_utils
@@ -68,3 +70,48 @@ class TestTokenSerialization(base_classes.TestCaseWithBootstrap):
             self.token_handler.deserialize,
             serialized
         )
+
+    def test_serialized_token_model_excludes_entities(self):
+        # Load the entities the token refers to.
+        self.assertIsNotNone(self.exp_token.user)
+        self.assertIsNotNone(self.exp_token.project)
+
+        serialized = self.token_handler.serialize(self.exp_token)
+        version, values = msgpackutils.loads(serialized)
+        self.assertEqual(token_model.TokenModel._CACHE_VERSION, version)
+        self.assertNotIn(self.exp_token.user, values)
+        self.assertNotIn(self.exp_token.project, values)
+
+        token = self.token_handler.deserialize(serialized)
+        self.assertEqual(self.exp_token.user, token.user)
+        self.assertEqual(self.exp_token.project, token.project)
+
+    def test_deserialize_token_model_from_attributes(self):
+        token_data = {
+            'user_id': self.admin_user_id,
+            'project_id': self.project_id,
+            'id': self.token_id,
+            '_TokenModel__issued_at': self.issued_at,
+        }
+        token = self.token_handler.deserialize(msgpackutils.dumps(token_data))
+
+        self.assertEqual(self.admin_user_id, token.user_id)
+        self.assertEqual(self.project_id, token.project_id)
+        self.assertEqual(self.token_id, token.id)
+        self.assertEqual(self.issued_at, token.issued_at)
+
+    def test_deserialize_unknown_version(self):
+        version, values = self.exp_token.__getstate__()
+        self.assertRaises(
+            exception.CacheDeserializationError,
+            self.token_handler.deserialize,
+            msgpackutils.dumps([version + 1, values])
+        )
+
+    def test_pickle_token_model(self):
+        token = pickle.loads(pickle.dumps(self.exp_token))
+
+        self.assertEqual(self.exp_token.user_id, token.user_id)
+        self.assertEqual(self.exp_token.project_id, token.project_id)
+        self.assertEqual(self.exp_token.id, token.id)
+        self.assertEqual(self.exp_token.issued_at, token.issued_at)
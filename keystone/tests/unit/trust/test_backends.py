@@ -164,6 +164,34 @@ class TrustTests(object):
                           PROVIDERS.trust_api.get_trust,
                           trust_data['id'])
 
+    def test_consume_use_exhausted_trust(self):
+        trust_data = self.create_sample_trust(uuid.uuid4().hex,
+                                              remaining_uses=1)
+        PROVIDERS.trust_api.consume_use(trust_data['id'])
+        self.assertRaises(exception.TrustUseLimitReached,
+                          PROVIDERS.trust_api.consume_use,
+                          trust_data['id'])
+        t = PROVIDERS.trust_api.get_trust(trust_data['id'], deleted=True)
+        self.assertEqual(0, t['remaining_uses'])
+
+    def test_consume_use_unlimited_trust(self):
+        trust_data = self.create_sample_trust(uuid.uuid4().hex)
+        for i in range(3):
+            PROVIDERS.trust_api.consume_use(trust_data['id'])
+        t = PROVIDERS.trust_api.get_trust(trust_data['id'])
+        self.assertIsNone(t['remaining_uses'])
+
+    def test_consume_use_trust_not_found(self):
+        self.assertRaises(exception.TrustNotFound,
+                          PROVIDERS.trust_api.consume_use,
+                          uuid.uuid4().hex)
+        trust_data = self.create_sample_trust(uuid.uuid4().hex,
+                                              remaining_uses=2)
+        PROVIDERS.trust_api.delete_trust(trust_data['id'])
+        self.assertRaises(exception.TrustNotFound,
+                          PROVIDERS.trust_api.consume_use,
+                          trust_data['id'])
+
     def test_duplicate_trusts_not_allowed(self):
         self.trustor = self.user_foo
         self.trustee = self.user_two
@@ -410,3 +438,52 @@ class TrustTests(object):
         trusts = self.trust_api.list_trusts()
         self.assertEqual(len(trusts), 1)
         self.assertEqual(trust_ref2['id'], trusts[0]['id'])
+
+    def _create_expired_trusts(self, count):
+        trust_ids = []
+        for i in range(count):
+            trust_ref = core.new_trust_ref(
+                self.user_foo['id'], self.user_two['id'],
+                project_id=self.tenant_bar['id'])
+            trust_ref['expires_at'] = (
+                timeutils.utcnow() - datetime.timedelta(minutes=i + 1))
+            PROVIDERS.trust_api.create_trust(trust_ref['id'], trust_ref,
+                                             [{"id": "member"}])
+            trust_ids.append(trust_ref['id'])
+        return trust_ids
+
+    def test_flush_expired_trusts_in_batches(self):
+        self._create_expired_trusts(5)
+        valid_trust = self.create_sample_trust(uuid.uuid4().hex)
+
+        flushed = PROVIDERS.trust_api.flush_expired_trusts(batch_size=2)
+        self.assertEqual(5, flushed)
+        trusts = PROVIDERS.trust_api.list_trusts()
+        self.assertEqual([valid_trust['id']], [t['id'] for t in trusts])
+
+    def test_flush_expired_trusts_dry_run(self):
+        self._create_expired_trusts(3)
+
+        self.assertEqual(
+            3, PROVIDERS.trust_api.flush_expired_trusts(dry_run=True))
+        self.assertEqual(3, len(PROVIDERS.trust_api.list_trusts()))
+
+    def test_delete_trusts_for_project_in_batches(self):
+        trust_ids = [self.create_sample_trust(uuid.uuid4().hex)['id']
+                     for i in range(3)]
+        other_trust = core.new_trust_ref(
+            self.user_foo['id'], self.user_two['id'],
+            project_id=self.tenant_baz['id'])
+        PROVIDERS.trust_api.create_trust(other_trust['id'], other_trust,
+                                         [{"id": "member"}])
+
+        PROVIDERS.trust_api.delete_trusts_for_project(self.tenant_bar['id'],
+                                                      batch_size=2)
+        for trust_id in trust_ids:
+            self.assertRaises(exception.TrustNotFound,
+                              PROVIDERS.trust_api.get_trust,
+                              trust_id)
+            deleted = PROVIDERS.trust_api.get_trust(trust_id, deleted=True)
+            self.assertIsNotNone(deleted['deleted_at'])
+        trusts = PROVIDERS.trust_api.list_trusts()
+        self.assertEqual([other_trust['id']], [t['id'] for t in trusts])
@@ -202,7 +202,7 @@ class Manager(manager.Manager):
     def issue_token(self, user_id, method_names, expires_at=None,
                     system=None, project_id=None, domain_id=None,
                     auth_context=None, trust_id=None, app_cred_id=None,
-                    parent_audit_id=None):
+                    parent_audit_id=None, resolved_scope=None):
 
         # NOTE(lbragstad): Grab a blank token object and use composition to
         # build the token according to the authentication and authorization
@@ -218,6 +218,13 @@ class Manager(manager.Manager):
         token.audit_id = random_urlsafe_str()
         token.parent_audit_id = parent_audit_id
 
+        # The scope may already have been resolved and validated while
+        # authenticating, reuse it instead of looking it up again to mint and
+        # render the token.
+        if resolved_scope is not None:
+            token.set_scope_refs(project=resolved_scope.project,
+                                 domain=resolved_scope.domain)
+
         if auth_context:
             if constants.IDENTITY_PROVIDER in auth_context:
                 token.is_federated = True
@@ -72,10 +72,40 @@ class TrustDriverBase(object):
         raise exception.NotImplemented()  # pragma: no cover
 
     @abc.abstractmethod
-    def delete_trusts_for_project(self, project_id):
+    def delete_trusts_for_project(self, project_id, batch_size=None):
         """Delete all trusts for a project.
 
         :param project_id: ID of a project to filter trusts by.
+        :param batch_size: maximum number of trusts deleted per transaction,
+                           defaults to ``[trust] flush_batch_size``.
+
+        """
+        raise exception.NotImplemented()  # pragma: no cover
+
+    def flush_expired_trusts(self, project_id=None, trustor_user_id=None,
+                             trustee_user_id=None, batch_size=None,
+                             dry_run=False):
+        """Purge expired trusts and their roles from the backend.
+
+        :param project_id: ID of a project to filter trusts by.
+        :param trustor_user_id: ID of a trustor to filter trusts by.
+        :param trustee_user_id: ID of a trustee to filter trusts by.
+        :param batch_size: maximum number of trusts purged per transaction,
+                           defaults to ``[trust] flush_batch_size``.
+        :param dry_run: only count the trusts that would be purged.
+        :returns: the number of trusts purged (or that would be purged)
+
+        """
+        raise exception.NotImplemented()  # pragma: no cover
+
+    def flush_orphaned_trust_roles(self, batch_size=None, dry_run=False):
+        """Purge trust roles that no longer reference an existing trust.
+
+        :param batch_size: maximum number of trusts whose roles are purged per
+                           transaction, defaults to
+                           ``[trust] flush_batch_size``.
+        :param dry_run: only count the trust roles that would be purged.
+        :returns: the number of trust roles purged (or that would be purged)
 
         """
         raise exception.NotImplemented()  # pragma: no cover
@@ -12,18 +12,19 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from oslo_log import log
 from oslo_utils import timeutils
-from six.moves import range
+import sqlalchemy
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from keystone.common import sql
+import keystone.conf
 from keystone import exception
 from keystone.trust.backends import base
 
 
-# The maximum number of iterations that will be attempted for optimistic
-# locking on consuming a limited-use trust.
-MAXIMUM_CONSUME_ATTEMPTS = 10
+CONF = keystone.conf.CONF
+LOG = log.getLogger(__name__)
 
 
 class TrustModel(sql.ModelBase, sql.ModelDictMixinWithExtras):
@@ -92,47 +93,34 @@ class Trust(base.TrustDriverBase):
         trust_dict['roles'] = roles
 
     def consume_use(self, trust_id):
-        for attempt in range(MAXIMUM_CONSUME_ATTEMPTS):
-            with sql.session_for_write() as session:
-                try:
-                    query_result = (session.query(TrustModel.remaining_uses).
-                                    filter_by(id=trust_id).
-                                    filter_by(deleted_at=None).one())
-                except sql.NotFound:
-                    raise exception.TrustNotFound(trust_id=trust_id)
+        with sql.session_for_write() as session:
+            # Decrement the remaining uses in a single conditional UPDATE so
+            # the database serializes concurrent consumers of the same trust
+            # instead of keystone retrying an optimistic compare-and-set.
+            rows_affected = (
+                session.query(TrustModel).
+                filter_by(id=trust_id).
+                filter_by(deleted_at=None).
+                filter(TrustModel.remaining_uses > 0).
+                update({'remaining_uses': TrustModel.remaining_uses - 1},
+                       synchronize_session=False))
+            if rows_affected == 1:
+                # Since trust_id is the PK on the Trust table, there is no case
+                # we should match more than 1 row in the update. We either
+                # update 1 row or 0 rows.
+                return
 
-                remaining_uses = query_result.remaining_uses
+            # Nothing was consumed, figure out why.
+            try:
+                query_result = (session.query(TrustModel.remaining_uses).
+                                filter_by(id=trust_id).
+                                filter_by(deleted_at=None).one())
+            except sql.NotFound:
+                raise exception.TrustNotFound(trust_id=trust_id)
 
-                if remaining_uses is None:
-                    # unlimited uses, do nothing
-                    break
-                elif remaining_uses > 0:
-                    # NOTE(morganfainberg): use an optimistic locking method
-                    # to ensure we only ever update a trust that has the
-                    # expected number of remaining uses.
-                    rows_affected = (
-                        session.query(TrustModel).
-                        filter_by(id=trust_id).
-                        filter_by(deleted_at=None).
-                        filter_by(remaining_uses=remaining_uses).
-                        update({'remaining_uses': (remaining_uses - 1)},
-                               synchronize_session=False))
-                    if rows_affected == 1:
-                        # Successfully consumed a single limited-use trust.
-                        # Since trust_id is the PK on the Trust table, there is
-                        # no case we should match more than 1 row in the
-                        # update. We either update 1 row or 0 rows.
-                        break
-                else:
-                    raise exception.TrustUseLimitReached(trust_id=trust_id)
-        else:
-            # NOTE(morganfainberg): In the case the for loop is not prematurely
-            # broken out of, this else block is executed. This means the trust
-            # was not unlimited nor was it consumed (we hit the maximum
-            # iteration limit). This is just an indicator that we were unable
-            # to get the optimistic lock rather than silently failing or
-            # incorrectly indicating a trust was consumed.
-            raise exception.TrustConsumeMaximumAttempt(trust_id=trust_id)
+            if query_result.remaining_uses is not None:
+                raise exception.TrustUseLimitReached(trust_id=trust_id)
+            # Otherwise the trust has unlimited uses, there is nothing to do.
 
     def get_trust(self, trust_id, deleted=False):
         with sql.session_for_read() as session:
@@ -182,24 +170,106 @@ class Trust(base.TrustDriverBase):
                 raise exception.TrustNotFound(trust_id=trust_id)
             trust_ref.deleted_at = timeutils.utcnow()
 
-    def delete_trusts_for_project(self, project_id):
-        with sql.session_for_write() as session:
-            query = session.query(TrustModel)
-            trusts = query.filter_by(project_id=project_id)
-            for trust_ref in trusts:
-                trust_ref.deleted_at = timeutils.utcnow()
+    def delete_trusts_for_project(self, project_id, batch_size=None):
+        batch_size = batch_size or CONF.trust.flush_batch_size
+        deleted_at = timeutils.utcnow()
+        while True:
+            # Soft-delete in chunks so that a project owning a large number
+            # of trusts does not hold a single long-running write transaction
+            # on the trust table.
+            with sql.session_for_write() as session:
+                query = (session.query(TrustModel.id).
+                         filter_by(project_id=project_id).
+                         filter_by(deleted_at=None).
+                         limit(batch_size))
+                trust_ids = [ref.id for ref in query]
+                if not trust_ids:
+                    break
+                (session.query(TrustModel).
+                 filter(TrustModel.id.in_(trust_ids)).
+                 update({'deleted_at': deleted_at},
+                        synchronize_session=False))
+            if len(trust_ids) < batch_size:
+                break
+
+    def _expired_trusts_query(self, session, now, project_id=None,
+                              trustor_user_id=None, trustee_user_id=None):
+        query = session.query(TrustModel.id)
+        if project_id:
+            query = query.filter_by(project_id=project_id)
+        if trustor_user_id:
+            query = query.filter_by(trustor_user_id=trustor_user_id)
+        if trustee_user_id:
+            query = query.filter_by(trustee_user_id=trustee_user_id)
+        # This mirrors the ``expires_at`` hybrid property, which prefers the
+        # integer column and falls back to the legacy DateTime column for
+        # trusts created before it existed.
+        return query.filter(sqlalchemy.or_(
+            TrustModel.expires_at_int < now,
+            sqlalchemy.and_(TrustModel.expires_at_int.is_(None),
+                            TrustModel._expires_at < now)))
 
     def flush_expired_trusts(self, project_id=None, trustor_user_id=None,
-                             trustee_user_id=None):
-        with sql.session_for_write() as session:
-            query = session.query(TrustModel)
-            if project_id:
-                query = query.filter_by(project_id=project_id)
-            if trustor_user_id:
-                query = query.filter_by(trustor_user_id=trustor_user_id)
-            if trustee_user_id:
-                query = query.filter_by(trustee_user_id=trustee_user_id)
-            for ref in query:
-                if ref.expires_at is not None:
-                    if ref.expires_at < timeutils.utcnow():
-                        session.delete(ref)
+                             trustee_user_id=None, batch_size=None,
+                             dry_run=False):
+        batch_size = batch_size or CONF.trust.flush_batch_size
+        now = timeutils.utcnow()
+        filters = dict(project_id=project_id,
+                       trustor_user_id=trustor_user_id,
+                       trustee_user_id=trustee_user_id)
+
+        if dry_run:
+            with sql.session_for_read() as session:
+                return self._expired_trusts_query(
+                    session, now, **filters).count()
+
+        flushed = 0
+        while True:
+            with sql.session_for_write() as session:
+                query = self._expired_trusts_query(session, now, **filters)
+                trust_ids = [ref.id for ref in query.limit(batch_size)]
+                if not trust_ids:
+                    break
+                (session.query(TrustRole).
+                 filter(TrustRole.trust_id.in_(trust_ids)).
+                 delete(synchronize_session=False))
+                (session.query(TrustModel).
+                 filter(TrustModel.id.in_(trust_ids)).
+                 delete(synchronize_session=False))
+            flushed += len(trust_ids)
+            LOG.info('Flushed %(count)d expired trusts, %(total)d so far.',
+                     {'count': len(trust_ids), 'total': flushed})
+            if len(trust_ids) < batch_size:
+                break
+        return flushed
+
+    def _orphaned_trust_roles_query(self, session, *columns):
+        return (session.query(*columns).
+                outerjoin(TrustModel, TrustModel.id == TrustRole.trust_id).
+                filter(TrustModel.id.is_(None)))
+
+    def flush_orphaned_trust_roles(self, batch_size=None, dry_run=False):
+        batch_size = batch_size or CONF.trust.flush_batch_size
+
+        if dry_run:
+            with sql.session_for_read() as session:
+                return self._orphaned_trust_roles_query(
+                    session, TrustRole.trust_id, TrustRole.role_id).count()
+
+        flushed = 0
+        while True:
+            with sql.session_for_write() as session:
+                query = self._orphaned_trust_roles_query(
+                    session, TrustRole.trust_id).distinct()
+                trust_ids = [ref.trust_id for ref in query.limit(batch_size)]
+                if not trust_ids:
+                    break
+                flushed += (session.query(TrustRole).
+                            filter(TrustRole.trust_id.in_(trust_ids)).
+                            delete(synchronize_session=False))
+            LOG.info('Flushed roles of %(count)d deleted trusts, '
+                     '%(total)d role rows so far.',
+                     {'count': len(trust_ids), 'total': flushed})
+            if len(trust_ids) < batch_size:
+                break
+        return flushed
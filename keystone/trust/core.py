@@ -16,6 +16,7 @@
 
 from six.moves import zip
 
+from keystone.common import cache
 from keystone.common import manager
 from keystone.common import provider_api
 import keystone.conf
@@ -27,6 +28,15 @@ from keystone import notifications
 CONF = keystone.conf.CONF
 PROVIDERS = provider_api.ProviderAPIs
 
+# This is a discrete cache region for the chains of redelegated trusts. A
+# trust only redelegates a trust that can't run out of uses and never outlives
+# it, so a chain only changes when one of its trusts is deleted. Any operation
+# deleting trusts should invalidate this entire cache region.
+TRUST_CHAIN_REGION = cache.create_region(name='trust chains')
+MEMOIZE_TRUST_CHAIN = cache.get_memoization_decorator(
+    group='trust',
+    region=TRUST_CHAIN_REGION)
+
 
 class Manager(manager.Manager):
     """Default pivot point for the Trust backend.
@@ -57,6 +67,7 @@ class Manager(manager.Manager):
         trusts = trusts + self.driver.list_trusts_for_trustor(user_id)
         for trust in trusts:
             self.driver.delete_trust(trust['id'])
+        TRUST_CHAIN_REGION.invalidate()
 
     @staticmethod
     def _validate_redelegation(redelegated_trust, trust):
@@ -106,7 +117,8 @@ class Manager(manager.Manager):
                   'does not specify impersonation. Redelegated trust id: %s') %
                 redelegated_trust['id'])
 
-    def get_trust_pedigree(self, trust_id):
+    @MEMOIZE_TRUST_CHAIN
+    def _get_trust_chain(self, trust_id):
         trust = self.driver.get_trust(trust_id)
         trust_chain = [trust]
         while trust and trust.get('redelegated_trust_id'):
@@ -115,11 +127,23 @@ class Manager(manager.Manager):
 
         return trust_chain
 
+    def _get_trust_pedigree_from_trust(self, trust):
+        # The trust itself is always read from the backend, it may have been
+        # used up or have expired since its chain was cached.
+        if trust and trust.get('redelegated_trust_id'):
+            return [trust] + self._get_trust_chain(
+                trust['redelegated_trust_id'])
+        return [trust]
+
+    def get_trust_pedigree(self, trust_id):
+        return self._get_trust_pedigree_from_trust(
+            self.driver.get_trust(trust_id))
+
     def get_trust(self, trust_id, deleted=False):
         trust = self.driver.get_trust(trust_id, deleted)
 
         if trust and trust.get('redelegated_trust_id') and not deleted:
-            trust_chain = self.get_trust_pedigree(trust_id)
+            trust_chain = self._get_trust_pedigree_from_trust(trust)
 
             for parent, child in zip(trust_chain[1:], trust_chain):
                 self._validate_redelegation(parent, child)
@@ -210,5 +234,11 @@ class Manager(manager.Manager):
 
         # end recursion
         self.driver.delete_trust(trust_id)
+        TRUST_CHAIN_REGION.invalidate()
 
         notifications.Audit.deleted(self._TRUST, trust_id, initiator)
+
+    def delete_trusts_for_project(self, project_id, batch_size=None):
+        self.driver.delete_trusts_for_project(project_id,
+                                              batch_size=batch_size)
+        TRUST_CHAIN_REGION.invalidate()